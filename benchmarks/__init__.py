@@ -0,0 +1 @@
+"""Offline benchmarks for the book recommender hot paths."""
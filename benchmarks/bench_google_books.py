@@ -0,0 +1,72 @@
+"""Compare the projected, lean Google Books parse path with the original full-payload path.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_google_books
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from benchmarks.fixtures import volumes_payload
+from benchmarks.harness import measure
+from src.book_recommender.google_books import parse_response
+
+
+def legacy_parse(body: bytes, max_results: int) -> list[dict[str, str]]:
+    """The pre-projection path: stdlib decode of the full payload, eager description split."""
+    data: dict[str, Any] = json.loads(body.decode("utf-8"))
+    results: list[dict[str, str]] = []
+    for item in data.get("items", [])[:max_results]:
+        info = item.get("volumeInfo", {})
+        title = info.get("title") or "Unknown title"
+        authors = ", ".join(info.get("authors", [])[:2]) or "Unknown author"
+        desc = (info.get("description") or "").split(".")[:2]
+        desc_text = ". ".join(desc).strip()
+        thumb = (info.get("imageLinks") or {}).get("thumbnail", "")
+        link = info.get("infoLink", "")
+        results.append(
+            {
+                "title": title,
+                "authors": authors,
+                "description": desc_text[:220] if desc_text else "",
+                "thumbnail": thumb,
+                "link": link,
+            }
+        )
+    return results
+
+
+def run(max_results: int = 4) -> dict[str, dict[str, float]]:
+    full = volumes_payload(max_results, projected=False)
+    projected = volumes_payload(max_results, projected=True)
+    assert legacy_parse(full, max_results) == parse_response(projected, max_results)
+
+    results = {
+        "legacy_full_payload": measure(lambda: legacy_parse(full, max_results)),
+        "projected_lean_parse": measure(lambda: parse_response(projected, max_results)),
+    }
+    results["legacy_full_payload"]["payload_bytes"] = float(len(full))
+    results["projected_lean_parse"]["payload_bytes"] = float(len(projected))
+    return results
+
+
+def main() -> None:
+    results = run()
+    print(f"{'path':<24}{'bytes':>10}{'ops/sec':>14}{'mean us':>12}{'peak alloc':>14}")
+    for name, r in results.items():
+        print(
+            f"{name:<24}{int(r['payload_bytes']):>10}{r['ops_per_sec']:>14.0f}"
+            f"{r['mean_us']:>12.1f}{int(r['peak_alloc_bytes']):>14}"
+        )
+    legacy, lean = results["legacy_full_payload"], results["projected_lean_parse"]
+    print(
+        f"\npayload reduced {legacy['payload_bytes'] / lean['payload_bytes']:.1f}x, "
+        f"parse {legacy['mean_us'] / lean['mean_us']:.1f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    main()
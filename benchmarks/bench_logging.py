@@ -0,0 +1,64 @@
+"""Measure the caller-side cost of a hot-path log call in each logging mode.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_logging
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import tempfile
+from pathlib import Path
+
+from benchmarks.harness import measure
+from src.book_recommender.logger import setup_logging, shutdown_logging
+
+MODES = {
+    "sync_text": {},
+    "sync_json": {"json_format": True},
+    "queue_json": {"json_format": True, "use_queue": True},
+    "queue_json_rate_limited": {
+        "json_format": True,
+        "use_queue": True,
+        "rate_limits": {"Cache hit": 20},
+    },
+}
+
+
+def run() -> dict[str, dict[str, float]]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, options in MODES.items():
+            logger = setup_logging(
+                enable_console=False, log_file=str(Path(tmp) / f"{name}.log"), **options
+            )
+            extra = {"query": "cozy mystery", "model": "llama", "cached": True, "duration_ms": 0.4}
+            try:
+                results[name] = measure(
+                    functools.partial(logger.info, "Cache hit", extra=extra),
+                    min_time=0.05,
+                    repeat=3,
+                )
+            finally:
+                shutdown_logging()
+                for handler in logger.handlers:
+                    handler.close()
+                logger.handlers.clear()
+                logger.filters.clear()
+    logging.getLogger("book_recommender").setLevel(logging.NOTSET)
+    return results
+
+
+def main() -> None:
+    results = run()
+    print(f"{'mode':<26}{'ops/sec':>14}{'mean us':>12}{'peak alloc':>14}")
+    for name, r in results.items():
+        print(
+            f"{name:<26}{r['ops_per_sec']:>14.0f}{r['mean_us']:>12.2f}{int(r['peak_alloc_bytes']):>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
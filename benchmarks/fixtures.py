@@ -0,0 +1,140 @@
+"""Synthetic, realistically sized fixtures shared by the benchmarks (no network)."""
+
+from __future__ import annotations
+
+import json
+import random
+from typing import Any
+
+_WORDS = [
+    "dragon", "archive", "river", "empire", "winter", "clockwork", "orchard", "lantern", "saga",
+    "voyage", "harbor", "station", "orbit", "garden", "detective", "ledger", "crown", "tide",
+    "ember", "forest", "scholar", "cipher",
+]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def full_volume(rng: random.Random, index: int) -> dict[str, Any]:
+    """A volume resource shaped like the unprojected Google Books API response."""
+    return {
+        "kind": "books#volume",
+        "id": f"vol{index:08d}",
+        "etag": f"etag{index}",
+        "selfLink": f"https://www.googleapis.com/books/v1/volumes/vol{index:08d}",
+        "volumeInfo": {
+            "title": _sentence(rng, 4).rstrip("."),
+            "subtitle": _sentence(rng, 6).rstrip("."),
+            "authors": [_sentence(rng, 2).rstrip(".") for _ in range(rng.randint(1, 3))],
+            "publisher": _sentence(rng, 2).rstrip("."),
+            "publishedDate": f"{rng.randint(1950, 2024)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+            "description": " ".join(_sentence(rng, rng.randint(8, 20)) for _ in range(12)),
+            "industryIdentifiers": [
+                {"type": "ISBN_13", "identifier": f"978{rng.randint(10**9, 10**10 - 1)}"},
+                {"type": "ISBN_10", "identifier": f"{rng.randint(10**9, 10**10 - 1)}"},
+            ],
+            "readingModes": {"text": True, "image": True},
+            "pageCount": rng.randint(120, 900),
+            "printType": "BOOK",
+            "categories": ["Fiction / Fantasy / Epic"],
+            "averageRating": 4.0,
+            "ratingsCount": rng.randint(1, 5000),
+            "maturityRating": "NOT_MATURE",
+            "allowAnonLogging": True,
+            "contentVersion": "1.8.7.0.preview.3",
+            "panelizationSummary": {"containsEpubBubbles": False, "containsImageBubbles": False},
+            "imageLinks": {
+                "smallThumbnail": f"http://books.google.com/books/content?id=vol{index}&zoom=5",
+                "thumbnail": f"http://books.google.com/books/content?id=vol{index}&zoom=1",
+            },
+            "language": "en",
+            "previewLink": f"http://books.google.com/books?id=vol{index}&printsec=frontcover",
+            "infoLink": f"http://books.google.com/books?id=vol{index}&source=gbs_api",
+            "canonicalVolumeLink": f"https://books.google.com/books/about/vol{index}",
+        },
+        "saleInfo": {
+            "country": "US",
+            "saleability": "FOR_SALE",
+            "isEbook": True,
+            "listPrice": {"amount": 9.99, "currencyCode": "USD"},
+            "retailPrice": {"amount": 7.99, "currencyCode": "USD"},
+            "buyLink": f"https://play.google.com/store/books/details?id=vol{index}",
+        },
+        "accessInfo": {
+            "country": "US",
+            "viewability": "PARTIAL",
+            "embeddable": True,
+            "publicDomain": False,
+            "textToSpeechPermission": "ALLOWED",
+            "epub": {"isAvailable": True},
+            "pdf": {"isAvailable": False},
+            "webReaderLink": f"http://play.google.com/books/reader?id=vol{index}",
+            "accessViewStatus": "SAMPLE",
+            "quoteSharingAllowed": False,
+        },
+        "searchInfo": {"textSnippet": _sentence(rng, 25)},
+    }
+
+
+def project(volume: dict[str, Any]) -> dict[str, Any]:
+    """Apply the same projection the client requests via ``fields=``."""
+    info = volume["volumeInfo"]
+    projected = {k: info[k] for k in ("title", "authors", "description", "infoLink") if k in info}
+    if "imageLinks" in info:
+        projected["imageLinks"] = {"thumbnail": info["imageLinks"]["thumbnail"]}
+    return {"volumeInfo": projected}
+
+
+def volumes_payload(count: int = 4, projected: bool = False, seed: int = 7) -> bytes:
+    """Serialized volumes response with ``count`` items."""
+    rng = random.Random(seed)
+    items: list[dict[str, Any]] = [full_volume(rng, i) for i in range(count)]
+    if projected:
+        items = [project(v) for v in items]
+        return json.dumps({"items": items}).encode()
+    return json.dumps({"kind": "books#volumes", "totalItems": 1342, "items": items}).encode()
+
+
+def books(count: int = 4, seed: int = 7) -> list[dict[str, str]]:
+    """Parsed Google Books hints as the recommender and UI cards see them."""
+    from src.book_recommender.google_books import parse_response
+
+    return parse_response(volumes_payload(count, projected=True, seed=seed), count)
+
+
+def queries(count: int = 256, seed: int = 11) -> list[str]:
+    """User interests of typical length (a short phrase to a couple of sentences)."""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(_WORDS) for _ in range(rng.randint(3, 40))) for _ in range(count)
+    ]
+
+
+def blocklist(count: int = 5000, seed: int = 13) -> list[str]:
+    """Guardrail terms: random words, two-word phrases, and some ``*`` prefix terms."""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+
+    def word() -> str:
+        return "".join(rng.choice(letters) for _ in range(rng.randint(4, 10)))
+
+    terms = []
+    for _ in range(count):
+        roll = rng.random()
+        terms.append(f"{word()} {word()}" if roll < 0.3 else f"{word()}*" if roll < 0.4 else word())
+    return terms
+
+
+def recommendation_properties(rng: random.Random) -> dict[str, Any]:
+    """Properties of one ``recommendation_generated`` analytics event."""
+    return {
+        "query_length": rng.randint(10, 200),
+        "genre": rng.choice(["none", "Fantasy", "Mystery", "Sci-Fi"]),
+        "model": rng.choice(["llama-3.1-8b-instant", "llama-3.2-90b-text"]),
+        "temperature": 0.8,
+        "cached": rng.random() < 0.4,
+        "duration_ms": rng.lognormvariate(6.5, 0.6),
+        "books_count": 4,
+    }
@@ -0,0 +1,62 @@
+"""Minimal timing and allocation harness for offline microbenchmarks."""
+
+from __future__ import annotations
+
+import gc
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+
+def measure(fn: Callable[[], Any], min_time: float = 0.2, repeat: int = 5) -> dict[str, float]:
+    """Time ``fn`` and sample its allocations.
+
+    The loop count is calibrated so each of ``repeat`` rounds runs for about
+    ``min_time`` seconds; the best round is reported to damp scheduler noise.
+    Peak allocation is sampled with tracemalloc over ``repeat`` single calls and the
+    median is reported, so an occasional container resize does not dominate.
+    """
+    fn()  # warm caches and lazy imports
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10 or loops >= 1 << 20:
+            break
+        loops *= 2
+    loops = max(1, int(loops * (min_time / max(elapsed, 1e-9))))
+
+    best = float("inf")
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            best = min(best, (time.perf_counter() - start) / loops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(repeat):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(max(0, peak - before))
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ops_per_sec": 1.0 / best if best > 0 else float("inf"),
+        "mean_us": best * 1e6,
+        "peak_alloc_bytes": float(statistics.median(peaks)),
+    }
@@ -0,0 +1,280 @@
+"""Offline microbenchmark suite for the recommender hot paths, with saved baselines.
+
+Run from the repository root::
+
+    python -m benchmarks.run                          # print results
+    python -m benchmarks.run --save benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json
+
+Sub-microsecond paths are timed over a batch of inputs (``_x256``). Each case is also timed
+relative to a fixed pure-Python calibration loop, and
+comparisons use that relative cost, so a baseline recorded on one machine stays
+meaningful on another. Every case is measured ``--repeats`` times; the median is
+reported along with the ``spread`` between repeats. ``--compare`` exits with
+status 1 when a case is slower than the baseline by more than ``--threshold``
+plus the larger spread of the two runs, or allocates more by over ``--threshold``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+from collections.abc import Callable
+from typing import Any
+
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+# setup(tmp_dir, cleanup) -> zero-argument callable to time
+Case = Callable[[str, contextlib.ExitStack], Callable[[], Any]]
+CASES: dict[str, Case] = {}
+
+
+def case(name: str) -> Callable[[Case], Case]:
+    def register(setup: Case) -> Case:
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+def calibration() -> int:
+    """Fixed interpreter-bound workload used to normalize timings across machines."""
+    total = 0
+    for i in range(200):
+        total += (i * 7) % 13
+    return total
+
+
+@case("cache_key_x256")
+def _cache_key(_tmp, _cleanup):
+    from src.book_recommender.recommender import BookRecommender
+
+    items = fixtures.queries()
+    key = BookRecommender._cache_key
+    return lambda: [key(q, "Fantasy", "horror", "llama-3.1-8b-instant", 0.8) for q in items]
+
+
+@case("guardrails_x256")
+def _guardrails(_tmp, _cleanup):
+    from src.book_recommender.guardrails import GuardrailMatcher
+    from src.book_recommender.recommender import BookRecommender
+
+    items = fixtures.queries()
+    check = BookRecommender(guardrails=GuardrailMatcher())._guardrails
+    return lambda: [check(q) for q in items]
+
+
+@case("guardrails_5k_terms_x256")
+def _guardrails_large(_tmp, _cleanup):
+    from src.book_recommender.guardrails import GuardrailMatcher
+
+    items = fixtures.queries()
+    match = GuardrailMatcher(fixtures.blocklist(5000)).match
+    return lambda: [match(q) for q in items]
+
+
+@case("semantic_lookup_5k")
+def _semantic_lookup(_tmp, _cleanup):
+    from src.book_recommender.semantic_cache import SemanticCache
+
+    cache = SemanticCache(threshold=0.9, max_entries=5000)
+    items = fixtures.queries(5000)
+    for index, query in enumerate(items):
+        cache.add("fantasy||llama-3.1-8b-instant|0.80", f"k{index}", query)
+    return lambda: cache.nearest("fantasy||llama-3.1-8b-instant|0.80", items[7])
+
+
+@case("catalog_search_2k")
+def _catalog_search(tmp, cleanup):
+    from src.book_recommender.catalog import LocalCatalog, build_catalog
+
+    rng = random.Random(17)
+    path = os.path.join(tmp, "catalog.db")
+    build_catalog((fixtures.full_volume(rng, i)["volumeInfo"] for i in range(2000)), path)
+    catalog = LocalCatalog(path)
+    cleanup.callback(catalog.close)
+    return lambda: catalog.search("clockwork detective in a harbor station", "Fantasy")
+
+
+@case("render_cards")
+def _render_cards(_tmp, _cleanup):
+    from src.book_recommender.ui import _render_cards
+
+    books = fixtures.books(4)
+    return lambda: _render_cards(books)
+
+
+def _log_record(name: str) -> logging.LogRecord:
+    record = logging.LogRecord(name, logging.INFO, __file__, 1, "Cache hit", None, None)
+    record.__dict__.update(
+        {"query": "cozy mystery in a seaside town", "model": "llama", "cached": True, "duration_ms": 0.4}
+    )
+    return record
+
+
+@case("structured_formatter")
+def _structured_formatter(_tmp, _cleanup):
+    from src.book_recommender.logger import StructuredFormatter
+
+    formatter, record = StructuredFormatter(), _log_record("book_recommender")
+    return lambda: formatter.format(record)
+
+
+@case("json_formatter")
+def _json_formatter(_tmp, _cleanup):
+    from src.book_recommender.logger import JSONFormatter
+
+    formatter, record = JSONFormatter(), _log_record("book_recommender")
+    return lambda: formatter.format(record)
+
+
+def _analytics(tmp: str, cleanup: contextlib.ExitStack, events: int = 0):
+    from src.book_recommender.analytics import UsageAnalytics
+
+    analytics = UsageAnalytics(tmp, queue_size=1_000_000)
+    cleanup.callback(analytics.close)
+    rng = random.Random(5)
+    for _ in range(events):
+        analytics.track_event("recommendation_generated", fixtures.recommendation_properties(rng))
+    analytics.flush()
+    return analytics
+
+
+@case("analytics_track_event")
+def _track_event(tmp, cleanup):
+    analytics = _analytics(tmp, cleanup)
+    properties = fixtures.recommendation_properties(random.Random(5))
+    return lambda: analytics.track_event("recommendation_generated", properties)
+
+
+@case("analytics_get_stats_10k")
+def _get_stats(tmp, cleanup):
+    analytics = _analytics(tmp, cleanup, events=10_000)
+    return analytics.get_stats
+
+
+@case("google_books_parse")
+def _parse(_tmp, _cleanup):
+    from src.book_recommender.google_books import parse_response
+
+    body = fixtures.volumes_payload(4, projected=True)
+    return lambda: parse_response(body, 4)
+
+
+def _median_result(samples: list[dict[str, float]]) -> dict[str, float]:
+    """Median of each field over repeated measurements, plus the spread of ``relative``."""
+    result = {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+    relatives = [s["relative"] for s in samples]
+    result["spread"] = (max(relatives) - min(relatives)) / result["relative"]
+    return result
+
+
+def run(
+    selected: list[str] | None = None, min_time: float = 0.2, repeats: int = 5
+) -> dict[str, Any]:
+    results: dict[str, dict[str, float]] = {}
+    calibrations: list[float] = []
+    for name, setup in CASES.items():
+        if selected and name not in selected:
+            continue
+        samples = []
+        with tempfile.TemporaryDirectory() as tmp, contextlib.ExitStack() as cleanup:
+            fn = setup(tmp, cleanup)
+            for _ in range(max(1, repeats)):
+                # Short rounds, best of each: the least disturbed by other load on the host.
+                sample = measure(fn, min_time=min_time / 4, repeat=4)
+                # Calibrate next to each sample so load changes during the run cancel out.
+                base_us = measure(calibration, min_time=min_time / 4, repeat=4)["mean_us"]
+                calibrations.append(base_us)
+                sample["relative"] = sample["mean_us"] / base_us
+                samples.append(sample)
+        results[name] = _median_result(samples)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "calibration_us": min(calibrations, default=0.0),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], threshold: float = 0.3
+) -> list[str]:
+    """Return a description of every case that regressed beyond ``threshold``.
+
+    A slowdown must also exceed the larger ``spread`` (repeat-to-repeat noise) of
+    the two runs, so a noisy case does not fail on one unlucky repeat.
+    """
+    regressions = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        slowdown = now["relative"] / before["relative"]
+        noise = max(now.get("spread", 0.0), before.get("spread", 0.0))
+        if slowdown > 1 + threshold + noise:
+            regressions.append(f"{name}: {slowdown:.2f}x slower than baseline (noise {noise:.0%})")
+        # Small absolute slack so a few bytes of interpreter noise never fail the check.
+        if now["peak_alloc_bytes"] > before["peak_alloc_bytes"] * (1 + threshold) + 256:
+            regressions.append(
+                f"{name}: peak allocation {int(before['peak_alloc_bytes'])} -> "
+                f"{int(now['peak_alloc_bytes'])} bytes"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the offline hot-path benchmarks.")
+    parser.add_argument("cases", nargs="*", help=f"Cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--save", help="Write results to this JSON baseline file")
+    parser.add_argument("--compare", help="Compare against this JSON baseline file")
+    parser.add_argument("--threshold", type=float, default=0.3, help="Allowed regression ratio")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timing round")
+    parser.add_argument(
+        "--repeats", type=int, default=5, help="Measurements per case; the median is reported"
+    )
+    args = parser.parse_args(argv)
+
+    report = run(args.cases, min_time=args.min_time, repeats=args.repeats)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+
+    print(
+        f"{'case':<26}{'ops/sec':>14}{'mean us':>12}{'relative':>10}{'spread':>8}"
+        f"{'peak alloc':>12}{'vs base':>9}"
+    )
+    for name, r in report["results"].items():
+        before = (baseline or {}).get("results", {}).get(name)
+        delta = f"{r['relative'] / before['relative']:.2f}x" if before else ""
+        print(
+            f"{name:<26}{r['ops_per_sec']:>14.0f}{r['mean_us']:>12.2f}{r['relative']:>10.2f}"
+            f"{r['spread']:>8.0%}{int(r['peak_alloc_bytes']):>12}{delta:>9}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
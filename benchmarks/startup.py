@@ -0,0 +1,171 @@
+"""Cold-start benchmarks: import time and time to the first served request.
+
+Run from the repository root::
+
+    python -m benchmarks.startup                      # print results
+    python -m benchmarks.startup --save benchmarks/startup_baseline.json
+    python -m benchmarks.startup --compare benchmarks/startup_baseline.json
+
+Every case runs in a fresh interpreter, and the best of ``--repeat`` runs is reported.
+Timings are relative to a bare ``python -c pass``, so a baseline recorded on one machine
+stays meaningful on another. Each case also lists the heavy third-party packages it
+loaded. ``--compare`` exits with status 1 when a case is slower than the baseline by more
+than ``--threshold`` or loads a heavy package that the baseline did not.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Packages that cost tens of milliseconds or more to import; none of them should load
+# before it is needed.
+HEAVY_MODULES = ("gradio", "langchain_core", "langchain_groq", "sentry_sdk", "httpx")
+
+_REPORT = (
+    "import json, sys\n"
+    f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))\n"
+)
+
+_FIRST_REQUEST = """\
+from src.book_recommender.chains import ChainRegistry, build_chain
+from src.book_recommender.hints import HintFanout
+from src.book_recommender.recommender import BookRecommender
+
+
+class EchoChain:
+    def invoke(self, inputs, config=None):
+        return "1. **" + inputs["user_interest"] + "**"
+
+
+def builder(model, temperature):
+    build_chain(model, temperature)  # LangChain import and client setup, no network
+    return EchoChain()
+
+
+recommender = BookRecommender(chains=ChainRegistry(builder), hints=HintFanout([]))
+text, _, _ = recommender.recommend("lighthouse mysteries", "", "", None, None)
+assert text.startswith("1."), text
+"""
+
+CASES: dict[str, str] = {
+    "python_bare": "pass",
+    "import_package": "import src.book_recommender",
+    "import_google_books": "import src.book_recommender.google_books",
+    "import_recommender": "import src.book_recommender.recommender",
+    "import_app": "import src.book_recommender.app",
+    "first_request": _FIRST_REQUEST,
+}
+
+
+def run_case(code: str, env: dict[str, str]) -> tuple[float, list[str]]:
+    """Run ``code`` in a fresh interpreter; returns wall seconds and heavy modules loaded."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", code + "\n" + _REPORT],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup case failed:\n{proc.stderr}")
+    return elapsed, json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(selected: list[str] | None = None, repeat: int = 5) -> dict[str, Any]:
+    results: dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep the children offline and away from the user's analytics and .env settings.
+        env = dict(
+            os.environ,
+            ANALYTICS_DIR=tmp,
+            GROQ_API_KEY="gsk_benchmark",
+            CACHE_DB_PATH="",
+            CASSETTE_MODE="off",
+            METRICS_PORT="0",
+        )
+        names = ["python_bare"] + [n for n in CASES if n != "python_bare"]
+        for name in names:
+            if selected and name not in selected and name != "python_bare":
+                continue
+            best, modules = float("inf"), []
+            for _ in range(max(1, repeat)):
+                elapsed, modules = run_case(CASES[name], env)
+                best = min(best, elapsed)
+            results[name] = {"best_ms": best * 1000, "heavy_modules": modules}
+    bare = results["python_bare"]["best_ms"]
+    for result in results.values():
+        result["relative"] = result["best_ms"] / bare
+    return {
+        "meta": {"python": platform.python_version(), "platform": platform.platform()},
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float = 0.5) -> list[str]:
+    """Return a description of every case that regressed beyond ``threshold``."""
+    regressions = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        slowdown = now["relative"] / before["relative"]
+        if slowdown > 1 + threshold:
+            regressions.append(f"{name}: {slowdown:.2f}x slower than baseline")
+        added = sorted(set(now["heavy_modules"]) - set(before["heavy_modules"]))
+        if added:
+            regressions.append(f"{name}: now imports {', '.join(added)}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the cold-start benchmarks.")
+    parser.add_argument(
+        "cases", nargs="*", help=f"Cases to run (default: all of {', '.join(CASES)})"
+    )
+    parser.add_argument("--save", help="Write results to this JSON baseline file")
+    parser.add_argument("--compare", help="Compare against this JSON baseline file")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Allowed regression ratio")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per case")
+    args = parser.parse_args(argv)
+
+    report = run(args.cases, repeat=args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+
+    print(f"{'case':<22}{'best ms':>10}{'relative':>10}{'vs base':>9}  heavy modules")
+    for name, r in report["results"].items():
+        before = (baseline or {}).get("results", {}).get(name)
+        delta = f"{r['relative'] / before['relative']:.2f}x" if before else ""
+        modules = ", ".join(r["heavy_modules"]) or "-"
+        print(f"{name:<22}{r['best_ms']:>10.1f}{r['relative']:>10.2f}{delta:>9}  {modules}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""Generate recommendations in bulk from a JSONL file of queries.
+
+Example:
+    python scripts/batch_recommend.py -i prompts.jsonl -o results.jsonl --max-concurrency 8
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from book_recommender.batch import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main())
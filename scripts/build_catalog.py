@@ -0,0 +1,18 @@
+"""Build the offline book catalog index from a JSONL or CSV dump.
+
+Example:
+    python scripts/build_catalog.py -i books.jsonl -o data/catalog.db --vectors
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from book_recommender.catalog import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""Serve the book recommender as a JSON HTTP API.
+
+Example:
+    python scripts/serve_api.py --host 0.0.0.0 --port 8000 --workers 4
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from book_recommender.api import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""Warm the recommendation cache with the most frequent recent queries.
+
+Example:
+    CACHE_DB_PATH=cache.db python scripts/warm_cache.py --limit 100 --rate 2
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from book_recommender.warmup import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main())
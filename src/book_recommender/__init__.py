@@ -1,5 +1,20 @@
 """Book recommender package."""
 
-from .app import run_app
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .app import run_app
 
 __all__ = ["run_app"]
+
+
+def __getattr__(name: str) -> Any:
+    # ``run_app`` pulls in Gradio and LangChain; load it on first access so that
+    # importing a light helper (e.g. ``book_recommender.google_books``) stays fast.
+    if name == "run_app":
+        from .app import run_app
+
+        return run_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
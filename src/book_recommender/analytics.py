@@ -1,97 +1,563 @@
 """Usage analytics tracking for the book recommender app."""
 
+import atexit
 import json
+import math
 import os
-from datetime import datetime
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any
+
+from .config import (
+    ANALYTICS_DIR,
+    ANALYTICS_FLUSH_INTERVAL_SECONDS,
+    ANALYTICS_FSYNC_INTERVAL_SECONDS,
+    ANALYTICS_LATENCY_ACCURACY,
+    ANALYTICS_LATENCY_BUCKET_SECONDS,
+    ANALYTICS_LATENCY_BUCKETS,
+    ANALYTICS_LATENCY_MAX_BINS,
+    ANALYTICS_MAX_SEGMENTS,
+    ANALYTICS_QUEUE_SIZE,
+    ANALYTICS_RECORD_QUERIES,
+    ANALYTICS_SEGMENT_MAX_BYTES,
+)
+from .logger import get_logger
+from .sketch import DDSketch
+
+logger = get_logger()
+
+try:  # POSIX only; elsewhere each worker process falls back to a per-PID directory
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+_SEGMENT_PREFIX = "events-"
+_SEGMENT_SUFFIX = ".jsonl"
+_LEGACY_FILE_NAME = ".book_recommender_analytics.json"
+_SNAPSHOT_NAME = "stats.json"
+_WORKER_PREFIX = "worker-"
+_SNAPSHOT_VERSION = 1
+_MAX_BATCH = 1000
+_FLUSH = object()
+_STOP = object()
+
+# (unix timestamp, event name, properties)
+QueuedEvent = tuple[float, str, dict[str, Any]]
+
+
+def _latency_key(model: str, cached: bool) -> str:
+    return f"{model}|{'hit' if cached else 'miss'}"
+
+
+def _new_sketch() -> DDSketch:
+    return DDSketch(ANALYTICS_LATENCY_ACCURACY, ANALYTICS_LATENCY_MAX_BINS)
+
+
+def _number(value: Any) -> float | None:
+    """Return ``value`` as a finite float, or None for anything else (bools included)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value) if math.isfinite(value) else None
+
+
+def _bucket_start(timestamp: str | None) -> int | None:
+    if not timestamp:
+        return None
+    try:
+        ts = datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+    return int(ts // ANALYTICS_LATENCY_BUCKET_SECONDS * ANALYTICS_LATENCY_BUCKET_SECONDS)
+
+
+class _Aggregates:
+    """Running totals behind ``get_stats``, updated per written event."""
+
+    def __init__(self) -> None:
+        self.event_counts: dict[str, int] = {}
+        self.model_usage: dict[str, int] = {}
+        self.cached = 0
+        self.rating_sum = 0.0
+        self.rating_count = 0
+        self.first_event: str | None = None
+        self.last_event: str | None = None
+        # "model|hit" / "model|miss" -> sketch over all time, and per time bucket start
+        self.latency: dict[str, DDSketch] = {}
+        self.latency_buckets: dict[int, dict[str, DDSketch]] = {}
+        self._stats: dict[str, Any] | None = None  # cached stats() until the next add()
+
+    def add(self, event: dict[str, Any]) -> None:
+        """Fold one event into the totals; fields of the wrong type are ignored."""
+        self._stats = None
+        name = event.get("event")
+        if not isinstance(name, str):
+            name = "unknown"
+        properties = event.get("properties")
+        if not isinstance(properties, dict):
+            properties = {}
+        timestamp = event.get("timestamp")
+        if not isinstance(timestamp, str):
+            timestamp = None
+        self.event_counts[name] = self.event_counts.get(name, 0) + 1
+        if name == "recommendation_generated":
+            model = properties.get("model")
+            if not isinstance(model, str):
+                model = "unknown"
+            self.model_usage[model] = self.model_usage.get(model, 0) + 1
+            cached = bool(properties.get("cached", False))
+            if cached:
+                self.cached += 1
+            duration_ms = _number(properties.get("duration_ms"))
+            if duration_ms is not None:
+                self._add_latency(_latency_key(model, cached), duration_ms, timestamp)
+        elif name == "rating_submitted":
+            rating = _number(properties.get("rating"))
+            if rating is not None:
+                self.rating_sum += rating
+                self.rating_count += 1
+        if self.first_event is None:
+            self.first_event = timestamp
+        self.last_event = timestamp
+
+    def _add_latency(self, key: str, duration_ms: float, timestamp: str | None) -> None:
+        self.latency.setdefault(key, _new_sketch()).add(duration_ms)
+        start = _bucket_start(timestamp)
+        if start is None:
+            return
+        if start not in self.latency_buckets:
+            oldest = min(self.latency_buckets, default=None)
+            if len(self.latency_buckets) >= ANALYTICS_LATENCY_BUCKETS and oldest is not None:
+                if start < oldest:
+                    return
+                del self.latency_buckets[oldest]
+            self.latency_buckets[start] = {}
+        self.latency_buckets[start].setdefault(key, _new_sketch()).add(duration_ms)
+
+    def latency_sketch(
+        self, model: str | None, cached: bool | None, since: float | None
+    ) -> DDSketch:
+        def matches(key: str) -> bool:
+            key_model, status = key.rsplit("|", 1)
+            return (model is None or key_model == model) and (
+                cached is None or status == ("hit" if cached else "miss")
+            )
+
+        if since is None:
+            sources = [self.latency]
+        else:
+            earliest = since // ANALYTICS_LATENCY_BUCKET_SECONDS * ANALYTICS_LATENCY_BUCKET_SECONDS
+            sources = [b for start, b in self.latency_buckets.items() if start >= earliest]
+        merged = _new_sketch()
+        for sketches in sources:
+            for key, sketch in sketches.items():
+                if matches(key):
+                    merged.merge(sketch)
+        return merged
+
+    def to_dict(self) -> dict[str, Any]:
+        data = {name: value for name, value in vars(self).items() if not name.startswith("_")}
+        data["latency"] = {key: sketch.to_dict() for key, sketch in self.latency.items()}
+        data["latency_buckets"] = {
+            str(start): {key: sketch.to_dict() for key, sketch in sketches.items()}
+            for start, sketches in self.latency_buckets.items()
+        }
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "_Aggregates":
+        aggregates = cls()
+        for name in vars(aggregates):
+            if name in data and not name.startswith("_"):
+                setattr(aggregates, name, data[name])
+        aggregates.latency = {
+            key: DDSketch.from_dict(sketch) for key, sketch in data.get("latency", {}).items()
+        }
+        aggregates.latency_buckets = {
+            int(start): {key: DDSketch.from_dict(sketch) for key, sketch in sketches.items()}
+            for start, sketches in data.get("latency_buckets", {}).items()
+        }
+        return aggregates
+
+    def stats(self) -> dict[str, Any]:
+        if self._stats is None:
+            self._stats = self._compute_stats()
+        return dict(self._stats)
+
+    def _compute_stats(self) -> dict[str, Any]:
+        counts = self.event_counts
+        total = sum(counts.values())
+        if not total:
+            return {
+                "total_events": 0,
+                "recommendations": 0,
+                "exports": 0,
+                "ratings": 0,
+                "shares": 0,
+            }
+
+        recommendations = counts.get("recommendation_generated", 0)
+        stats = {
+            "total_events": total,
+            "recommendations": recommendations,
+            "exports": counts.get("export", 0),
+            "ratings": counts.get("rating_submitted", 0),
+            "shares": counts.get("social_share", 0),
+            "first_event": self.first_event,
+            "last_event": self.last_event,
+        }
+        if recommendations:
+            stats["model_usage"] = dict(self.model_usage)
+            stats["cache_hit_rate"] = self.cached / recommendations
+        if self.rating_count:
+            stats["average_rating"] = round(self.rating_sum / self.rating_count, 2)
+        if self.latency:
+            stats["latency_ms"] = {
+                key: sketch.percentiles() for key, sketch in sorted(self.latency.items())
+            }
+        return stats
 
 
 class UsageAnalytics:
-    """Track usage analytics locally with optional external service support."""
+    """Track usage analytics locally with optional external service support.
+
+    Events are appended to rotating JSONL segments by a background writer thread.
+    ``track_event`` only enqueues onto a bounded queue, so recording an event on
+    the request path is O(1) and never blocks; when the queue is full the event
+    is dropped and counted instead.
+
+    The writer also keeps running aggregates of everything it writes and persists
+    them, with the log position they cover, in a small ``stats.json`` snapshot.
+    ``get_stats`` reads the aggregates in O(1); on restart only events written
+    after the last snapshot are replayed.
+    """
 
-    def __init__(self, analytics_file: Optional[str] = None):
+    def __init__(
+        self,
+        analytics_dir: str | None = None,
+        queue_size: int = ANALYTICS_QUEUE_SIZE,
+        flush_interval: float = ANALYTICS_FLUSH_INTERVAL_SECONDS,
+        fsync_interval: float = ANALYTICS_FSYNC_INTERVAL_SECONDS,
+        segment_max_bytes: int = ANALYTICS_SEGMENT_MAX_BYTES,
+        max_segments: int = ANALYTICS_MAX_SEGMENTS,
+        record_queries: bool = ANALYTICS_RECORD_QUERIES,
+    ):
         """
-        Initialize analytics tracker.
-        
+        Initialize analytics tracker and start its writer thread.
+
         Args:
-            analytics_file: Path to store analytics data (default: .analytics.json)
+            analytics_dir: Directory for event segments (default: ~/.book_recommender_analytics)
+            queue_size: Maximum number of events waiting to be written
+            flush_interval: Seconds between writes of queued events
+            fsync_interval: Minimum seconds between fsyncs of the active segment
+            segment_max_bytes: Segment size that triggers rotation to a new file
+            max_segments: Number of segments kept on disk; older ones are deleted
+            record_queries: Store query text and exclusions in recommendation events
+                (used by the cache warm-up); by default only the query length is kept
+        """
+        legacy_file = None
+        if analytics_dir is None:
+            analytics_dir = str(_default_dir())
+            legacy_file = Path.home() / _LEGACY_FILE_NAME
+
+        self.analytics_dir = Path(analytics_dir).expanduser()
+        self.analytics_dir.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.segment_max_bytes = segment_max_bytes
+        self.max_segments = max(1, max_segments)
+        self.record_queries = record_queries
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=queue_size)
+        self._file = None
+        if legacy_file is not None:
+            self._migrate_legacy_file(legacy_file)
+        self._segment_index = self._latest_segment_index()
+        self._aggregates_lock = threading.Lock()
+        self._aggregates = self._load_aggregates()
+        self._last_fsync = time.monotonic()
+        self._dirty = False  # written since the last fsync and snapshot
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="analytics-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------ storage
+
+    def _migrate_legacy_file(self, legacy_file: Path) -> None:
+        """Import events from the pre-JSONL ``~/.book_recommender_analytics.json`` once."""
+        if not legacy_file.exists() or self._segments():
+            return
+        try:
+            with open(legacy_file, encoding="utf-8") as handle:
+                events = json.load(handle).get("events", [])
+        except (OSError, ValueError, AttributeError):
+            return
+        with open(self._segment_path(1), "w", encoding="utf-8") as handle:
+            for event in events:
+                handle.write(json.dumps(event, separators=(",", ":"), default=str) + "\n")
+        legacy_file.rename(legacy_file.with_name(legacy_file.name + ".migrated"))
+
+    def _segment_path(self, index: int) -> Path:
+        return self.analytics_dir / f"{_SEGMENT_PREFIX}{index:06d}{_SEGMENT_SUFFIX}"
+
+    def _segments(self) -> list[Path]:
+        return sorted(self.analytics_dir.glob(f"{_SEGMENT_PREFIX}*{_SEGMENT_SUFFIX}"))
+
+    def _latest_segment_index(self) -> int:
+        segments = self._segments()
+        if not segments:
+            return 1
+        return int(segments[-1].stem[len(_SEGMENT_PREFIX):])
+
+    def _open_segment(self):
+        if self._file is None:
+            # Kept open across batches by the writer thread; closed on rotation and shutdown.
+            self._file = open(  # noqa: SIM115
+                self._segment_path(self._segment_index), "a", encoding="utf-8"
+            )
+        return self._file
+
+    def _rotate_if_needed(self) -> None:
+        if self._file is None or self._file.tell() < self.segment_max_bytes:
+            return
+        self._sync(force=True)
+        self._file.close()
+        self._file = None
+        self._segment_index += 1
+        # Open the next segment before pruning so exactly max_segments files remain.
+        self._open_segment()
+        for old in self._segments()[: -self.max_segments]:
+            old.unlink(missing_ok=True)
+
+    def _sync(self, force: bool = False) -> None:
+        if self._file is None or not self._dirty:
+            return
+        self._file.flush()
+        now = time.monotonic()
+        if force or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+            self._write_snapshot()
+            self._dirty = False
+
+    def _snapshot_path(self) -> Path:
+        return self.analytics_dir / _SNAPSHOT_NAME
+
+    def _write_snapshot(self) -> None:
+        """Atomically persist the aggregates and the log position they include."""
+        with self._aggregates_lock:
+            snapshot = {
+                "version": _SNAPSHOT_VERSION,
+                "segment": self._segment_index,
+                "offset": self._file.tell() if self._file is not None else 0,
+                "aggregates": self._aggregates.to_dict(),
+            }
+        tmp = self._snapshot_path().with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as handle:
+            json.dump(snapshot, handle, separators=(",", ":"))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, self._snapshot_path())
+
+    def _load_aggregates(self) -> _Aggregates:
+        """Restore aggregates from the snapshot, replaying any events written after it.
+
+        Without a usable snapshot (first start or an upgrade) the retained segments
+        are scanned once.
+        """
+        segment, offset = 0, 0
+        aggregates = _Aggregates()
+        try:
+            with open(self._snapshot_path(), encoding="utf-8") as handle:
+                snapshot = json.load(handle)
+            if snapshot.get("version") == _SNAPSHOT_VERSION:
+                aggregates = _Aggregates.from_dict(snapshot["aggregates"])
+                segment, offset = int(snapshot["segment"]), int(snapshot["offset"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        for path in self._segments():
+            index = int(path.stem[len(_SEGMENT_PREFIX):])
+            if index < segment:
+                continue
+            try:
+                with open(path, "rb") as handle:
+                    if index == segment:
+                        handle.seek(offset)
+                    for line in handle:
+                        try:
+                            aggregates.add(json.loads(line))
+                        except Exception:  # a malformed line must not block startup
+                            continue
+            except FileNotFoundError:
+                continue
+        return aggregates
+
+    def _write_batch(self, batch: list[QueuedEvent]) -> None:
+        events = [
+            {
+                "timestamp": datetime.fromtimestamp(ts, timezone.utc)
+                .replace(tzinfo=None)
+                .isoformat(),
+                "event": name,
+                "properties": properties,
+            }
+            for ts, name, properties in batch
+        ]
+        lines = [json.dumps(event, separators=(",", ":"), default=str) for event in events]
+        handle = self._open_segment()
+        handle.write("\n".join(lines) + "\n")
+        self._dirty = True
+        with self._aggregates_lock:
+            for event in events:
+                try:
+                    self._aggregates.add(event)
+                except Exception:  # the event is on disk; only its totals are lost
+                    continue
+        self._sync()
+        self._rotate_if_needed()
+
+    def _run(self) -> None:
+        """Writer loop: drain the queue in batches and append them to the active segment."""
+        while True:
+            try:
+                items = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                self._sync()
+                continue
+            while len(items) < _MAX_BATCH:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            batch = [item for item in items if isinstance(item, tuple)]
+            stop = any(item is _STOP for item in items)
+            try:
+                if batch:
+                    self._write_batch(batch)
+                if stop or any(item is _FLUSH for item in items):
+                    self._sync(force=True)
+            except OSError:
+                self._count_dropped(len(batch))
+            except Exception:
+                # Keep the writer alive: flush() and close() wait on it.
+                logger.exception("Analytics writer failed to write a batch")
+                self._count_dropped(len(batch))
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            if stop:
+                break
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def iter_events(self, include_workers: bool = False) -> Iterator[dict[str, Any]]:
+        """Yield retained events oldest first, skipping partially written lines.
+
+        With ``include_workers`` the events of API worker processes (see
+        :func:`use_worker_analytics`) kept under this directory follow.
         """
-        if analytics_file is None:
-            analytics_file = str(Path.home() / ".book_recommender_analytics.json")
-        
-        self.analytics_file = analytics_file
-        self._ensure_file()
-
-    def _ensure_file(self) -> None:
-        """Ensure analytics file exists."""
-        if not os.path.exists(self.analytics_file):
-            with open(self.analytics_file, "w") as f:
-                json.dump({"events": [], "sessions": []}, f)
-
-    def _read_data(self) -> Dict[str, Any]:
-        """Read analytics data from file."""
+        segments = self._segments()
+        if include_workers:
+            pattern = f"{_WORKER_PREFIX}*/{_SEGMENT_PREFIX}*{_SEGMENT_SUFFIX}"
+            segments += sorted(self.analytics_dir.glob(pattern))
+        for segment in segments:
+            try:
+                with open(segment, encoding="utf-8") as handle:
+                    for line in handle:
+                        try:
+                            yield json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+            except FileNotFoundError:
+                continue
+
+    def flush(self) -> None:
+        """Block until every event tracked so far has been written and fsynced."""
+        if self._closed:
+            return
+        # The writer thread owns the file, so the fsync request goes through the queue.
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write remaining events and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
         try:
-            with open(self.analytics_file, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {"events": [], "sessions": []}
+            self._queue.put(_STOP, timeout=10)
+        except queue.Full:
+            return
+        self._thread.join(timeout=10)
 
-    def _write_data(self, data: Dict[str, Any]) -> None:
-        """Write analytics data to file."""
-        with open(self.analytics_file, "w") as f:
-            json.dump(data, f, indent=2)
+    # ---------------------------------------------------------------- tracking
 
     def track_event(
         self,
         event_name: str,
-        properties: Optional[Dict[str, Any]] = None,
+        properties: dict[str, Any] | None = None,
     ) -> None:
         """
         Track an analytics event.
-        
+
         Args:
             event_name: Name of the event (e.g., "recommendation_generated")
             properties: Additional properties for the event
         """
-        data = self._read_data()
-        
-        event = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "event": event_name,
-            "properties": properties or {},
-        }
-        
-        data["events"].append(event)
-        
-        # Keep only last 1000 events
-        data["events"] = data["events"][-1000:]
-        
-        self._write_data(data)
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait((time.time(), event_name, properties or {}))
+        except queue.Full:
+            self._count_dropped(1)
+
+    def _count_dropped(self, count: int) -> None:
+        with self._dropped_lock:
+            self._dropped += count
+
+    @property
+    def dropped(self) -> int:
+        """Number of events discarded because the queue was full or a write failed."""
+        return self._dropped
 
     def track_recommendation(
         self,
         query: str,
-        genre: Optional[str],
+        genre: str | None,
         model: str,
         temperature: float,
         cached: bool,
         duration_ms: float,
         books_count: int,
+        exclude_genres: str | None = None,
     ) -> None:
-        """Track a recommendation generation event."""
-        self.track_event(
-            "recommendation_generated",
-            {
-                "query_length": len(query),
-                "genre": genre or "none",
-                "model": model,
-                "temperature": temperature,
-                "cached": cached,
-                "duration_ms": duration_ms,
-                "books_count": books_count,
-            },
-        )
+        """Track a recommendation generation event.
+
+        The query text and exclusions are only stored when ``record_queries`` is on.
+        """
+        properties: dict[str, Any] = {
+            "query_length": len(query),
+            "genre": genre or "none",
+            "model": model,
+            "temperature": temperature,
+            "cached": cached,
+            "duration_ms": duration_ms,
+            "books_count": books_count,
+        }
+        if self.record_queries:
+            properties["query"] = query
+            properties["exclude_genres"] = exclude_genres or ""
+        self.track_event("recommendation_generated", properties)
 
     def track_export(self, format: str) -> None:
         """Track an export action."""
@@ -112,70 +578,99 @@ class UsageAnalytics:
         """Track saving to reading list."""
         self.track_event("reading_list_save", {})
 
-    def get_stats(self) -> Dict[str, Any]:
+    def get_stats(self) -> dict[str, Any]:
         """
-        Get usage statistics.
-        
+        Get usage statistics over every event written by this and earlier runs.
+
         Returns:
             Dictionary with usage stats
         """
-        data = self._read_data()
-        events = data.get("events", [])
-        
-        if not events:
-            return {
-                "total_events": 0,
-                "recommendations": 0,
-                "exports": 0,
-                "ratings": 0,
-                "shares": 0,
-            }
-        
-        recommendations = [e for e in events if e["event"] == "recommendation_generated"]
-        exports = [e for e in events if e["event"] == "export"]
-        ratings = [e for e in events if e["event"] == "rating_submitted"]
-        shares = [e for e in events if e["event"] == "social_share"]
-        
-        stats = {
-            "total_events": len(events),
-            "recommendations": len(recommendations),
-            "exports": len(exports),
-            "ratings": len(ratings),
-            "shares": len(shares),
-            "first_event": events[0]["timestamp"] if events else None,
-            "last_event": events[-1]["timestamp"] if events else None,
-        }
-        
-        # Model usage
-        if recommendations:
-            model_usage = {}
-            for rec in recommendations:
-                model = rec["properties"].get("model", "unknown")
-                model_usage[model] = model_usage.get(model, 0) + 1
-            stats["model_usage"] = model_usage
-        
-        # Cache hit rate
-        if recommendations:
-            cached_count = sum(
-                1 for r in recommendations if r["properties"].get("cached", False)
-            )
-            stats["cache_hit_rate"] = cached_count / len(recommendations)
-        
-        # Average rating
-        if ratings:
-            avg_rating = sum(r["properties"]["rating"] for r in ratings) / len(ratings)
-            stats["average_rating"] = round(avg_rating, 2)
-        
-        return stats
+        with self._aggregates_lock:
+            return self._aggregates.stats()
+
+    def latency_sketch(
+        self,
+        model: str | None = None,
+        cached: bool | None = None,
+        since: float | None = None,
+    ) -> DDSketch:
+        """
+        Return a merged latency sketch for the written recommendation events.
+
+        Args:
+            model: Only include this model (default: all models)
+            cached: Only cache hits (True) or misses (False) (default: both)
+            since: Unix time; only use time buckets from then on (default: all time)
+
+        Returns:
+            A new DDSketch; call ``quantile(q)`` or ``percentiles()`` on it
+        """
+        with self._aggregates_lock:
+            return self._aggregates.latency_sketch(model, cached, since)
+
+    def latency_percentiles(
+        self,
+        model: str | None = None,
+        cached: bool | None = None,
+        since: float | None = None,
+    ) -> dict[str, Any]:
+        """Return count, mean, p50, p95 and p99 in ms for the matching requests."""
+        return self.latency_sketch(model, cached, since).percentiles()
 
 
 # Global analytics instance
-_analytics: Optional[UsageAnalytics] = None
+_analytics: UsageAnalytics | None = None
+_analytics_lock = threading.Lock()
+
+
+_worker_lock_file = None  # held open for the life of the process to keep its slot
+
+
+def _default_dir() -> Path:
+    return Path(ANALYTICS_DIR or Path.home() / ".book_recommender_analytics").expanduser()
 
 
 def get_analytics() -> UsageAnalytics:
     """Get or create the global analytics instance."""
     global _analytics
     if _analytics is None:
-        _analytics = UsageAnalytics()
+        with _analytics_lock:
+            if _analytics is None:
+                _analytics = UsageAnalytics()
+    return _analytics
+
+
+def _claim_worker_dir(base: Path) -> Path:
+    """Lock the first free ``worker-N`` directory under ``base`` for this process."""
+    global _worker_lock_file
+    if fcntl is None:  # pragma: no cover - Windows
+        return base / f"{_WORKER_PREFIX}pid{os.getpid()}"
+    slot = 0
+    while True:
+        path = base / f"{_WORKER_PREFIX}{slot}"
+        path.mkdir(parents=True, exist_ok=True)
+        handle = open(path / ".lock", "a")  # noqa: SIM115 - the lock lives as long as the process
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            slot += 1
+            continue
+        _worker_lock_file = handle
+        return path
+
+
+def use_worker_analytics() -> UsageAnalytics:
+    """Point this process's global analytics at a worker directory of its own.
+
+    Aggregates and segments assume a single writer, so each API worker process
+    records into the first unclaimed ``worker-N`` subdirectory of the analytics
+    directory (slots are reused across restarts). ``get_stats`` then covers this
+    worker only; ``iter_events(include_workers=True)`` on the main instance reads
+    every worker's events.
+    """
+    global _analytics
+    with _analytics_lock:
+        if _analytics is None:
+            _analytics = UsageAnalytics(str(_claim_worker_dir(_default_dir())))
     return _analytics
@@ -0,0 +1,314 @@
+"""Headless JSON HTTP API (ASGI) over :class:`BookRecommender`.
+
+Endpoints:
+    POST /v1/recommend  one query -> recommendation text, hints and the structured ``external`` list
+    POST /v1/batch      ``{"queries": [...]}`` -> results in input order
+    GET  /v1/stats      cache, coalescing and usage statistics
+    GET  /healthz       liveness probe
+
+Results carry a ``status`` (``ok``, ``rejected``, ``upstream_error`` or ``timeout``)
+that ``/v1/recommend`` also maps to the HTTP status (200, 422, 502 or 504).
+Responses larger than ``API_GZIP_MIN_BYTES`` are gzip-compressed for clients that
+accept it. Run it standalone with ``python -m src.book_recommender.api`` (several
+worker processes with ``--workers``), or next to the Gradio UI with ``API_WITH_GRADIO``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import math
+import sys
+import threading
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import anyio
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from . import google_books, metrics
+from .analytics import get_analytics, use_worker_analytics
+from .config import (
+    API_GZIP_MIN_BYTES,
+    API_HOST,
+    API_MAX_BATCH,
+    API_MAX_CONCURRENCY,
+    API_PORT,
+    API_WORKERS,
+    BATCH_MAX_CONCURRENCY,
+    CACHE_DB_PATH,
+    GROQ_MODEL,
+    LOG_JSON,
+    LOG_LEVEL,
+    LOG_QUEUE,
+    LOG_RATE_LIMITS,
+    METRICS_HOST,
+    METRICS_PORT,
+    SUPPORTED_MODELS,
+    WARMUP_ON_STARTUP,
+    require_api_key,
+)
+from .logger import get_logger, parse_rate_limits, setup_logging, shutdown_logging
+from .recommender import BookRecommender, Recommendation, response_status
+from .warmup import warm_on_startup
+
+if TYPE_CHECKING:  # uvicorn is only imported by the serving helpers
+    import uvicorn
+
+logger = get_logger()
+
+T = TypeVar("T")
+
+_STRING_FIELDS = ("user_interest", "genre", "exclude_genres", "model")
+# What Groq accepts; chains are keyed to two decimals, so this also bounds the chain registry.
+_TEMPERATURE_RANGE = (0.0, 2.0)
+# HTTP status of a single recommendation, by response_status()
+_HTTP_STATUS = {"ok": 200, "rejected": 422, "upstream_error": 502, "timeout": 504}
+
+
+class BadRequest(ValueError):
+    """A request body that does not match the API schema (answered with HTTP 400)."""
+
+
+def _parse_query(data: Any, where: str = "body") -> dict[str, Any]:
+    """Validate one query object and return the keyword arguments it maps to."""
+    if not isinstance(data, dict):
+        raise BadRequest(f"{where} must be a JSON object")
+    if "user_interest" not in data and "query" in data:
+        data = {**data, "user_interest": data["query"]}
+    query: dict[str, Any] = {}
+    for field in _STRING_FIELDS:
+        value = data.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            raise BadRequest(f"{where}: {field} must be a string")
+        query[field] = value
+    for field in ("temperature", "budget_seconds"):
+        value = data.get(field)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise BadRequest(f"{where}: {field} must be a number")
+        if not math.isfinite(value) or value < 0:
+            raise BadRequest(f"{where}: {field} must be a non-negative number")
+        query[field] = float(value)
+    if not query.get("user_interest", "").strip():
+        raise BadRequest(f"{where}: user_interest is required")
+    if query.get("model") and query["model"] not in SUPPORTED_MODELS:
+        raise BadRequest(f"{where}: model must be one of {', '.join(SUPPORTED_MODELS)}")
+    low, high = _TEMPERATURE_RANGE
+    if not low <= query.get("temperature", low) <= high:
+        raise BadRequest(f"{where}: temperature must be between {low:g} and {high:g}")
+    return query
+
+
+def _result(recommendation: Recommendation) -> dict[str, Any]:
+    text, hints, books = recommendation
+    return {
+        "status": response_status(text),
+        "recommendation": text,
+        "hints": hints,
+        "external": books,
+    }
+
+
+async def _json(request: Request) -> Any:
+    try:
+        return json.loads(await request.body())
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise BadRequest(f"Invalid JSON: {exc}") from exc
+
+
+async def _run(request: Request, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking recommender call in the worker thread pool.
+
+    The sync paths are thread-safe, so one recommender can be shared with the
+    Gradio UI, which drives the async paths from its own event loop.
+    """
+    return await anyio.to_thread.run_sync(
+        functools.partial(fn, *args, **kwargs), limiter=request.app.state.limiter
+    )
+
+
+async def recommend(request: Request) -> JSONResponse:
+    query = _parse_query(await _json(request))
+    recommender: BookRecommender = request.app.state.recommender
+    result = await _run(
+        request,
+        recommender.recommend,
+        query["user_interest"],
+        query.get("genre", ""),
+        query.get("exclude_genres", ""),
+        query.get("model"),
+        query.get("temperature"),
+        budget_seconds=query.get("budget_seconds"),
+    )
+    body = _result(result)
+    return JSONResponse(body, status_code=_HTTP_STATUS[body["status"]])
+
+
+async def batch(request: Request) -> JSONResponse:
+    body = await _json(request)
+    items = body.get("queries") if isinstance(body, dict) else None
+    if not isinstance(items, list):
+        raise BadRequest("body must be a JSON object with a queries list")
+    if len(items) > API_MAX_BATCH:
+        raise BadRequest(f"at most {API_MAX_BATCH} queries per batch")
+    queries = [_parse_query(item, f"queries[{i}]") for i, item in enumerate(items)]
+    for query in queries:
+        query.pop("budget_seconds", None)  # batches run without a per-request budget
+    recommender: BookRecommender = request.app.state.recommender
+    results = await _run(
+        request, recommender.recommend_batch, queries, max_concurrency=BATCH_MAX_CONCURRENCY
+    )
+    return JSONResponse({"results": [_result(result) for result in results]})
+
+
+async def stats(request: Request) -> JSONResponse:
+    recommender: BookRecommender = request.app.state.recommender
+    return JSONResponse(
+        {
+            "cache": recommender.cache_stats(),
+            "coalescing": recommender.coalescing_stats(),
+            "usage": get_analytics().get_stats(),
+        }
+    )
+
+
+async def health(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ok"})
+
+
+async def _bad_request(request: Request, exc: Exception) -> JSONResponse:
+    return JSONResponse({"error": str(exc)}, status_code=400)
+
+
+def _setup_logging() -> None:
+    setup_logging(
+        level=LOG_LEVEL,
+        json_format=LOG_JSON,
+        use_queue=LOG_QUEUE,
+        rate_limits=parse_rate_limits(LOG_RATE_LIMITS),
+    )
+
+
+def create_app(
+    recommender: BookRecommender | None = None,
+    max_concurrency: int = API_MAX_CONCURRENCY,
+    gzip_min_bytes: int = API_GZIP_MIN_BYTES,
+) -> Starlette:
+    """
+    Build the ASGI application.
+
+    Args:
+        recommender: Recommender to serve; when None (e.g. in a worker process started
+            by uvicorn) one is created and warmed at startup and closed at shutdown, and
+            usage analytics go to a worker subdirectory of ``ANALYTICS_DIR``
+        max_concurrency: Maximum recommender calls running at once; more requests wait
+        gzip_min_bytes: Minimum response size that is gzip-compressed
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        app.state.limiter = anyio.CapacityLimiter(max(1, max_concurrency))
+        if recommender is not None:
+            app.state.recommender = recommender
+            yield
+            return
+        _setup_logging()
+        use_worker_analytics()  # workers share ANALYTICS_DIR, so each writes its own slot
+        app.state.recommender = BookRecommender(default_model=GROQ_MODEL)
+        app.state.recommender.warm_chains()
+        try:
+            yield
+        finally:
+            google_books.close_clients()
+
+    return Starlette(
+        routes=[
+            Route("/v1/recommend", recommend, methods=["POST"]),
+            Route("/v1/batch", batch, methods=["POST"]),
+            Route("/v1/stats", stats, methods=["GET"]),
+            Route("/healthz", health, methods=["GET"]),
+        ],
+        middleware=[Middleware(GZipMiddleware, minimum_size=gzip_min_bytes)],
+        exception_handlers={BadRequest: _bad_request},
+        lifespan=lifespan,
+    )
+
+
+def start_api_server(
+    recommender: BookRecommender, host: str = API_HOST, port: int = API_PORT
+) -> uvicorn.Server:
+    """Serve the API for ``recommender`` on a daemon thread; set ``should_exit`` to stop it."""
+    import uvicorn
+
+    server = uvicorn.Server(
+        uvicorn.Config(create_app(recommender), host=host, port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, name="json-api", daemon=True).start()
+    logger.info(f"Serving the JSON API on http://{host}:{port}")
+    return server
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the book recommender as a JSON API.")
+    parser.add_argument("--host", default=API_HOST, help="Interface to bind")
+    parser.add_argument("--port", type=int, default=API_PORT, help="Port to bind")
+    parser.add_argument(
+        "--workers", type=int, default=API_WORKERS, help="Worker processes (each has its own cache)"
+    )
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    require_api_key()
+    _setup_logging()
+    try:
+        if args.workers > 1:
+            # Workers build their own recommender; only the persistent cache is shared,
+            # so a warm-up here only helps them when CACHE_DB_PATH is set.
+            if WARMUP_ON_STARTUP and CACHE_DB_PATH:
+                warm_on_startup(BookRecommender(default_model=GROQ_MODEL))
+            elif WARMUP_ON_STARTUP:
+                logger.warning("Skipping cache warm-up: several workers need CACHE_DB_PATH")
+            uvicorn.run(
+                f"{__package__}.api:create_app",
+                factory=True,
+                host=args.host,
+                port=args.port,
+                workers=args.workers,
+            )
+            return 0
+
+        recommender = BookRecommender(default_model=GROQ_MODEL)
+        recommender.warm_chains()
+        if WARMUP_ON_STARTUP:
+            warm_on_startup(recommender)
+        metrics_server = None
+        if METRICS_PORT:
+            metrics_server = metrics.start_metrics_server(METRICS_PORT, METRICS_HOST)
+        try:
+            uvicorn.run(create_app(recommender), host=args.host, port=args.port)
+        finally:
+            if metrics_server is not None:
+                metrics_server.shutdown()
+        return 0
+    finally:
+        google_books.close_clients()
+        shutdown_logging()
+
+
+__all__ = ["BadRequest", "create_app", "main", "start_api_server"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
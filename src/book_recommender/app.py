@@ -1,15 +1,61 @@
 """Application bootstrap for the book recommender."""
 
-from .config import GROQ_MODEL, require_api_key
+import signal
+
+from . import google_books, metrics
+from .config import (
+    API_HOST,
+    API_PORT,
+    API_WITH_GRADIO,
+    GROQ_MODEL,
+    LOG_JSON,
+    LOG_LEVEL,
+    LOG_QUEUE,
+    LOG_RATE_LIMITS,
+    METRICS_HOST,
+    METRICS_PORT,
+    WARMUP_ON_STARTUP,
+    require_api_key,
+)
+from .guardrails import reload_guardrails
+from .logger import parse_rate_limits, setup_logging, shutdown_logging
 from .recommender import BookRecommender
 from .ui import build_interface
+from .warmup import warm_on_startup
 
 
 def run_app() -> None:
     require_api_key()
+    setup_logging(
+        level=LOG_LEVEL,
+        json_format=LOG_JSON,
+        use_queue=LOG_QUEUE,
+        rate_limits=parse_rate_limits(LOG_RATE_LIMITS),
+    )
+    if hasattr(signal, "SIGHUP"):  # `kill -HUP <pid>` re-reads the guardrail blocklist
+        signal.signal(signal.SIGHUP, lambda *_: reload_guardrails())
+    metrics_server = None
+    if METRICS_PORT:
+        metrics_server = metrics.start_metrics_server(METRICS_PORT, METRICS_HOST)
     recommender = BookRecommender(default_model=GROQ_MODEL)
+    recommender.warm_chains()
+    if WARMUP_ON_STARTUP:  # fill the cache before the server starts accepting requests
+        warm_on_startup(recommender)
+    api_server = None
+    if API_WITH_GRADIO:
+        from .api import start_api_server
+
+        api_server = start_api_server(recommender, API_HOST, API_PORT)
     demo, css = build_interface(recommender)
-    demo.launch(css=css)
+    try:
+        demo.launch(css=css)
+    finally:
+        if api_server is not None:
+            api_server.should_exit = True
+        google_books.close_clients()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        shutdown_logging()
 
 
 __all__ = ["run_app"]
@@ -0,0 +1,135 @@
+"""Bulk recommendation generation from JSONL input to JSONL output."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import sys
+from collections.abc import Iterator, Sequence
+from typing import IO, Any
+
+from .config import BATCH_MAX_CONCURRENCY, GROQ_MODEL, require_api_key
+from .recommender import BookRecommender
+
+_OPTIONAL_STRINGS = ("genre", "exclude_genres", "model")
+
+
+def read_queries(stream: IO[str]) -> Iterator[dict[str, Any]]:
+    """Yield query dicts from JSONL; a bare string line is treated as ``user_interest``.
+
+    Raises:
+        ValueError: For a line that is not JSON, or a field of the wrong type
+            (``genre``, ``exclude_genres`` and ``model`` are strings, ``temperature``
+            a number and the warm-up's ``count`` an integer; each may be null)
+    """
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON on line {line_no}: {exc}") from exc
+        if isinstance(record, str):
+            record = {"user_interest": record}
+        elif not isinstance(record, dict):
+            raise ValueError(
+                f"Line {line_no} must be a JSON object or string, got {type(record).__name__}"
+            )
+        if "user_interest" not in record and "query" in record:
+            record["user_interest"] = record["query"]
+        if not isinstance(record.get("user_interest", ""), str):
+            raise ValueError(f"Line {line_no}: user_interest must be a string")
+        for field in _OPTIONAL_STRINGS:
+            if record.get(field) is not None and not isinstance(record[field], str):
+                raise ValueError(f"Line {line_no}: {field} must be a string")
+        for field, types, kind in (
+            ("temperature", (int, float), "a number"),
+            ("count", int, "an integer"),
+        ):
+            value = record.get(field)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, types)):
+                raise ValueError(f"Line {line_no}: {field} must be {kind}")
+        yield record
+
+
+def _chunks(records: Iterator[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    chunk: list[dict[str, Any]] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(
+    recommender: BookRecommender,
+    source: IO[str],
+    sink: IO[str],
+    chunk_size: int = 100,
+    max_concurrency: int = BATCH_MAX_CONCURRENCY,
+    force_refresh: bool = False,
+) -> int:
+    """Process ``source`` in chunks, writing one JSON result per input line. Returns the count."""
+    written = 0
+    for chunk in _chunks(read_queries(source), chunk_size):
+        results = recommender.recommend_batch(
+            chunk, max_concurrency=max_concurrency, force_refresh=force_refresh
+        )
+        for query, (rec, hints, books) in zip(chunk, results, strict=True):
+            sink.write(
+                json.dumps(
+                    {**query, "recommendations": rec, "hints": hints, "books": books},
+                    ensure_ascii=False,
+                )
+                + "\n"
+            )
+            written += 1
+        sink.flush()
+    return written
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate book recommendations in bulk.")
+    parser.add_argument("--input", "-i", default="-", help="JSONL file of queries ('-' for stdin)")
+    parser.add_argument("--output", "-o", default="-", help="JSONL output file ('-' for stdout)")
+    parser.add_argument("--chunk-size", type=int, default=100, help="Queries per batch call")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=BATCH_MAX_CONCURRENCY,
+        help="Concurrent LLM calls and hint lookups per chunk",
+    )
+    parser.add_argument("--force-refresh", action="store_true", help="Ignore cached results")
+    args = parser.parse_args(argv)
+
+    require_api_key()
+    recommender = BookRecommender(default_model=GROQ_MODEL)
+    with contextlib.ExitStack() as stack:
+        source = (
+            sys.stdin
+            if args.input == "-"
+            else stack.enter_context(open(args.input, encoding="utf-8"))
+        )
+        sink = (
+            sys.stdout
+            if args.output == "-"
+            else stack.enter_context(open(args.output, "w", encoding="utf-8"))
+        )
+        count = run_batch(
+            recommender,
+            source,
+            sink,
+            chunk_size=args.chunk_size,
+            max_concurrency=args.max_concurrency,
+            force_refresh=args.force_refresh,
+        )
+    print(f"Wrote {count} results", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""Bounded, thread-safe caching primitives for the book recommender."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+V = TypeVar("V")
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a cached value in bytes.
+
+    Walks strings, numbers, and nested containers (dicts, lists, tuples). This is
+    a budget heuristic, not an exact accounting of interpreter overhead.
+    """
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LRUTTLCache(Generic[V]):
+    """LRU cache with a byte budget, optional entry cap, and per-entry TTL.
+
+    All operations take a single lock, so the cache can be shared by Gradio
+    worker threads. Expired entries are dropped lazily on access and eagerly
+    when space is needed.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Total size budget across all entries (keys included)
+            ttl_seconds: Default time-to-live per entry; None or <= 0 disables expiry
+            max_entries: Optional hard cap on the number of entries
+            sizeof: Function estimating an entry's size in bytes
+            clock: Monotonic clock, injectable for tests
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self.max_entries = max_entries
+        self._sizeof = sizeof
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (value, size_bytes, expires_at or None)
+        self._entries: OrderedDict[Hashable, tuple[V, int, float | None]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: V | None = None) -> V | None:
+        """Return the cached value and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, _, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V, ttl_seconds: float | None = None) -> bool:
+        """Store a value, evicting least recently used entries to fit the budget.
+
+        ``ttl_seconds`` overrides the default TTL for this entry; an explicit value
+        <= 0 means the entry is already expired, so it is not stored. Returns False
+        when the entry was not stored (expired or larger than the byte budget).
+        """
+        size = self._sizeof(key) + self._sizeof(value)
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            self.pop(key)
+            return False
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = self._clock() + ttl if ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return False
+            self._make_room(size)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            return True
+
+    def pop(self, key: Hashable) -> V | None:
+        """Remove an entry and return its value, if present."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._remove(key)
+            return entry[0]
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[2] is None or entry[2] > self._clock())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def current_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss/eviction counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _over_budget(self, incoming: int) -> bool:
+        return self._bytes + incoming > self.max_bytes or (
+            self.max_entries is not None and len(self._entries) >= self.max_entries
+        )
+
+    def _make_room(self, incoming: int) -> None:
+        if not self._over_budget(incoming):
+            return
+        # Expired entries go first so they never push out live ones.
+        now = self._clock()
+        expired = [k for k, (_, _, exp) in self._entries.items() if exp is not None and exp <= now]
+        for key in expired:
+            self._remove(key)
+            self.expirations += 1
+        while self._entries and self._over_budget(incoming):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
@@ -0,0 +1,330 @@
+"""Record/replay of upstream traffic (Google Books hints and LLM chain outputs).
+
+In ``record`` mode every Google Books result and chain output is appended to a
+JSONL cassette together with how long the upstream call took. In ``replay`` mode
+those entries are served instead of calling the network, optionally sleeping for
+the recorded latency (or a fixed synthetic one) so load tests see realistic
+timings. A request that was never recorded raises :class:`CassetteMiss`, which the
+callers treat like any other upstream failure.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from .config import CASSETTE_LATENCY, CASSETTE_MODE, CASSETTE_PATH
+from .logger import get_logger
+
+logger = get_logger()
+
+MODES = ("off", "record", "replay")
+
+# (value, upstream latency in ms, streamed chunks or None)
+Entry = tuple[Any, float, list[str] | None]
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode for a request that is not on the cassette."""
+
+
+def chain_key(model: str, temperature: float, inputs: dict[str, Any]) -> str:
+    """Stable key for one chain call: model, rounded temperature, and prompt inputs."""
+    payload = json.dumps(
+        [model, round(float(temperature), 2), inputs], sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class Cassette:
+    """JSONL store of recorded upstream responses, keyed by ``(kind, key)``.
+
+    Appends are serialized by a lock and flushed per entry, so a recording that is
+    interrupted keeps everything written so far. When a key is recorded more than
+    once, replay serves the latest entry.
+    """
+
+    def __init__(self, path: str, mode: str = "off", latency: str = "none") -> None:
+        """
+        Initialize the cassette, loading recorded entries in replay mode.
+
+        Args:
+            path: Cassette file (JSON lines)
+            mode: ``off``, ``record`` or ``replay``
+            latency: Replay delay: ``none``, ``recorded``, or a fixed number of milliseconds
+        """
+        mode = (mode or "off").strip().lower()
+        if mode not in MODES:
+            raise ValueError(f"Cassette mode must be one of {MODES}, got {mode!r}")
+        self.path = Path(path).expanduser()
+        self.mode = mode
+        self._latency = self._parse_latency(latency)
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], Entry] = {}
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        if mode == "replay":
+            self._load()
+        elif mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _parse_latency(latency: str) -> float | None:
+        """Return a fixed delay in ms, -1 for "recorded", or None for no delay."""
+        value = (latency or "none").strip().lower()
+        if value in ("none", "off", "0"):
+            return None
+        if value == "recorded":
+            return -1.0
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            raise ValueError(
+                f"Cassette latency must be 'none', 'recorded', or milliseconds, got {latency!r}"
+            ) from None
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            logger.warning(f"Cassette {self.path} does not exist; every replay will miss")
+            return
+        with open(self.path, encoding="utf-8") as handle:
+            for number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                    self._entries[(data["kind"], data["key"])] = (
+                        data["value"],
+                        float(data.get("latency_ms", 0.0)),
+                        data.get("chunks"),
+                    )
+                except (ValueError, KeyError, TypeError) as exc:
+                    logger.warning(f"Skipping malformed cassette line {number}: {exc}")
+
+    def record(
+        self,
+        kind: str,
+        key: str,
+        value: Any,
+        latency_ms: float,
+        chunks: list[str] | None = None,
+    ) -> None:
+        """Append one upstream response (a no-op unless recording)."""
+        if not self.recording:
+            return
+        data: dict[str, Any] = {
+            "kind": kind,
+            "key": key,
+            "value": value,
+            "latency_ms": round(latency_ms, 3),
+        }
+        if chunks is not None:
+            data["chunks"] = chunks
+        line = json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line)
+            self._entries[(kind, key)] = (value, latency_ms, chunks)
+            self.recorded += 1
+
+    def lookup(self, kind: str, key: str) -> Entry:
+        """Return the recorded entry or raise :class:`CassetteMiss`."""
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is None:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded {kind} response for key {key}")
+            self.replayed += 1
+        return entry
+
+    def delay(self, latency_ms: float) -> float:
+        """Seconds to wait before serving an entry recorded with ``latency_ms``."""
+        if self._latency is None:
+            return 0.0
+        return (latency_ms if self._latency < 0 else self._latency) / 1000
+
+    def replay(self, kind: str, key: str) -> Any:
+        """Serve a recorded value, sleeping for the configured latency first."""
+        value, latency_ms, _ = self.lookup(kind, key)
+        wait = self.delay(latency_ms)
+        if wait:
+            time.sleep(wait)
+        return value
+
+    async def areplay(self, kind: str, key: str) -> Any:
+        """Async variant of :meth:`replay`."""
+        value, latency_ms, _ = self.lookup(kind, key)
+        wait = self.delay(latency_ms)
+        if wait:
+            await asyncio.sleep(wait)
+        return value
+
+    def stats(self) -> dict[str, Any]:
+        """Return the mode and recorded/replayed/miss counters."""
+        return {
+            "mode": self.mode,
+            "path": str(self.path),
+            "entries": len(self._entries),
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+        }
+
+
+class CassetteChain:
+    """Chain stand-in that records or replays the outputs of a real chain.
+
+    Supports the runnable methods the recommender uses (``invoke``, ``ainvoke``,
+    ``stream``, ``astream`` and ``batch``). When replaying, ``inner`` is never
+    called and may be None; streamed recordings are replayed chunk by chunk with
+    the latency spread evenly across the chunks.
+    """
+
+    def __init__(
+        self, cassette: Cassette, model: str, temperature: float, inner: Any = None
+    ) -> None:
+        self.cassette = cassette
+        self.model = model
+        self.temperature = temperature
+        self.inner = inner
+
+    def _key(self, inputs: dict[str, Any]) -> str:
+        return chain_key(self.model, self.temperature, inputs)
+
+    def _chunks(self, key: str) -> tuple[list[str], float]:
+        value, latency_ms, chunks = self.cassette.lookup("llm", key)
+        chunks = chunks or [value]
+        return chunks, self.cassette.delay(latency_ms) / len(chunks)
+
+    def invoke(self, inputs: dict[str, Any], config: Any = None) -> str:
+        key = self._key(inputs)
+        if self.cassette.replaying:
+            return self.cassette.replay("llm", key)
+        start = time.perf_counter()
+        result = self.inner.invoke(inputs, config)
+        self.cassette.record("llm", key, result, (time.perf_counter() - start) * 1000)
+        return result
+
+    async def ainvoke(self, inputs: dict[str, Any], config: Any = None) -> str:
+        key = self._key(inputs)
+        if self.cassette.replaying:
+            return await self.cassette.areplay("llm", key)
+        start = time.perf_counter()
+        result = await self.inner.ainvoke(inputs, config)
+        self.cassette.record("llm", key, result, (time.perf_counter() - start) * 1000)
+        return result
+
+    def stream(self, inputs: dict[str, Any], config: Any = None) -> Iterator[str]:
+        key = self._key(inputs)
+        if self.cassette.replaying:
+            recorded, pause = self._chunks(key)
+            for chunk in recorded:
+                if pause:
+                    time.sleep(pause)
+                yield chunk
+            return
+        start = time.perf_counter()
+        chunks: list[str] = []
+        for chunk in self.inner.stream(inputs, config):
+            chunks.append(chunk)
+            yield chunk
+        self.cassette.record(
+            "llm", key, "".join(chunks), (time.perf_counter() - start) * 1000, chunks
+        )
+
+    async def astream(self, inputs: dict[str, Any], config: Any = None) -> AsyncIterator[str]:
+        key = self._key(inputs)
+        if self.cassette.replaying:
+            recorded, pause = self._chunks(key)
+            for chunk in recorded:
+                if pause:
+                    await asyncio.sleep(pause)
+                yield chunk
+            return
+        start = time.perf_counter()
+        chunks: list[str] = []
+        async for chunk in self.inner.astream(inputs, config):
+            chunks.append(chunk)
+            yield chunk
+        self.cassette.record(
+            "llm", key, "".join(chunks), (time.perf_counter() - start) * 1000, chunks
+        )
+
+    def batch(
+        self,
+        inputs: list[dict[str, Any]],
+        config: Any = None,
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        if not self.cassette.replaying:
+            start = time.perf_counter()
+            outputs = self.inner.batch(inputs, config, return_exceptions=return_exceptions)
+            # Calls run concurrently, so each output is recorded with the batch's wall time.
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            for item, output in zip(inputs, outputs, strict=True):
+                if not isinstance(output, Exception):
+                    self.cassette.record("llm", self._key(item), output, elapsed_ms)
+            return outputs
+        outputs: list[Any] = []
+        longest = 0.0
+        for item in inputs:
+            try:
+                value, latency_ms, _ = self.cassette.lookup("llm", self._key(item))
+            except CassetteMiss as exc:
+                if not return_exceptions:
+                    raise
+                outputs.append(exc)
+                continue
+            outputs.append(value)
+            longest = max(longest, self.cassette.delay(latency_ms))
+        if longest:
+            time.sleep(longest)
+        return outputs
+
+
+def wrap_builder(
+    builder: Callable[[str, float], Any], cassette: Cassette
+) -> Callable[[str, float], Any]:
+    """Wrap a chain builder so its chains go through ``cassette`` (unchanged when off).
+
+    When replaying, the real builder is never called, so no API key is needed.
+    """
+    if cassette.mode == "off":
+        return builder
+
+    def build(model: str, temperature: float) -> CassetteChain:
+        inner = None if cassette.replaying else builder(model, temperature)
+        return CassetteChain(cassette, model, temperature, inner)
+
+    return build
+
+
+_cassette: Cassette | None = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Cassette:
+    """Get or create the global cassette configured by ``CASSETTE_*`` settings."""
+    global _cassette
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                _cassette = Cassette(CASSETTE_PATH, CASSETTE_MODE, CASSETTE_LATENCY)
+                if _cassette.mode != "off":
+                    logger.info(f"Cassette {_cassette.mode} mode using {_cassette.path}")
+    return _cassette
@@ -0,0 +1,381 @@
+"""Offline book catalog index that returns Google Books-style hints without the network."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import json
+import sqlite3
+import sys
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .config import CATALOG_PATH
+from .logger import get_logger
+from .semantic_cache import HashingVectorizer
+
+logger = get_logger()
+
+_SCHEMA = (
+    "CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT, authors TEXT, subjects TEXT, "
+    "description TEXT, thumbnail TEXT, link TEXT)",
+    "CREATE TABLE terms (term TEXT PRIMARY KEY, start INTEGER, count INTEGER) WITHOUT ROWID",
+)
+_FIELD_ALIASES = {
+    "title": ("title",),
+    "authors": ("authors", "author"),
+    "subjects": ("subjects", "categories", "subject", "genres", "genre"),
+    "description": ("description", "summary"),
+    "thumbnail": ("thumbnail", "image", "cover"),
+    "link": ("link", "infoLink", "url"),
+}
+# Term-frequency weight of each indexed field (BM25F-style); descriptions are cut at 1000 chars.
+_FIELD_WEIGHTS = (("title", 3.0), ("authors", 2.0), ("subjects", 2.0), ("description", 1.0))
+_DESCRIPTION_CHARS = 1000
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_POSTING = np.dtype([("doc", "<i4"), ("impact", "<f4")])
+POSTINGS_SUFFIX = ".postings.npy"
+VECTORS_SUFFIX = ".vectors.npy"
+
+
+def _field(record: dict[str, Any], name: str) -> str:
+    for alias in _FIELD_ALIASES[name]:
+        value = record.get(alias)
+        if value:
+            if isinstance(value, (list, tuple)):
+                return ", ".join(str(item) for item in value)
+            return str(value)
+    return ""
+
+
+def read_records(path: str) -> Iterator[dict[str, Any]]:
+    """Yield book records from a JSONL (one object per line) or CSV (with header) dump."""
+    with open(path, encoding="utf-8", newline="") as handle:
+        if path.endswith(".csv"):
+            yield from csv.DictReader(handle)
+            return
+        for line_no, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Invalid JSON on line {line_no}: {exc}") from exc
+            if not isinstance(record, dict):
+                raise ValueError(
+                    f"Line {line_no} must be a JSON object, got {type(record).__name__}"
+                )
+            yield record
+
+
+def _short_description(description: str) -> str:
+    # Same trimming as the Google Books cards: first two sentences, at most 220 chars.
+    return ". ".join(description.split(".", 2)[:2]).strip()[:220]
+
+
+def build_catalog(
+    records: Iterable[dict[str, Any]],
+    path: str,
+    vectors: bool = False,
+    dim: int = 256,
+    batch_size: int = 10_000,
+) -> int:
+    """Index ``records`` into ``path`` and its sidecar files; returns the number of books.
+
+    ``path`` is an SQLite database holding the display fields and the term
+    dictionary. The postings go to ``<path>.postings.npy``: for every term, the
+    books containing it with their precomputed BM25 score, highest first. With
+    ``vectors`` a float32 embedding per book is also written to
+    ``<path>.vectors.npy`` (row ``i`` belongs to book id ``i``) and used by
+    :class:`LocalCatalog` to re-rank keyword matches. Records are streamed;
+    memory grows with the number of postings (roughly 12 bytes per distinct
+    term per book), not with the text.
+    """
+    target = Path(path).expanduser()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    raw_path = Path(str(target) + ".vectors.tmp")
+    for stale in (target, raw_path, Path(str(target) + VECTORS_SUFFIX)):
+        if stale.exists():
+            stale.unlink()
+    tokens = HashingVectorizer.tokens
+    vectorizer = HashingVectorizer(dim) if vectors else None
+    vocab: dict[str, int] = {}
+    chunks: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+    lengths: list[float] = []
+    batch_terms: list[int] = []
+    batch_docs: list[int] = []
+    batch_freqs: list[float] = []
+    rows: list[tuple] = []
+    with contextlib.ExitStack() as stack:
+        conn = sqlite3.connect(str(target))
+        stack.callback(conn.close)
+        # Embeddings are streamed to a raw file and wrapped as .npy once the count is known.
+        raw = stack.enter_context(open(raw_path, "wb")) if vectorizer is not None else None
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        for record in records:
+            fields = {name: _field(record, name) for name in _FIELD_ALIASES}
+            if not fields["title"]:
+                continue
+            doc = len(lengths)
+            freqs: dict[int, float] = {}
+            for name, weight in _FIELD_WEIGHTS:
+                for token in tokens(fields[name][:_DESCRIPTION_CHARS]):
+                    term = vocab.setdefault(token, len(vocab))
+                    freqs[term] = freqs.get(term, 0.0) + weight
+            lengths.append(sum(freqs.values()))
+            batch_terms.extend(freqs)
+            batch_freqs.extend(freqs.values())
+            batch_docs.extend([doc] * len(freqs))
+            description = fields["description"]
+            fields["description"] = _short_description(description)
+            rows.append((doc, *fields.values()))
+            if raw is not None:
+                text = f"{fields['title']} {fields['subjects']} {description[:500]}"
+                raw.write(vectorizer.embed(text).tobytes())  # type: ignore[union-attr]
+            if len(rows) >= batch_size:
+                conn.executemany("INSERT INTO books VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                chunks.append(_chunk(batch_terms, batch_docs, batch_freqs))
+                rows, batch_terms, batch_docs, batch_freqs = [], [], [], []
+        conn.executemany("INSERT INTO books VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        chunks.append(_chunk(batch_terms, batch_docs, batch_freqs))
+        starts, counts = _write_postings(
+            target, chunks, np.array(lengths, dtype=np.float32), len(vocab)
+        )
+        conn.executemany(
+            "INSERT INTO terms VALUES (?, ?, ?)",
+            ((term, int(starts[i]), int(counts[i])) for term, i in vocab.items()),
+        )
+        conn.commit()
+    if vectorizer is not None:
+        _write_vectors(target, raw_path, len(lengths), dim)
+    return len(lengths)
+
+
+def _chunk(terms: list[int], docs: list[int], freqs: list[float]) -> tuple[np.ndarray, ...]:
+    return (
+        np.array(terms, dtype=np.int32),
+        np.array(docs, dtype=np.int32),
+        np.array(freqs, dtype=np.float32),
+    )
+
+
+def _write_postings(
+    target: Path, chunks: list[tuple[np.ndarray, ...]], lengths: np.ndarray, vocab_size: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Score every (term, book) pair with BM25 and write the lists in impact order."""
+    terms, docs, freqs = (np.concatenate(parts) for parts in zip(*chunks, strict=True))
+    chunks.clear()
+    counts = np.bincount(terms, minlength=vocab_size)
+    idf = np.log1p((len(lengths) - counts + 0.5) / (counts + 0.5)).astype(np.float32)
+    norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * lengths / (lengths.mean() if len(lengths) else 1))
+    impacts = idf[terms] * freqs * (_BM25_K1 + 1) / (freqs + norm[docs])
+    order = np.lexsort((-impacts, terms))
+    postings = np.empty(len(order), dtype=_POSTING)
+    postings["doc"] = docs[order]
+    postings["impact"] = impacts[order]
+    np.save(str(target) + POSTINGS_SUFFIX, postings)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return starts, counts
+
+
+def _write_vectors(target: Path, raw_path: Path, count: int, dim: int) -> None:
+    try:
+        out = np.lib.format.open_memmap(
+            str(target) + VECTORS_SUFFIX, mode="w+", dtype=np.float32, shape=(count, dim)
+        )
+        if count:
+            out[:] = np.memmap(raw_path, dtype=np.float32, mode="r", shape=(count, dim))
+        out.flush()
+        del out
+    finally:
+        raw_path.unlink()
+
+
+class LocalCatalog:
+    """Keyword (BM25) search over a local book dump, with optional vector re-ranking.
+
+    The index built by :func:`build_catalog` is impact-ordered: each term's
+    postings are stored best-scoring book first, so a query reads at most
+    ``depth`` postings per term from a memory-mapped array and adds them up,
+    however many books contain the term. Lookups therefore stay around a
+    millisecond for millions of titles, at the cost of missing books that rank
+    below ``depth`` for every query term. Nothing is loaded until the first
+    search and the OS pages in only what queries touch; the term dictionary and
+    book fields stay in SQLite, with one read-only connection per thread. When a
+    ``.vectors.npy`` file sits next to the index it is memory-mapped too and
+    blended into the ranking of the top keyword matches. Results use the same
+    card dicts as :func:`google_books.fetch_google_books`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        candidates: int = 5,
+        depth: int = 1000,
+        genre_boost: float = 0.5,
+        vector_weight: float = 0.5,
+    ) -> None:
+        """
+        Initialize the catalog without opening anything yet.
+
+        Args:
+            path: Index file written by :func:`build_catalog`
+            candidates: Keyword matches fetched per requested result for re-ranking
+            depth: Maximum postings read per query term
+            genre_boost: Relative score bonus for books whose subjects mention the genre
+            vector_weight: Share of the final score from embedding similarity (0-1)
+        """
+        self.path = str(Path(path).expanduser())
+        self.candidates = max(1, candidates)
+        self.depth = max(1, depth)
+        self.genre_boost = genre_boost
+        self.vector_weight = vector_weight
+        self._local = threading.local()
+        self._load_lock = threading.Lock()
+        self._postings: np.ndarray | None = None
+        self._vectors: np.ndarray | None = None
+        self._vectorizer: HashingVectorizer | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def _load(self) -> np.ndarray:
+        if self._postings is None:
+            with self._load_lock:
+                if self._postings is None:
+                    vectors_path = Path(self.path + VECTORS_SUFFIX)
+                    if vectors_path.exists():
+                        self._vectors = np.load(vectors_path, mmap_mode="r")
+                        self._vectorizer = HashingVectorizer(self._vectors.shape[1])
+                    self._postings = np.load(self.path + POSTINGS_SUFFIX, mmap_mode="r")
+        return self._postings
+
+    def search(self, query: str, genre: str = "", max_results: int = 4) -> list[dict[str, str]]:
+        """Return up to ``max_results`` hint cards for ``query``, best match first."""
+        terms = list(dict.fromkeys(HashingVectorizer.tokens(query)))
+        if not terms or max_results < 1:
+            return []
+        try:
+            postings = self._load()
+            conn = self._connection()
+            spans = conn.execute(
+                f"SELECT start, count FROM terms WHERE term IN ({', '.join('?' * len(terms))})",
+                terms,
+            ).fetchall()
+            if not spans:
+                return []
+            block = np.concatenate(
+                [postings[start : start + min(count, self.depth)] for start, count in spans]
+            )
+            docs, inverse = np.unique(block["doc"], return_inverse=True)
+            scores = np.bincount(inverse, weights=block["impact"])
+            limit = min(len(docs), max_results * self.candidates)
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            ids = [int(doc) for doc in docs[top]]
+            rows = conn.execute(
+                "SELECT id, title, authors, subjects, description, thumbnail, link "
+                f"FROM books WHERE id IN ({', '.join('?' * len(ids))})",
+                ids,
+            ).fetchall()
+        except (OSError, ValueError, sqlite3.Error) as exc:
+            logger.warning(f"Local catalog search failed: {exc}")
+            return []
+        score_of = dict(zip(ids, scores[top].tolist(), strict=True))
+        ranked = self._rank(rows, score_of, query, genre)
+        return [
+            {
+                "title": title,
+                "authors": authors or "Unknown author",
+                "description": description,
+                "thumbnail": thumbnail,
+                "link": link,
+            }
+            for _, title, authors, _, description, thumbnail, link in ranked[:max_results]
+        ]
+
+    async def asearch(
+        self, query: str, genre: str = "", max_results: int = 4
+    ) -> list[dict[str, str]]:
+        """Async variant of :meth:`search`; lookups take about a millisecond, so it runs inline."""
+        return self.search(query, genre, max_results)
+
+    def _rank(
+        self, rows: list[tuple], score_of: dict[int, float], query: str, genre: str
+    ) -> list[tuple]:
+        keyword = np.array([score_of[row[0]] for row in rows], dtype=np.float32)
+        keyword /= keyword.max() or 1.0
+        genre_terms = set(HashingVectorizer.tokens(genre or ""))
+        if genre_terms:
+            keyword *= [
+                1 + self.genre_boost if genre_terms & set(HashingVectorizer.tokens(row[3])) else 1
+                for row in rows
+            ]
+        score = keyword
+        if self._vectors is not None and len(rows) > 1:
+            embedded = self._vectorizer.embed(query)  # type: ignore[union-attr]
+            similarity = self._vectors[np.array([row[0] for row in rows])] @ embedded
+            score = (
+                1 - self.vector_weight
+            ) * keyword / keyword.max() + self.vector_weight * similarity
+        # Ties keep the lower (earlier indexed) id first so results are deterministic.
+        order = np.lexsort(([row[0] for row in rows], -score))
+        return [rows[i] for i in order]
+
+    def __len__(self) -> int:
+        row = self._connection().execute("SELECT COUNT(*) FROM books").fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_catalog: LocalCatalog | None = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> LocalCatalog | None:
+    """Return the catalog at ``CATALOG_PATH``, or None when it is not configured."""
+    global _catalog
+    if _catalog is None and CATALOG_PATH:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = LocalCatalog(CATALOG_PATH)
+    return _catalog
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build a local book catalog index.")
+    parser.add_argument("--input", "-i", required=True, help="JSONL or CSV book dump")
+    parser.add_argument("--output", "-o", required=True, help="Index file to write")
+    parser.add_argument(
+        "--vectors", action="store_true", help="Also write memory-mapped embeddings for re-ranking"
+    )
+    parser.add_argument("--dim", type=int, default=256, help="Embedding dimension")
+    args = parser.parse_args(argv)
+
+    try:
+        count = build_catalog(read_records(args.input), args.output, args.vectors, args.dim)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    print(f"Indexed {count} books into {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Prompt template and a thread-safe registry of reusable LLM chains."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any
+
+from .config import GROQ_API_KEY, GROQ_TIMEOUT_SECONDS
+
+if TYPE_CHECKING:  # LangChain takes ~0.5s to import, so it loads with the first chain
+    from langchain_core.prompts import ChatPromptTemplate
+
+PROMPT_TEMPLATE = (
+    "You are a careful, spoiler-free book recommendation assistant.\n"
+    "- Avoid NSFW content.\n"
+    "- Do not include plot spoilers.\n"
+    "- Keep each reason concise.\n"
+    "- Prefer diverse, high-quality picks.\n"
+    "- Respect excluded genres.\n"
+    "- Blend relevant external suggestions when helpful.\n\n"
+    "User interests: {user_interest}\n"
+    "Preferred genre: {genre}\n"
+    "Excluded genres: {exclude_genres}\n"
+    "External suggestions: {external_suggestions}\n\n"
+    "Return exactly 5 numbered Markdown lines like:\n"
+    "1. **Title** — brief reason (no spoilers)"
+)
+
+_prompt: ChatPromptTemplate | None = None
+_prompt_lock = threading.Lock()
+
+
+def get_prompt() -> ChatPromptTemplate:
+    """Return the shared prompt template, parsing it on first use."""
+    global _prompt
+    if _prompt is None:
+        from langchain_core.prompts import ChatPromptTemplate
+
+        with _prompt_lock:
+            if _prompt is None:
+                _prompt = ChatPromptTemplate.from_template(PROMPT_TEMPLATE)
+    return _prompt
+
+
+def build_chain(model: str, temperature: float):
+    """Construct a prompt | ChatGroq | parser chain for one (model, temperature)."""
+    from langchain_core.output_parsers import StrOutputParser
+    from langchain_groq import ChatGroq
+
+    chat_llm = ChatGroq(
+        temperature=temperature,
+        groq_api_key=GROQ_API_KEY,
+        model=model,
+        timeout=GROQ_TIMEOUT_SECONDS,
+    )
+    return get_prompt() | chat_llm | StrOutputParser()
+
+
+ChainKey = tuple[str, float]
+
+
+class ChainRegistry:
+    """Build each (model, temperature) chain once and share it across threads.
+
+    Runnables and the ChatGroq client are safe for concurrent invocation, so one
+    chain per key keeps the underlying HTTP connection pool (and keep-alive to
+    the Groq endpoint) warm instead of reconnecting on every cache miss.
+    """
+
+    def __init__(self, builder: Callable[[str, float], Any] = build_chain) -> None:
+        self._builder = builder
+        self._chains: dict[ChainKey, Any] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(model: str, temperature: float) -> ChainKey:
+        # Mirrors the two-decimal rounding used by BookRecommender._cache_key.
+        return model.strip(), round(float(temperature), 2)
+
+    def get(self, model: str, temperature: float):
+        """Return the cached chain for the key, building it on first request."""
+        key = self._key(model, temperature)
+        chain = self._chains.get(key)
+        if chain is not None:
+            return chain
+        with self._lock:
+            chain = self._chains.get(key)
+            if chain is None:
+                chain = self._builder(*key)
+                self._chains[key] = chain
+        return chain
+
+    def warm(self, models: Iterable[str], temperature: float) -> int:
+        """Pre-build chains for every model at ``temperature``; returns how many were built."""
+        built = 0
+        for model in models:
+            if self._key(model, temperature) not in self._chains:
+                self.get(model, temperature)
+                built += 1
+        return built
+
+    def clear(self) -> None:
+        with self._lock:
+            self._chains.clear()
+
+    def __len__(self) -> int:
+        return len(self._chains)
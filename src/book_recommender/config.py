@@ -16,6 +16,140 @@ SUPPORTED_MODELS: Final[list[str]] = [
 ]
 DEFAULT_TEMPERATURE: Final[float] = 0.8
 
+# In-memory recommendation cache (LRU with byte budget and TTL)
+CACHE_MAX_BYTES: Final[int] = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_MAX_ENTRIES: Final[int] = int(os.getenv("CACHE_MAX_ENTRIES", "5000"))
+CACHE_TTL_SECONDS: Final[float] = float(os.getenv("CACHE_TTL_SECONDS", "21600"))
+
+# Optional persistent cache shared by restarts and worker processes (empty path disables it)
+CACHE_DB_PATH: Final[str] = os.getenv("CACHE_DB_PATH", "")
+CACHE_DB_TTL_SECONDS: Final[float] = float(os.getenv("CACHE_DB_TTL_SECONDS", "604800"))
+
+# Optional semantic cache: paraphrased queries reuse a cached result above the cosine threshold
+SEMANTIC_CACHE_ENABLED: Final[bool] = os.getenv(
+    "SEMANTIC_CACHE_ENABLED", "false"
+).lower() in ("1", "true", "yes")
+SEMANTIC_CACHE_THRESHOLD: Final[float] = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))
+SEMANTIC_CACHE_MAX_ENTRIES: Final[int] = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "5000"))
+SEMANTIC_CACHE_DIM: Final[int] = int(os.getenv("SEMANTIC_CACHE_DIM", "1024"))
+
+# Google Books HTTP client (pooled keep-alive session with bounded, jittered retries)
+GOOGLE_BOOKS_POOL_SIZE: Final[int] = int(os.getenv("GOOGLE_BOOKS_POOL_SIZE", "16"))
+GOOGLE_BOOKS_CONNECT_TIMEOUT: Final[float] = float(os.getenv("GOOGLE_BOOKS_CONNECT_TIMEOUT", "3.05"))
+GOOGLE_BOOKS_READ_TIMEOUT: Final[float] = float(os.getenv("GOOGLE_BOOKS_READ_TIMEOUT", "6"))
+GOOGLE_BOOKS_MAX_RETRIES: Final[int] = int(os.getenv("GOOGLE_BOOKS_MAX_RETRIES", "2"))
+GOOGLE_BOOKS_BACKOFF_SECONDS: Final[float] = float(os.getenv("GOOGLE_BOOKS_BACKOFF_SECONDS", "0.25"))
+GOOGLE_BOOKS_BACKOFF_MAX_SECONDS: Final[float] = float(
+    os.getenv("GOOGLE_BOOKS_BACKOFF_MAX_SECONDS", "2")
+)
+# Send a duplicate request when the first has not answered after this long (0 disables)
+GOOGLE_BOOKS_HEDGE_AFTER_SECONDS: Final[float] = float(
+    os.getenv("GOOGLE_BOOKS_HEDGE_AFTER_SECONDS", "1.0")
+)
+
+# Google Books hint cache keyed by (query, genre, max_results); empty/failed lookups use the short TTL
+HINTS_CACHE_MAX_BYTES: Final[int] = int(os.getenv("HINTS_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+HINTS_CACHE_MAX_ENTRIES: Final[int] = int(os.getenv("HINTS_CACHE_MAX_ENTRIES", "2000"))
+HINTS_CACHE_TTL_SECONDS: Final[float] = float(os.getenv("HINTS_CACHE_TTL_SECONDS", "86400"))
+HINTS_NEGATIVE_TTL_SECONDS: Final[float] = float(os.getenv("HINTS_NEGATIVE_TTL_SECONDS", "60"))
+
+# Offline book catalog (index built with scripts/build_catalog.py; empty disables it)
+CATALOG_PATH: Final[str] = os.getenv("CATALOG_PATH", "")
+
+# Hint providers queried concurrently per request (comma-separated: google_books, catalog);
+# whatever arrives within the deadline is merged and passed to the LLM
+HINT_PROVIDERS: Final[str] = os.getenv("HINT_PROVIDERS", "google_books,catalog")
+HINTS_DEADLINE_SECONDS: Final[float] = float(os.getenv("HINTS_DEADLINE_SECONDS", "4"))
+HINTS_MAX_RESULTS: Final[int] = int(os.getenv("HINTS_MAX_RESULTS", "4"))
+# Threads per provider pool; defaults to API_MAX_CONCURRENCY so concurrent requests never queue
+HINTS_MAX_WORKERS: Final[int] = int(
+    os.getenv("HINTS_MAX_WORKERS", os.getenv("API_MAX_CONCURRENCY", "32"))
+)
+
+# End-to-end latency budget per request (0 disables): hints may use HINTS_BUDGET_SHARE of it,
+# the LLM call gets what is left, and GROQ_TIMEOUT_SECONDS bounds each Groq HTTP request
+REQUEST_BUDGET_SECONDS: Final[float] = float(os.getenv("REQUEST_BUDGET_SECONDS", "12"))
+HINTS_BUDGET_SHARE: Final[float] = float(os.getenv("HINTS_BUDGET_SHARE", "0.25"))
+GROQ_TIMEOUT_SECONDS: Final[float] = float(os.getenv("GROQ_TIMEOUT_SECONDS", "30"))
+# Threads that run budgeted sync LLM calls; defaults to API_MAX_CONCURRENCY so API requests never queue
+LLM_MAX_WORKERS: Final[int] = int(
+    os.getenv("LLM_MAX_WORKERS", os.getenv("API_MAX_CONCURRENCY", "32"))
+)
+
+# Batch generation (recommend_batch and the batch CLI)
+BATCH_MAX_CONCURRENCY: Final[int] = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
+# Cache warm-up: replay the most frequent recent queries (from analytics, or a JSONL file
+# when WARMUP_QUERIES_PATH is set) before the server starts; WARMUP_MAX_SECONDS caps the stage
+WARMUP_ON_STARTUP: Final[bool] = os.getenv("WARMUP_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+WARMUP_QUERIES_PATH: Final[str] = os.getenv("WARMUP_QUERIES_PATH", "")
+WARMUP_LIMIT: Final[int] = int(os.getenv("WARMUP_LIMIT", "50"))
+WARMUP_SINCE_HOURS: Final[float] = float(os.getenv("WARMUP_SINCE_HOURS", "72"))
+WARMUP_MAX_CONCURRENCY: Final[int] = int(os.getenv("WARMUP_MAX_CONCURRENCY", "4"))
+WARMUP_RATE_PER_SECOND: Final[float] = float(os.getenv("WARMUP_RATE_PER_SECOND", "2"))
+WARMUP_MAX_SECONDS: Final[float] = float(os.getenv("WARMUP_MAX_SECONDS", "120"))
+
+# Usage analytics: append-only JSONL segments written by a background thread
+ANALYTICS_DIR: Final[str] = os.getenv("ANALYTICS_DIR", "")
+ANALYTICS_QUEUE_SIZE: Final[int] = int(os.getenv("ANALYTICS_QUEUE_SIZE", "10000"))
+ANALYTICS_FLUSH_INTERVAL_SECONDS: Final[float] = float(
+    os.getenv("ANALYTICS_FLUSH_INTERVAL_SECONDS", "1")
+)
+ANALYTICS_FSYNC_INTERVAL_SECONDS: Final[float] = float(
+    os.getenv("ANALYTICS_FSYNC_INTERVAL_SECONDS", "5")
+)
+ANALYTICS_SEGMENT_MAX_BYTES: Final[int] = int(
+    os.getenv("ANALYTICS_SEGMENT_MAX_BYTES", str(8 * 1024 * 1024))
+)
+ANALYTICS_MAX_SEGMENTS: Final[int] = int(os.getenv("ANALYTICS_MAX_SEGMENTS", "10"))
+# Opt-in: also log query text and exclusions so the cache warm-up can replay popular queries
+ANALYTICS_RECORD_QUERIES: Final[bool] = os.getenv("ANALYTICS_RECORD_QUERIES", "false").lower() in ("1", "true", "yes")
+
+# Latency percentile sketches (DDSketch) per (model, cached), overall and per time bucket
+ANALYTICS_LATENCY_ACCURACY: Final[float] = float(os.getenv("ANALYTICS_LATENCY_ACCURACY", "0.01"))
+ANALYTICS_LATENCY_MAX_BINS: Final[int] = int(os.getenv("ANALYTICS_LATENCY_MAX_BINS", "512"))
+ANALYTICS_LATENCY_BUCKET_SECONDS: Final[int] = int(
+    os.getenv("ANALYTICS_LATENCY_BUCKET_SECONDS", "3600")
+)
+ANALYTICS_LATENCY_BUCKETS: Final[int] = int(os.getenv("ANALYTICS_LATENCY_BUCKETS", "48"))
+
+# Logging: optional JSON lines, background queue listener, and per-message rate limits
+LOG_LEVEL: Final[str] = os.getenv("LOG_LEVEL", "INFO")
+LOG_JSON: Final[bool] = os.getenv("LOG_JSON", "false").lower() in ("1", "true", "yes")
+LOG_QUEUE: Final[bool] = os.getenv("LOG_QUEUE", "true").lower() in ("1", "true", "yes")
+LOG_RATE_LIMITS: Final[str] = os.getenv(
+    "LOG_RATE_LIMITS", "Cache hit=20,Coalesced with in-flight request=20"
+)
+
+# Prometheus metrics endpoint served next to the Gradio app (port 0 disables it)
+METRICS_HOST: Final[str] = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT: Final[int] = int(os.getenv("METRICS_PORT", "9464"))
+
+# Headless JSON API (python -m src.book_recommender.api); API_WITH_GRADIO also serves it from
+# run_app() next to the UI, sharing one recommender and cache
+API_HOST: Final[str] = os.getenv("API_HOST", "127.0.0.1")
+API_PORT: Final[int] = int(os.getenv("API_PORT", "8000"))
+API_WORKERS: Final[int] = int(os.getenv("API_WORKERS", "1"))
+API_WITH_GRADIO: Final[bool] = os.getenv("API_WITH_GRADIO", "false").lower() in ("1", "true", "yes")
+API_MAX_CONCURRENCY: Final[int] = int(os.getenv("API_MAX_CONCURRENCY", "32"))
+API_MAX_BATCH: Final[int] = int(os.getenv("API_MAX_BATCH", "100"))
+API_GZIP_MIN_BYTES: Final[int] = int(os.getenv("API_GZIP_MIN_BYTES", "500"))
+
+# Guardrail blocklist: one term or phrase per line (empty path uses the built-in list)
+GUARDRAILS_BLOCKLIST_PATH: Final[str] = os.getenv("GUARDRAILS_BLOCKLIST_PATH", "")
+GUARDRAILS_WORD_BOUNDARY: Final[bool] = os.getenv(
+    "GUARDRAILS_WORD_BOUNDARY", "true"
+).lower() in ("1", "true", "yes")
+GUARDRAILS_NORMALIZE: Final[bool] = os.getenv(
+    "GUARDRAILS_NORMALIZE", "true"
+).lower() in ("1", "true", "yes")
+
+# Record/replay of Google Books and LLM traffic: mode is off, record, or replay; replay latency
+# is none, recorded, or a fixed number of milliseconds
+CASSETTE_MODE: Final[str] = os.getenv("CASSETTE_MODE", "off")
+CASSETTE_PATH: Final[str] = os.getenv("CASSETTE_PATH", "cassettes/upstream.jsonl")
+CASSETTE_LATENCY: Final[str] = os.getenv("CASSETTE_LATENCY", "none")
+
 APP_TITLE: Final[str] = "📖 Human-Centered Book Recommender"
 APP_SUBTITLE: Final[str] = (
     "Describe what you feel like reading. We blend Groq models with Google Books hints "
@@ -92,8 +226,8 @@ input[type="text"]:focus, textarea:focus, select:focus {border-color: var(--acce
 """
 
 def require_api_key() -> None:
-    """Ensure the Groq API key is set before the app starts."""
-    if not GROQ_API_KEY:
+    """Ensure the Groq API key is set before the app starts (replaying a cassette needs none)."""
+    if not GROQ_API_KEY and CASSETTE_MODE.strip().lower() != "replay":
         raise RuntimeError(
             "GROQ_API_KEY is not set. Add it to a .env file or your environment before running."
         )
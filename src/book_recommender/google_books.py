@@ -1,48 +1,405 @@
 """Google Books lookup helpers."""
 
-from typing import Dict, List
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import metrics
+from .cache import LRUTTLCache
+from .cassette import get_cassette
+from .config import (
+    GOOGLE_BOOKS_BACKOFF_MAX_SECONDS,
+    GOOGLE_BOOKS_BACKOFF_SECONDS,
+    GOOGLE_BOOKS_CONNECT_TIMEOUT,
+    GOOGLE_BOOKS_HEDGE_AFTER_SECONDS,
+    GOOGLE_BOOKS_MAX_RETRIES,
+    GOOGLE_BOOKS_POOL_SIZE,
+    GOOGLE_BOOKS_READ_TIMEOUT,
+    HINTS_CACHE_MAX_BYTES,
+    HINTS_CACHE_MAX_ENTRIES,
+    HINTS_CACHE_TTL_SECONDS,
+    HINTS_NEGATIVE_TTL_SECONDS,
+)
+
+if TYPE_CHECKING:  # httpx is only needed on the async path and is imported on first use
+    import httpx
+
+T = TypeVar("T")
 
 GOOGLE_BOOKS_ENDPOINT = "https://www.googleapis.com/books/v1/volumes"
+REQUEST_TIMEOUT = (GOOGLE_BOOKS_CONNECT_TIMEOUT, GOOGLE_BOOKS_READ_TIMEOUT)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Partial-response projection: only the volume fields the cards and prompt use.
+VOLUME_FIELDS = "items(volumeInfo(title,authors,description,imageLinks/thumbnail,infoLink))"
 
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_async_client: httpx.AsyncClient | None = None
+_async_client_loop: asyncio.AbstractEventLoop | None = None
+_hedge_executor: ThreadPoolExecutor | None = None
+_hedge_executor_lock = threading.Lock()
 
-def fetch_google_books(query: str, genre: str, max_results: int = 4) -> List[Dict[str, str]]:
-    """Fetch Google Books suggestions (title, authors, description, link, thumbnail).
+# Hints depend only on (query, genre, max_results), so they are cached apart from the
+# full recommendation key and survive model/temperature/exclusion changes.
+hint_cache: LRUTTLCache[list[dict[str, str]]] = LRUTTLCache(
+    max_bytes=HINTS_CACHE_MAX_BYTES,
+    ttl_seconds=HINTS_CACHE_TTL_SECONDS,
+    max_entries=HINTS_CACHE_MAX_ENTRIES,
+)
 
-    Uses the public endpoint; no API key required for this lightweight lookup.
-    Returns a list of dicts to enable richer UI cards.
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given zero-based retry attempt."""
+    ceiling = min(GOOGLE_BOOKS_BACKOFF_MAX_SECONDS, GOOGLE_BOOKS_BACKOFF_SECONDS * (2**attempt))
+    return random.uniform(0, ceiling)
+
+
+def retry_after_delay(header: str | None) -> float | None:
+    """Parse a Retry-After header and clamp it to the backoff ceiling."""
+    if not header:
+        return None
+    try:
+        seconds = Retry().parse_retry_after(header)
+    except Exception:
+        return None
+    return min(seconds, GOOGLE_BOOKS_BACKOFF_MAX_SECONDS)
+
+
+class _JitteredRetry(Retry):
+    """urllib3 retry policy with full-jitter backoff and a capped Retry-After."""
+
+    def get_backoff_time(self) -> float:
+        consecutive = sum(1 for h in self.history if h.redirect_location is None)
+        return backoff_delay(consecutive - 1) if consecutive else 0.0
+
+    def get_retry_after(self, response) -> float | None:
+        # A server asking for an hour must not hold a worker thread for an hour.
+        return retry_after_delay(response.headers.get("Retry-After"))
+
+
+def get_session() -> requests.Session:
+    """Return the shared keep-alive session, creating it on first use.
+
+    The session's connection pool is thread-safe, so every worker thread reuses
+    the same TLS connections to the Google Books endpoint.
     """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = _JitteredRetry(
+                    total=GOOGLE_BOOKS_MAX_RETRIES,
+                    status_forcelist=sorted(RETRY_STATUSES),
+                    allowed_methods=frozenset({"GET"}),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=GOOGLE_BOOKS_POOL_SIZE,
+                    pool_block=False,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _search_params(query: str, genre: str, max_results: int) -> dict[str, Any]:
     search_terms = query
     if genre:
         search_terms += f" subject:{genre}"
+    return {"q": search_terms, "maxResults": max_results, "fields": VOLUME_FIELDS}
+
+
+def _parse_volumes(data: dict[str, Any], max_results: int) -> list[dict[str, str]]:
+    """Turn a volumes API payload into the card dicts used by the recommender and UI."""
+    results: list[dict[str, str]] = []
+    for item in data.get("items", ())[:max_results]:
+        info = item.get("volumeInfo") or {}
+        authors = info.get("authors")
+        description = info.get("description")
+        if description:
+            # Only the first two sentences are kept, so stop splitting after them.
+            description = ". ".join(description.split(".", 2)[:2]).strip()[:220]
+        image_links = info.get("imageLinks")
+        results.append(
+            {
+                "title": info.get("title") or "Unknown title",
+                "authors": ", ".join(authors[:2]) if authors else "Unknown author",
+                "description": description or "",
+                "thumbnail": image_links.get("thumbnail", "") if image_links else "",
+                "link": info.get("infoLink", ""),
+            }
+        )
+    return results
+
+
+def parse_response(body: bytes, max_results: int) -> list[dict[str, str]]:
+    """Decode a raw volumes response body and parse it into card dicts."""
+    return _parse_volumes(json.loads(body), max_results)
+
+
+def _hint_key(query: str, genre: str, max_results: int) -> tuple[str, str, int]:
+    return " ".join(query.lower().split()), (genre or "").strip().lower(), max_results
+
+
+def _cassette_key(key: tuple[str, str, int]) -> str:
+    return "|".join(str(part) for part in key)
+
+
+def _cached_hints(key: tuple[str, str, int]) -> list[dict[str, str]] | None:
+    cached = hint_cache.get(key)
+    return list(cached) if cached is not None else None
+
+
+def _store_hints(key: tuple[str, str, int], results: list[dict[str, str]]) -> None:
+    # Empty and failed lookups are cached briefly so an outage costs one timeout, not one per
+    # request. A negative TTL <= 0 disables that.
+    if results:
+        hint_cache.set(key, results)
+    elif HINTS_NEGATIVE_TTL_SECONDS > 0:
+        hint_cache.set(key, results, ttl_seconds=HINTS_NEGATIVE_TTL_SECONDS)
+
+
+def clear_hint_cache() -> None:
+    """Drop all cached hints (positive and negative)."""
+    hint_cache.clear()
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _hedge_executor_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(
+                    max_workers=GOOGLE_BOOKS_POOL_SIZE, thread_name_prefix="google-books"
+                )
+    return _hedge_executor
+
+
+def _hedged(call: Callable[[], T], hedge_after: float | None) -> T:
+    """Run ``call``; if it has not finished after ``hedge_after`` seconds, race a duplicate.
+
+    Returns the first successful result, or raises the last error if both fail.
+    """
+    if not hedge_after:
+        return call()
+    executor = _get_hedge_executor()
+    pending = {executor.submit(call)}
+    try:
+        return next(iter(pending)).result(timeout=hedge_after)
+    except FutureTimeoutError:
+        pass
+    metrics.HEDGED_REQUESTS.inc(upstream="google_books")
+    pending.add(executor.submit(call))
+    error: BaseException | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is None:
+                return future.result()
+    raise error  # type: ignore[misc]
+
+
+async def _ahedged(call: Callable[[], Awaitable[T]], hedge_after: float | None) -> T:
+    """Async variant of :func:`_hedged`; the slower request is cancelled."""
+    if not hedge_after:
+        return await call()
+    tasks = [asyncio.ensure_future(call())]
     try:
-        resp = requests.get(
-            GOOGLE_BOOKS_ENDPOINT,
-            params={"q": search_terms, "maxResults": max_results},
-            timeout=6,
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            metrics.HEDGED_REQUESTS.inc(upstream="google_books")
+            tasks.append(asyncio.ensure_future(call()))
+        error: BaseException | None = None
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                return await next_done
+            except Exception as exc:
+                error = exc
+        raise error  # type: ignore[misc]
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _get(params: dict[str, Any], max_results: int) -> list[dict[str, str]]:
+    resp = get_session().get(GOOGLE_BOOKS_ENDPOINT, params=params, timeout=REQUEST_TIMEOUT)
+    resp.raise_for_status()
+    return parse_response(resp.content, max_results)
+
+
+def fetch_google_books(
+    query: str,
+    genre: str,
+    max_results: int = 4,
+    hedge_after: float | None = GOOGLE_BOOKS_HEDGE_AFTER_SECONDS,
+) -> list[dict[str, str]]:
+    """Fetch Google Books suggestions (title, authors, description, link, thumbnail).
+
+    Uses the public endpoint; no API key required for this lightweight lookup.
+    Returns a list of dicts to enable richer UI cards. Results are served from
+    the hint cache when available, and recorded to or replayed from the cassette
+    when ``CASSETTE_MODE`` is set. When the request takes longer than
+    ``hedge_after`` seconds an identical one is sent and the first answer wins,
+    which trims tail latency from a slow connection or server (None or 0 disables).
+    """
+    key = _hint_key(query, genre, max_results)
+    cached = _cached_hints(key)
+    if cached is not None:
+        return cached
+    cassette = get_cassette()
+    start = time.perf_counter()
+    try:
+        if cassette.replaying:
+            results = cassette.replay("google_books", _cassette_key(key))
+        else:
+            params = _search_params(query, genre, max_results)
+            results = _hedged(lambda: _get(params, max_results), hedge_after)
+    except Exception:
+        metrics.UPSTREAM_ERRORS.inc(upstream="google_books")
+        results = []
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    cassette.record("google_books", _cassette_key(key), results, elapsed_ms)
+    _store_hints(key, results)
+    return list(results)
+
+
+def _close_async_client_elsewhere(
+    client: httpx.AsyncClient | None,
+    owner: asyncio.AbstractEventLoop | None,
+    current: asyncio.AbstractEventLoop | None = None,
+) -> None:
+    """Close a client that belongs to another (or no longer current) event loop.
+
+    A client can only be closed on the loop that created it; if that loop has already
+    stopped, its connections went away with it and there is nothing left to close.
+    """
+    if client is None or client.is_closed or owner is None or owner.is_closed():
+        return
+    if owner is current:
+        owner.create_task(client.aclose())
+    elif owner.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), owner)
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Return an AsyncClient bound to the running event loop, creating it on first use."""
+    import httpx
+
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop or _async_client.is_closed:
+        _close_async_client_elsewhere(_async_client, _async_client_loop, loop)
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(GOOGLE_BOOKS_READ_TIMEOUT, connect=GOOGLE_BOOKS_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=GOOGLE_BOOKS_POOL_SIZE,
+                max_keepalive_connections=GOOGLE_BOOKS_POOL_SIZE,
+            ),
         )
-        resp.raise_for_status()
-        data = resp.json()
-        items = data.get("items", [])
-        results: List[Dict[str, str]] = []
-        for item in items[:max_results]:
-            info = item.get("volumeInfo", {})
-            title = info.get("title") or "Unknown title"
-            authors = ", ".join(info.get("authors", [])[:2]) or "Unknown author"
-            desc = (info.get("description") or "").split(".")[:2]
-            desc_text = ". ".join(desc).strip()
-            thumb = (info.get("imageLinks") or {}).get("thumbnail", "")
-            link = info.get("infoLink", "")
-            results.append(
-                {
-                    "title": title,
-                    "authors": authors,
-                    "description": desc_text[:220] if desc_text else "",
-                    "thumbnail": thumb,
-                    "link": link,
-                }
-            )
-        return results
+        _async_client_loop = loop
+    return _async_client
+
+
+async def _aget_with_retry(params: dict[str, Any]) -> httpx.Response:
+    """GET with the same bounded, jittered retry policy as the sync session."""
+    import httpx
+
+    client = _get_async_client()
+    for attempt in range(GOOGLE_BOOKS_MAX_RETRIES + 1):
+        last_attempt = attempt == GOOGLE_BOOKS_MAX_RETRIES
+        try:
+            resp = await client.get(GOOGLE_BOOKS_ENDPOINT, params=params)
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+        else:
+            if resp.status_code not in RETRY_STATUSES or last_attempt:
+                return resp
+            retry_after = retry_after_delay(resp.headers.get("Retry-After"))
+            if retry_after is not None:
+                await asyncio.sleep(retry_after)
+                continue
+        await asyncio.sleep(backoff_delay(attempt))
+    raise RuntimeError("unreachable")  # pragma: no cover
+
+
+async def _aget(params: dict[str, Any], max_results: int) -> list[dict[str, str]]:
+    resp = await _aget_with_retry(params)
+    resp.raise_for_status()
+    return parse_response(resp.content, max_results)
+
+
+async def afetch_google_books(
+    query: str,
+    genre: str,
+    max_results: int = 4,
+    hedge_after: float | None = GOOGLE_BOOKS_HEDGE_AFTER_SECONDS,
+) -> list[dict[str, str]]:
+    """Async variant of :func:`fetch_google_books` using a shared, pooled httpx client."""
+    key = _hint_key(query, genre, max_results)
+    cached = _cached_hints(key)
+    if cached is not None:
+        return cached
+    cassette = get_cassette()
+    start = time.perf_counter()
+    try:
+        if cassette.replaying:
+            results = await cassette.areplay("google_books", _cassette_key(key))
+        else:
+            params = _search_params(query, genre, max_results)
+            results = await _ahedged(lambda: _aget(params, max_results), hedge_after)
     except Exception:
-        return []
+        metrics.UPSTREAM_ERRORS.inc(upstream="google_books")
+        results = []
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    cassette.record("google_books", _cassette_key(key), results, elapsed_ms)
+    _store_hints(key, results)
+    return list(results)
+
+
+def _close_session() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+async def aclose() -> None:
+    """Close the shared clients from inside the event loop that uses them."""
+    global _async_client, _async_client_loop
+    client, owner = _async_client, _async_client_loop
+    _async_client = _async_client_loop = None
+    if client is not None and not client.is_closed:
+        if owner is asyncio.get_running_loop():
+            await client.aclose()
+        else:
+            _close_async_client_elsewhere(client, owner)
+    _close_session()
+
+
+def close_clients() -> None:
+    """Close the shared clients from synchronous code (e.g. application shutdown)."""
+    global _async_client, _async_client_loop
+    client, owner = _async_client, _async_client_loop
+    _async_client = _async_client_loop = None
+    _close_async_client_elsewhere(client, owner)
+    _close_session()
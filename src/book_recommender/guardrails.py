@@ -0,0 +1,182 @@
+"""Compiled blocklist matcher for rejecting unsafe recommendation requests."""
+
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from collections.abc import Iterable
+from pathlib import Path
+from re import Pattern
+from typing import Any
+
+from .config import GUARDRAILS_BLOCKLIST_PATH, GUARDRAILS_NORMALIZE, GUARDRAILS_WORD_BOUNDARY
+from .logger import get_logger
+
+logger = get_logger()
+
+# A trailing "*" matches any word ending, e.g. "porn*" also blocks "pornographic".
+DEFAULT_BLOCKLIST = ("nsfw", "porn*", "explicit", "gore")
+WILDCARD = "*"
+
+_EXACT = "exact"
+_PREFIX = "prefix"
+
+
+def fold(text: str, unicode_normalize: bool = True) -> str:
+    """Lowercase ``text`` for matching.
+
+    With ``unicode_normalize`` non-ASCII text is NFKC-normalized and casefolded, so
+    full-width letters, ligatures and the like match their plain spellings (both
+    are no-ops beyond ``lower()`` for ASCII, which skips them).
+    """
+    if unicode_normalize and not text.isascii():
+        return unicodedata.normalize("NFKC", text).casefold()
+    return text.lower()
+
+
+def normalize(text: str, unicode_normalize: bool = True) -> str:
+    """Fold ``text`` (see :func:`fold`) and collapse whitespace runs to single spaces."""
+    return " ".join(fold(text, unicode_normalize).split())
+
+
+def load_terms(path: str) -> list[str]:
+    """Read one term or phrase per line, skipping blank lines and ``#`` comments."""
+    with open(Path(path).expanduser(), encoding="utf-8") as handle:
+        lines = (line.strip() for line in handle)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+def _trie_pattern(node: dict[str | None, Any], word_boundary: bool) -> str:
+    """Render a character trie as a regex with shared prefixes factored out."""
+    end = node.get(None)
+    if end == _PREFIX:
+        return ""  # everything below is already matched by the wildcard
+    branches = [
+        (r"\s+" if char == " " else re.escape(char)) + _trie_pattern(child, word_boundary)
+        for char, child in sorted((k, v) for k, v in node.items() if k is not None)
+    ]
+    if end == _EXACT:
+        branches.append(r"(?!\w)" if word_boundary else "")
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+class GuardrailMatcher:
+    """Blocklist of terms and phrases compiled into a single regular expression.
+
+    Terms are inserted into a character trie and rendered as one regex in which
+    common prefixes are shared, so a lookup walks the input once and its cost
+    barely grows with the number of terms. Matching is case-insensitive, treats
+    any whitespace run as a single space, and by default respects word
+    boundaries ("gore" does not match "gorgeous"; use "gore*" for that).
+    :meth:`reload` builds the new pattern before swapping it in, so lookups in
+    other threads never see a half-built matcher.
+    """
+
+    def __init__(
+        self,
+        terms: Iterable[str] = DEFAULT_BLOCKLIST,
+        word_boundary: bool = True,
+        unicode_normalize: bool = True,
+        path: str | None = None,
+    ) -> None:
+        """
+        Initialize and compile the matcher.
+
+        Args:
+            terms: Terms or phrases to block; a trailing ``*`` matches any word ending
+            word_boundary: Only match whole words (and whole phrases)
+            unicode_normalize: NFKC-normalize and casefold terms and input
+            path: Blocklist file; when set it replaces ``terms`` and is re-read by :meth:`reload`
+        """
+        self.word_boundary = word_boundary
+        self.unicode_normalize = unicode_normalize
+        self.path = path
+        self._pattern: Pattern[str] | None = None
+        self._size = 0
+        self.reload(None if path else terms)
+
+    @classmethod
+    def from_file(cls, path: str, **options: Any) -> GuardrailMatcher:
+        """Build a matcher from a blocklist file (see :func:`load_terms`)."""
+        return cls(path=path, **options)
+
+    def _compile(self, terms: Iterable[str]) -> tuple[Pattern[str] | None, int]:
+        root: dict[str | None, Any] = {}
+        count = 0
+        for raw in terms:
+            kind = _PREFIX if raw.rstrip().endswith(WILDCARD) else _EXACT
+            term = normalize(raw.rstrip().rstrip(WILDCARD), self.unicode_normalize)
+            if not term:
+                continue
+            node = root
+            for char in term:
+                node = node.setdefault(char, {})
+            if node.get(None) != _PREFIX:
+                node[None] = kind
+            count += 1
+        if not count:
+            return None, 0
+        body = _trie_pattern(root, self.word_boundary)
+        prefix = r"(?<!\w)" if self.word_boundary else ""
+        return re.compile(prefix + body), count
+
+    def reload(self, terms: Iterable[str] | None = None) -> int:
+        """Recompile from ``terms`` (or by re-reading :attr:`path`); returns the term count.
+
+        If the file cannot be read or decoded the previous pattern stays in place
+        and the error (``OSError`` or ``UnicodeDecodeError``) is raised to the caller.
+        """
+        if terms is None:
+            terms = load_terms(self.path) if self.path else DEFAULT_BLOCKLIST
+        pattern, size = self._compile(terms)
+        # A single attribute swap, so concurrent match() calls see the old or new pattern.
+        self._pattern, self._size = pattern, size
+        return size
+
+    def match(self, text: str) -> str | None:
+        """Return the first blocked text found in ``text`` (case-folded), or None."""
+        pattern = self._pattern
+        if pattern is None or not text:
+            return None
+        found = pattern.search(fold(text, self.unicode_normalize))
+        return found.group(0) if found else None
+
+    def __len__(self) -> int:
+        return self._size
+
+
+_guardrails: GuardrailMatcher | None = None
+_guardrails_lock = threading.Lock()
+
+
+def get_guardrails() -> GuardrailMatcher:
+    """Get or create the global matcher configured by ``GUARDRAILS_*`` settings."""
+    global _guardrails
+    if _guardrails is None:
+        with _guardrails_lock:
+            if _guardrails is None:
+                _guardrails = GuardrailMatcher(
+                    word_boundary=GUARDRAILS_WORD_BOUNDARY,
+                    unicode_normalize=GUARDRAILS_NORMALIZE,
+                    path=GUARDRAILS_BLOCKLIST_PATH or None,
+                )
+                logger.info(f"Guardrails loaded with {len(_guardrails)} blocked terms")
+    return _guardrails
+
+
+def reload_guardrails() -> int:
+    """Re-read the configured blocklist file into the global matcher.
+
+    A file that is missing or not valid UTF-8 is logged and the previous list kept.
+    """
+    matcher = get_guardrails()
+    try:
+        size = matcher.reload()
+    except (OSError, ValueError) as exc:
+        logger.error(f"Guardrail blocklist reload failed, keeping the previous list: {exc}")
+        return len(matcher)
+    logger.info(f"Guardrails reloaded with {size} blocked terms")
+    return size
@@ -0,0 +1,274 @@
+"""Concurrent fan-out of hint lookups across pluggable providers."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
+
+from . import google_books, metrics
+from .catalog import LocalCatalog, get_catalog
+from .config import HINT_PROVIDERS, HINTS_DEADLINE_SECONDS, HINTS_MAX_RESULTS, HINTS_MAX_WORKERS
+from .logger import get_logger
+
+logger = get_logger()
+
+Hint = dict[str, str]
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+class HintProvider:
+    """Source of book hints for the LLM prompt.
+
+    Subclasses implement :meth:`fetch` and return Google Books-style card dicts
+    (``title``, ``authors``, ``description``, ``thumbnail``, ``link``). The default
+    :meth:`afetch` runs :meth:`fetch` in a worker thread; providers with native
+    async I/O should override it. ``name`` labels the provider in logs and metrics
+    and keys its thread pool. Providers that answer in well under a millisecond
+    (in-memory indexes) set ``inline`` so sync lookups skip the pool entirely.
+    """
+
+    name = "provider"
+    inline = False
+
+    def fetch(self, query: str, genre: str, max_results: int) -> list[Hint]:
+        raise NotImplementedError
+
+    async def afetch(self, query: str, genre: str, max_results: int) -> list[Hint]:
+        return await asyncio.to_thread(self.fetch, query, genre, max_results)
+
+
+class GoogleBooksProvider(HintProvider):
+    """Hints from the Google Books API (cached, retried, and cassette-aware)."""
+
+    name = "google_books"
+
+    def fetch(self, query: str, genre: str, max_results: int) -> list[Hint]:
+        return google_books.fetch_google_books(query, genre, max_results)
+
+    async def afetch(self, query: str, genre: str, max_results: int) -> list[Hint]:
+        return await google_books.afetch_google_books(query, genre, max_results)
+
+
+class CatalogProvider(HintProvider):
+    """Hints from an offline :class:`~.catalog.LocalCatalog` index."""
+
+    name = "catalog"
+    inline = True
+
+    def __init__(self, catalog: LocalCatalog) -> None:
+        self.catalog = catalog
+
+    def fetch(self, query: str, genre: str, max_results: int) -> list[Hint]:
+        return self.catalog.search(query, genre, max_results)
+
+    async def afetch(self, query: str, genre: str, max_results: int) -> list[Hint]:
+        return await self.catalog.asearch(query, genre, max_results)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_WORD.findall((text or "").casefold()))
+
+
+def hint_key(book: Hint) -> tuple[str, str]:
+    """Deduplication key: normalized title and first author."""
+    author = _normalize((book.get("authors") or "").split(",")[0])
+    return _normalize(book.get("title", "")), "" if author == "unknown author" else author
+
+
+def merge_hints(results: Sequence[list[Hint]], max_results: int) -> list[Hint]:
+    """Interleave provider results by rank, dropping duplicates, up to ``max_results``.
+
+    Earlier providers win ties within a rank. When a duplicate has fields the
+    kept card lacks (e.g. a thumbnail), they are copied over.
+    """
+    merged: dict[tuple[str, str], Hint] = {}
+    depth = max((len(books) for books in results), default=0)
+    for rank in range(depth):
+        for books in results:
+            if rank >= len(books):
+                continue
+            book = books[rank]
+            key = hint_key(book)
+            kept = merged.get(key)
+            if kept is None:
+                if len(merged) < max_results:
+                    merged[key] = dict(book)
+                continue
+            for field, value in book.items():
+                if value and not kept.get(field):
+                    kept[field] = value
+    return list(merged.values())
+
+
+_executors: dict[str, ThreadPoolExecutor] = {}
+_executor_lock = threading.Lock()
+
+
+def _get_executor(name: str) -> ThreadPoolExecutor:
+    """Return provider ``name``'s own pool, so a stalled provider cannot starve the others."""
+    executor = _executors.get(name)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = ThreadPoolExecutor(
+                    max_workers=max(1, HINTS_MAX_WORKERS), thread_name_prefix=f"hints-{name}"
+                )
+    return executor
+
+
+class HintFanout:
+    """Query several hint providers concurrently and merge what arrives in time.
+
+    :meth:`fetch` runs each provider in its own thread pool (``inline``
+    providers on the calling thread) and :meth:`afetch` as asyncio tasks. Both wait at most ``deadline_seconds``; providers that are
+    still running are counted in ``book_recommender_hint_deadline_misses_total``
+    and left out, so one slow source cannot hold up the LLM call. A provider that
+    raises is logged and contributes nothing. Late sync calls keep running in the
+    pool (Google Books still caches their result); late async calls are cancelled.
+    """
+
+    def __init__(
+        self,
+        providers: Sequence[HintProvider],
+        deadline_seconds: float | None = HINTS_DEADLINE_SECONDS,
+        max_results: int = HINTS_MAX_RESULTS,
+        executor: Executor | None = None,
+    ) -> None:
+        """
+        Initialize the fan-out.
+
+        Args:
+            providers: Hint sources, in order of preference
+            deadline_seconds: Maximum wait for providers; None or 0 waits for all of them
+            max_results: Maximum number of merged hints (and hints asked of each provider)
+            executor: Pool for all sync lookups; defaults to one pool of ``HINTS_MAX_WORKERS``
+                per provider
+        """
+        self.providers = list(providers)
+        self.deadline_seconds = deadline_seconds or None
+        self.max_results = max_results
+        self._executor = executor
+
+    def _call(self, provider: HintProvider, query: str, genre: str) -> list[Hint]:
+        try:
+            with metrics.span(provider.name):
+                return provider.fetch(query, genre, self.max_results) or []
+        except Exception as exc:
+            self._failed(provider, exc)
+            return []
+
+    async def _acall(self, provider: HintProvider, query: str, genre: str) -> list[Hint]:
+        try:
+            with metrics.span(provider.name):
+                return await provider.afetch(query, genre, self.max_results) or []
+        except Exception as exc:
+            self._failed(provider, exc)
+            return []
+
+    @staticmethod
+    def _failed(provider: HintProvider, exc: Exception) -> None:
+        metrics.UPSTREAM_ERRORS.inc(upstream=provider.name)
+        logger.warning(f"Hint provider {provider.name} failed: {exc}")
+
+    def _deadline(self, timeout: float | None) -> float | None:
+        if timeout is None:
+            return self.deadline_seconds
+        timeout = max(0.0, timeout)
+        return timeout if self.deadline_seconds is None else min(timeout, self.deadline_seconds)
+
+    @staticmethod
+    def _late(provider: HintProvider, deadline: float | None) -> None:
+        metrics.HINT_DEADLINE_MISSES.inc(provider=provider.name)
+        logger.warning(f"Hint provider {provider.name} missed the {deadline:.2f}s deadline")
+
+    def fetch(self, query: str, genre: str, timeout: float | None = None) -> list[Hint]:
+        """Return merged hints from every provider that answers before the deadline.
+
+        ``timeout`` shortens the configured deadline for this call (e.g. to fit a
+        request's latency budget); it never extends it.
+        """
+        if not self.providers:
+            return []
+        deadline = self._deadline(timeout)
+        started = time.monotonic()
+        futures = {
+            i: (self._executor or _get_executor(p.name)).submit(self._call, p, query, genre)
+            for i, p in enumerate(self.providers)
+            if not p.inline
+        }
+        # Inline providers run here while the pooled ones are in flight.
+        answers = {
+            i: self._call(p, query, genre) for i, p in enumerate(self.providers) if p.inline
+        }
+        done = set()
+        if futures:
+            elapsed = time.monotonic() - started
+            remaining = None if deadline is None else max(0.0, deadline - elapsed)
+            done, _ = wait(futures.values(), timeout=remaining)
+        results = []
+        for i, provider in enumerate(self.providers):
+            if i in answers:
+                results.append(answers[i])
+            elif futures[i] in done:
+                results.append(futures[i].result())
+            else:
+                self._late(provider, deadline)
+        return merge_hints(results, self.max_results)
+
+    async def afetch(self, query: str, genre: str, timeout: float | None = None) -> list[Hint]:
+        """Async variant of :meth:`fetch`; providers still running at the deadline are cancelled."""
+        if not self.providers:
+            return []
+        deadline = self._deadline(timeout)
+        tasks = [asyncio.ensure_future(self._acall(p, query, genre)) for p in self.providers]
+        done, _ = await asyncio.wait(tasks, timeout=deadline)
+        results = []
+        for provider, task in zip(self.providers, tasks, strict=True):
+            if task in done:
+                results.append(task.result())
+            else:
+                task.cancel()
+                self._late(provider, deadline)
+        return merge_hints(results, self.max_results)
+
+
+def build_providers(names: str) -> list[HintProvider]:
+    """Create providers from a comma-separated list (``google_books``, ``catalog``).
+
+    ``catalog`` is skipped when ``CATALOG_PATH`` is not set.
+    """
+    providers: list[HintProvider] = []
+    for name in (part.strip().lower() for part in names.split(",")):
+        if not name:
+            continue
+        if name == GoogleBooksProvider.name:
+            providers.append(GoogleBooksProvider())
+        elif name == CatalogProvider.name:
+            catalog = get_catalog()
+            if catalog is not None:
+                providers.append(CatalogProvider(catalog))
+        else:
+            raise ValueError(f"Unknown hint provider {name!r}; expected google_books or catalog")
+    return providers
+
+
+_fanout: HintFanout | None = None
+_fanout_lock = threading.Lock()
+
+
+def get_hint_fanout() -> HintFanout:
+    """Get or create the global fan-out configured by ``HINT_PROVIDERS`` and ``HINTS_*``."""
+    global _fanout
+    if _fanout is None:
+        with _fanout_lock:
+            if _fanout is None:
+                _fanout = HintFanout(build_providers(HINT_PROVIDERS))
+                names = ", ".join(p.name for p in _fanout.providers) or "none"
+                logger.info(f"Hint providers: {names}")
+    return _fanout
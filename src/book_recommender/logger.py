@@ -1,73 +1,181 @@
 """Structured logging configuration for the book recommender app."""
 
+import atexit
+import copy
+import importlib.util
+import json
 import logging
+import logging.handlers
+import queue
 import sys
-from datetime import datetime
-from typing import Any, Dict, Optional
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
 
-try:
-    import sentry_sdk
-    from sentry_sdk.integrations.logging import LoggingIntegration
-    SENTRY_AVAILABLE = True
-except ImportError:
-    SENTRY_AVAILABLE = False
+# sentry-sdk is optional and only imported by setup_logging() when a DSN is configured
+SENTRY_AVAILABLE = importlib.util.find_spec("sentry_sdk") is not None
+
+
+# LogRecord attributes set through ``extra=`` that the formatters render
+_CONTEXT_FIELDS = ("user_id", "query", "model", "cached", "duration_ms", "books_count", "suppressed")
+
+
+class _TimestampCache:
+    """Format ``record.created`` as ISO-8601 UTC, reusing the per-second prefix."""
+
+    __slots__ = ("_second", "_prefix")
+
+    def __init__(self) -> None:
+        self._second = -1
+        self._prefix = ""
+
+    def __call__(self, created: float) -> str:
+        second = int(created)
+        if second != self._second:
+            self._prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._second = second
+        return f"{self._prefix}.{int((created - second) * 1000):03d}"
 
 
 class StructuredFormatter(logging.Formatter):
     """Custom formatter for structured JSON-like logs."""
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._timestamp = _TimestampCache()
+
     def format(self, record: logging.LogRecord) -> str:
         """Format log record with structured data."""
-        log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat(),
+        extra = record.__dict__
+        parts = [f"{self._timestamp(record.created)} [{record.levelname}] {record.getMessage()}"]
+
+        context_items = []
+        if "query" in extra:
+            context_items.append(f"query={str(extra['query'])[:50]}")
+        if "model" in extra:
+            context_items.append(f"model={extra['model']}")
+        if "cached" in extra:
+            context_items.append(f"cached={extra['cached']}")
+        if "duration_ms" in extra:
+            context_items.append(f"duration={extra['duration_ms']}ms")
+        if "suppressed" in extra:
+            context_items.append(f"suppressed={extra['suppressed']}")
+
+        if context_items:
+            parts.append(f" | {', '.join(context_items)}")
+
+        if record.exc_info:
+            parts.append(f"\n{self.formatException(record.exc_info)}")
+
+        return "".join(parts)
+
+
+class JSONFormatter(logging.Formatter):
+    """Compact single-line JSON records for log shippers."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._timestamp = _TimestampCache()
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format log record as one JSON object per line."""
+        extra = record.__dict__
+        log_data: dict[str, Any] = {
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
-
-        # Add extra context if available
-        if hasattr(record, "user_id"):
-            log_data["user_id"] = record.user_id
-        if hasattr(record, "query"):
-            log_data["query"] = record.query
-        if hasattr(record, "model"):
-            log_data["model"] = record.model
-        if hasattr(record, "cached"):
-            log_data["cached"] = record.cached
-        if hasattr(record, "duration_ms"):
-            log_data["duration_ms"] = record.duration_ms
-
-        # Add exception info if present
+        for field in _CONTEXT_FIELDS:
+            if field in extra:
+                log_data[field] = extra[field]
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log_data, ensure_ascii=False, separators=(",", ":"), default=str)
 
-        # Format as readable structured log
-        parts = [f"{log_data['timestamp']} [{log_data['level']}] {log_data['message']}"]
-        
-        context_items = []
-        if "query" in log_data:
-            context_items.append(f"query={log_data['query'][:50]}")
-        if "model" in log_data:
-            context_items.append(f"model={log_data['model']}")
-        if "cached" in log_data:
-            context_items.append(f"cached={log_data['cached']}")
-        if "duration_ms" in log_data:
-            context_items.append(f"duration={log_data['duration_ms']}ms")
-        
-        if context_items:
-            parts.append(f" | {', '.join(context_items)}")
-        
-        if "exception" in log_data:
-            parts.append(f"\n{log_data['exception']}")
-        
-        return "".join(parts)
+
+class RateLimitFilter(logging.Filter):
+    """Let through at most ``limit`` records per second for each listed message.
+
+    Intended for high-volume messages such as "Cache hit". Suppressed records are
+    counted, and the next record let through carries the count as ``suppressed``.
+    Messages not listed are never filtered.
+    """
+
+    def __init__(
+        self, limits: dict[str, float], clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        super().__init__()
+        self.limits = dict(limits)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # message -> [tokens, last refill time, suppressed since last emitted]
+        self._buckets: dict[str, list[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        limit = self.limits.get(record.msg) if isinstance(record.msg, str) else None
+        if limit is None:
+            return True
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.setdefault(record.msg, [limit, now, 0])
+            bucket[0] = min(limit, bucket[0] + (now - bucket[1]) * limit)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            suppressed, bucket[2] = int(bucket[2]), 0
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that defers all formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def parse_rate_limits(spec: str) -> dict[str, float]:
+    """Parse ``"Cache hit=20,Other message=5"`` into ``{message: per_second}``."""
+    limits: dict[str, float] = {}
+    for item in spec.split(","):
+        message, sep, value = item.rpartition("=")
+        if sep and message.strip():
+            limits[message.strip()] = float(value)
+    return limits
+
+
+def shutdown_logging() -> None:
+    """Stop the background listener started by ``setup_logging(use_queue=True)``.
+
+    Records already queued are written before this returns.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
 
 def setup_logging(
     level: str = "INFO",
-    sentry_dsn: Optional[str] = None,
+    sentry_dsn: str | None = None,
     enable_console: bool = True,
-    log_file: Optional[str] = None,
+    log_file: str | None = None,
+    json_format: bool = False,
+    use_queue: bool = False,
+    rate_limits: dict[str, float] | None = None,
 ) -> logging.Logger:
     """
     Configure structured logging for the application.
@@ -77,6 +185,11 @@ def setup_logging(
         sentry_dsn: Optional Sentry DSN for error tracking
         enable_console: Whether to log to console
         log_file: Optional file path for log output
+        json_format: Emit compact single-line JSON instead of the readable format
+        use_queue: Hand records to a background listener thread that formats and
+            writes them, so logging never blocks the calling thread on I/O
+        rate_limits: Maximum records per second for specific messages (e.g.
+            {"Cache hit": 20}); excess records are dropped and counted
     
     Returns:
         Configured logger instance
@@ -84,23 +197,45 @@ def setup_logging(
     logger = logging.getLogger("book_recommender")
     logger.setLevel(getattr(logging, level.upper()))
     logger.handlers.clear()
+    for existing in [f for f in logger.filters if isinstance(f, RateLimitFilter)]:
+        logger.removeFilter(existing)
+    shutdown_logging()
 
-    formatter = StructuredFormatter()
+    formatter = JSONFormatter() if json_format else StructuredFormatter()
+    handlers: list[logging.Handler] = []
 
     # Console handler
     if enable_console:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
 
     # File handler
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    if use_queue and handlers:
+        global _listener
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _listener.start()
+        logger.addHandler(_QueueHandler(log_queue))
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
+
+    if rate_limits:
+        logger.addFilter(RateLimitFilter(rate_limits))
 
     # Sentry integration
     if sentry_dsn and SENTRY_AVAILABLE:
+        import sentry_sdk
+        from sentry_sdk.integrations.logging import LoggingIntegration
+
         sentry_logging = LoggingIntegration(
             level=logging.INFO,
             event_level=logging.ERROR,
@@ -118,6 +253,9 @@ def setup_logging(
     return logger
 
 
+atexit.register(shutdown_logging)
+
+
 def get_logger() -> logging.Logger:
     """Get the application logger."""
     return logging.getLogger("book_recommender")
@@ -0,0 +1,187 @@
+"""SQLite-backed recommendation cache shared across restarts and processes."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .logger import get_logger
+
+logger = get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recommendations (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL
+)
+"""
+_INDEX = "CREATE INDEX IF NOT EXISTS idx_recommendations_expires ON recommendations(expires_at)"
+
+
+class SQLiteCache:
+    """Persistent key/value cache stored in a WAL-mode SQLite database.
+
+    Each thread gets its own connection; SQLite's WAL journal plus a busy timeout
+    lets several worker processes read concurrently while one writes. Writes run
+    in ``BEGIN IMMEDIATE`` transactions so an entry is either fully stored or not
+    at all. Values must be JSON-serializable.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float | None = None,
+        busy_timeout_ms: int = 5000,
+        purge_every: int = 500,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the cache, creating the database file if needed.
+
+        Args:
+            path: Database file path
+            ttl_seconds: Default time-to-live; None or <= 0 keeps entries forever
+            busy_timeout_ms: How long a connection waits on a locked database
+            purge_every: Delete expired rows after this many writes from this process
+            clock: Wall clock (shared across processes), injectable for tests
+        """
+        self.path = str(Path(path).expanduser())
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self.busy_timeout_ms = busy_timeout_ms
+        self.purge_every = purge_every
+        self._clock = clock
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        with conn:
+            conn.execute(_SCHEMA)
+            conn.execute(_INDEX)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout_ms / 1000,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Any | None:
+        """Return the decoded value for ``key`` or None if missing, expired, or unreadable."""
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT value FROM recommendations "
+                    "WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (key, self._clock()),
+                )
+                .fetchone()
+            )
+            if row is None:
+                self.misses += 1
+                return None
+            value = json.loads(row[0])
+        except sqlite3.Error as exc:
+            self.errors += 1
+            logger.warning(f"Persistent cache read failed: {exc}")
+            return None
+        except (TypeError, ValueError) as exc:
+            self.errors += 1
+            logger.warning(f"Dropping corrupt persistent cache entry: {exc}")
+            self.delete(key)
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float | None = None) -> bool:
+        """Atomically insert or replace an entry. Returns False on database errors."""
+        now = self._clock()
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO recommendations (key, value, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, payload, now, now + ttl if ttl else None),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as exc:
+            self.errors += 1
+            logger.warning(f"Persistent cache write failed: {exc}")
+            return False
+
+        with self._writes_lock:
+            self._writes += 1
+            due = self.purge_every > 0 and self._writes % self.purge_every == 0
+        if due:
+            self.purge_expired()
+        return True
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        try:
+            self._connection().execute("DELETE FROM recommendations WHERE key = ?", (key,))
+        except sqlite3.Error as exc:
+            self.errors += 1
+            logger.warning(f"Persistent cache delete failed: {exc}")
+
+    def purge_expired(self) -> int:
+        """Delete expired rows and return how many were removed."""
+        try:
+            cur = self._connection().execute(
+                "DELETE FROM recommendations WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (self._clock(),),
+            )
+            return cur.rowcount
+        except sqlite3.Error as exc:
+            self.errors += 1
+            logger.warning(f"Persistent cache purge failed: {exc}")
+            return 0
+
+    def __len__(self) -> int:
+        row = self._connection().execute("SELECT COUNT(*) FROM recommendations").fetchone()
+        return int(row[0])
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss/error counters for this process."""
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "errors": self.errors,
+        }
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
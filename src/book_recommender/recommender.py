@@ -2,28 +2,198 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
 import time
-from typing import Dict, List, Tuple
-
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_groq import ChatGroq
+from collections.abc import AsyncIterator, Callable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import (
+    Any,
+    TypeVar,
+)
 
+from . import metrics
 from .analytics import get_analytics
-from .config import DEFAULT_TEMPERATURE, GROQ_API_KEY, SUPPORTED_MODELS
-from .google_books import fetch_google_books
+from .cache import LRUTTLCache
+from .cassette import get_cassette, wrap_builder
+from .chains import ChainRegistry, build_chain
+from .config import (
+    BATCH_MAX_CONCURRENCY,
+    CACHE_DB_PATH,
+    CACHE_DB_TTL_SECONDS,
+    CACHE_MAX_BYTES,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL_SECONDS,
+    DEFAULT_TEMPERATURE,
+    HINTS_BUDGET_SHARE,
+    LLM_MAX_WORKERS,
+    REQUEST_BUDGET_SECONDS,
+    SEMANTIC_CACHE_DIM,
+    SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_THRESHOLD,
+    SUPPORTED_MODELS,
+)
+from .guardrails import GuardrailMatcher, get_guardrails
+from .hints import HintFanout, get_hint_fanout
 from .logger import get_logger
+from .persistent_cache import SQLiteCache
+from .semantic_cache import SemanticCache
+from .singleflight import AsyncSingleFlight, AsyncStreamFlight, SingleFlight
 
 logger = get_logger()
 
+Recommendation = tuple[str, str, list[dict]]
+T = TypeVar("T")
+
+# Responses that are not recommendations, recognized by response_status().
+EMPTY_QUERY_MESSAGE = "Please describe your interests to get recommendations."
+GUARDRAIL_MESSAGE = "Please provide a different (non-NSFW) request."
+DEPRECATED_MODEL_MESSAGE = (
+    "Selected Groq model is deprecated. Choose a supported model in the dropdown and try again."
+)
+UPSTREAM_ERROR_PREFIX = "Groq API error: "
+TIMEOUT_PREFIX = "Request timed out: "
+
+# Distinct classes before Python 3.11. Upstream clients raise them too, so one only
+# means "the latency budget ran out" when the request's deadline has passed.
+_TIMEOUTS = (TimeoutError, asyncio.TimeoutError, FutureTimeoutError)
+# Sync LLM calls run on this pool only when a budget is set, so the caller can stop waiting.
+_llm_executor: ThreadPoolExecutor | None = None
+_llm_executor_lock = threading.Lock()
+
+
+def _get_llm_executor() -> ThreadPoolExecutor:
+    global _llm_executor
+    if _llm_executor is None:
+        with _llm_executor_lock:
+            if _llm_executor is None:
+                _llm_executor = ThreadPoolExecutor(
+                    max_workers=max(1, LLM_MAX_WORKERS), thread_name_prefix="llm"
+                )
+    return _llm_executor
+
+
+def response_status(text: str) -> str:
+    """Classify a recommendation text returned by :class:`BookRecommender`.
+
+    Returns:
+        ``"rejected"`` for empty or guardrail-blocked input, ``"upstream_error"`` when
+        the LLM call failed, ``"timeout"`` when the latency budget ran out, else ``"ok"``
+    """
+    if text in (EMPTY_QUERY_MESSAGE, GUARDRAIL_MESSAGE):
+        return "rejected"
+    if text == DEPRECATED_MODEL_MESSAGE or text.startswith(UPSTREAM_ERROR_PREFIX):
+        return "upstream_error"
+    if text.startswith(TIMEOUT_PREFIX):
+        return "timeout"
+    return "ok"
+
+
+@dataclass(frozen=True)
+class _Request:
+    """Validated, default-resolved parameters of one recommendation call."""
+
+    user_interest: str
+    genre: str
+    exclude_genres: str
+    model: str
+    temperature: float
+    key: str
+    started: float
+    budget: float | None = None
+    deadline: float | None = None
+
+    def elapsed_ms(self) -> float:
+        return (time.time() - self.started) * 1000
+
+    def remaining(self) -> float | None:
+        """Seconds left in the latency budget, or None when the request has no budget."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def hints_timeout(self) -> float | None:
+        """How long hint providers may take: their share of the budget, capped by what is left."""
+        remaining = self.remaining()
+        if self.budget is None or remaining is None:
+            return None
+        return min(self.budget * HINTS_BUDGET_SHARE, remaining)
+
+
+def _bounded(stream: Iterator[str], req: _Request) -> Iterator[str]:
+    """Yield chunks from ``stream`` until ``req``'s budget is spent, then raise TimeoutError."""
+    try:
+        for chunk in stream:
+            if req.expired():
+                raise TimeoutError("latency budget exhausted")
+            yield chunk
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+
+
+async def _abounded(stream: AsyncIterator[str], req: _Request) -> AsyncIterator[str]:
+    """Async variant of :func:`_bounded` that also stops waiting for a stalled chunk."""
+    iterator = stream.__aiter__()
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(iterator.__anext__(), req.remaining())
+            except StopAsyncIteration:
+                return
+            yield chunk
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
 
 class BookRecommender:
     """Encapsulates caching, guardrails, and LLM invocation."""
 
-    def __init__(self, default_model: str = SUPPORTED_MODELS[0], default_temperature: float = DEFAULT_TEMPERATURE) -> None:
+    def __init__(
+        self,
+        default_model: str = SUPPORTED_MODELS[0],
+        default_temperature: float = DEFAULT_TEMPERATURE,
+        cache: LRUTTLCache[Recommendation] | None = None,
+        persistent_cache: SQLiteCache | None = None,
+        chains: ChainRegistry | None = None,
+        guardrails: GuardrailMatcher | None = None,
+        semantic_cache: SemanticCache[Recommendation] | None = None,
+        hints: HintFanout | None = None,
+    ) -> None:
         self.default_model = default_model
         self.default_temperature = default_temperature
-        self.cache: Dict[str, Tuple[str, str, List[dict]]] = {}
+        if cache is None:
+            cache = LRUTTLCache(
+                max_bytes=CACHE_MAX_BYTES,
+                ttl_seconds=CACHE_TTL_SECONDS,
+                max_entries=CACHE_MAX_ENTRIES,
+            )
+        self.cache: LRUTTLCache[Recommendation] = cache
+        if persistent_cache is None and CACHE_DB_PATH:
+            persistent_cache = SQLiteCache(CACHE_DB_PATH, ttl_seconds=CACHE_DB_TTL_SECONDS)
+        self.persistent_cache = persistent_cache
+        if semantic_cache is None and SEMANTIC_CACHE_ENABLED:
+            semantic_cache = SemanticCache(
+                SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_MAX_ENTRIES, SEMANTIC_CACHE_DIM
+            )
+        self.semantic_cache = semantic_cache
+        if chains is None:
+            chains = ChainRegistry(wrap_builder(build_chain, get_cassette()))
+        self.chains = chains
+        self.guardrails = guardrails if guardrails is not None else get_guardrails()
+        self.hints = hints if hints is not None else get_hint_fanout()
+        self._flights: SingleFlight[tuple[Recommendation, bool]] = SingleFlight()
+        self._aflights: AsyncSingleFlight[tuple[Recommendation, bool]] = AsyncSingleFlight()
+        self._astreams: AsyncStreamFlight[tuple[Recommendation, bool | None]] = AsyncStreamFlight()
 
     @staticmethod
     def _cache_key(interest: str, genre: str, exclude_genres: str, model: str, temperature: float) -> str:
@@ -37,138 +207,615 @@ class BookRecommender:
             ]
         )
 
+    def _cache_get(self, key: str) -> Recommendation | None:
+        """Look up the memory layer, then read through to the persistent layer."""
+        cached = self.cache.get(key)
+        metrics.CACHE_LOOKUPS.inc(layer="memory", result="miss" if cached is None else "hit")
+        if cached is not None or self.persistent_cache is None:
+            return cached
+        stored = self.persistent_cache.get(key)
+        metrics.CACHE_LOOKUPS.inc(layer="persistent", result="miss" if stored is None else "hit")
+        if stored is None:
+            return None
+        try:
+            rec, hints, books = stored  # stored as a JSON list
+        except (TypeError, ValueError):
+            logger.warning("Dropping persistent cache entry with unexpected shape")
+            self.persistent_cache.delete(key)
+            return None
+        cached = (rec, hints, books)
+        self.cache.set(key, cached)
+        return cached
+
+    def is_cached(
+        self,
+        user_interest: str,
+        genre: str = "",
+        exclude_genres: str = "",
+        model: str | None = None,
+        temperature: float | None = None,
+    ) -> bool:
+        """Return whether the memory cache holds a fresh result, without counting a lookup."""
+        model_name = model or self.default_model
+        temp = temperature if temperature is not None else self.default_temperature
+        return self._cache_key(user_interest, genre, exclude_genres, model_name, temp) in self.cache
+
     @staticmethod
-    def _guardrails(user_interest: str) -> str | None:
-        blocked = ["nsfw", "porn", "explicit", "gore"]
-        text = user_interest.lower()
-        if any(bad in text for bad in blocked):
-            return "Please provide a different (non-NSFW) request."
+    def _semantic_scope(req: _Request) -> str:
+        """Everything in the cache key except the query text; semantic hits never cross it."""
+        return "|".join(
+            [
+                req.genre.strip().lower(),
+                req.exclude_genres.strip().lower(),
+                req.model.strip().lower(),
+                f"{req.temperature:.2f}",
+            ]
+        )
+
+    def _semantic_get(self, req: _Request) -> Recommendation | None:
+        """Serve a paraphrase of an already cached query, copying it under this key."""
+        match = self.semantic_cache.lookup(  # type: ignore[union-attr]
+            self._semantic_scope(req), req.user_interest, self._cache_get
+        )
+        metrics.CACHE_LOOKUPS.inc(layer="semantic", result="miss" if match is None else "hit")
+        if match is None:
+            return None
+        cached, similarity = match
+        logger.debug(f"Semantic cache hit (similarity {similarity:.3f})")
+        self.cache.set(req.key, cached)
+        return cached
+
+    def _semantic_add(self, req: _Request) -> None:
+        if self.semantic_cache is not None and req.key not in self.semantic_cache:
+            self.semantic_cache.add(self._semantic_scope(req), req.key, req.user_interest)
+
+    async def _off_loop(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a cache-touching step without blocking the event loop on SQLite locks.
+
+        Memory-only caches are cheap, so the thread hop is skipped when there is no
+        persistent layer.
+        """
+        if self.persistent_cache is None:
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    def _cache_set(self, key: str, value: Recommendation) -> None:
+        self.cache.set(key, value)
+        if self.persistent_cache is not None:
+            self.persistent_cache.set(key, list(value))
+
+    def _guardrails(self, user_interest: str) -> str | None:
+        if self.guardrails.match(user_interest) is not None:
+            return GUARDRAIL_MESSAGE
         return None
 
-    @staticmethod
-    def _build_chain(model: str, temperature: float):
-        chat_llm = ChatGroq(
-            temperature=temperature,
-            groq_api_key=GROQ_API_KEY,
-            model=model,
-        )
-
-        prompt = ChatPromptTemplate.from_template(
-            "You are a careful, spoiler-free book recommendation assistant.\n"
-            "- Avoid NSFW content.\n"
-            "- Do not include plot spoilers.\n"
-            "- Keep each reason concise.\n"
-            "- Prefer diverse, high-quality picks.\n"
-            "- Respect excluded genres.\n"
-            "- Blend relevant external suggestions when helpful.\n\n"
-            "User interests: {user_interest}\n"
-            "Preferred genre: {genre}\n"
-            "Excluded genres: {exclude_genres}\n"
-            "External suggestions: {external_suggestions}\n\n"
-            "Return exactly 5 numbered Markdown lines like:\n"
-            "1. **Title** — brief reason (no spoilers)"
-        )
-
-        return prompt | chat_llm | StrOutputParser()
+    def _build_chain(self, model: str, temperature: float):
+        """Return the shared chain for (model, temperature) from the registry."""
+        return self.chains.get(model, temperature)
 
-    def recommend(
+    def warm_chains(self, models: list[str] | None = None) -> int:
+        """Pre-build chains for ``models`` (default: all supported) at the default temperature."""
+        return self.chains.warm(models or SUPPORTED_MODELS, self.default_temperature)
+
+    def _prepare(
         self,
         user_interest: str,
         genre: str,
         exclude_genres: str,
-        model: str | None = None,
-        temperature: float | None = None,
-        force_refresh: bool = False,
-    ) -> Tuple[str, str, List[dict]]:
-        """Generate five book recommendations and the external hints used."""
-        start_time = time.time()
-        
+        model: str | None,
+        temperature: float | None,
+        budget_seconds: float | None = None,
+    ) -> Recommendation | _Request:
+        """Validate input and resolve defaults; returns an early response on rejection."""
+        started = time.time()
+        budget = REQUEST_BUDGET_SECONDS if budget_seconds is None else budget_seconds
+        deadline = time.monotonic() + budget if budget > 0 else None
         if not user_interest or not user_interest.strip():
-            return "Please describe your interests to get recommendations.", ""
+            return EMPTY_QUERY_MESSAGE, "", []
 
-        violation = self._guardrails(user_interest)
+        with metrics.span("guardrails"):
+            violation = self._guardrails(user_interest)
         if violation:
-            return violation, ""
+            return violation, "", []
 
         model_name = model or self.default_model
         temp = temperature if temperature is not None else self.default_temperature
+        return _Request(
+            user_interest=user_interest,
+            genre=genre or "",
+            exclude_genres=exclude_genres or "",
+            model=model_name,
+            temperature=temp,
+            key=self._cache_key(user_interest, genre, exclude_genres, model_name, temp),
+            started=started,
+            budget=budget if deadline is not None else None,
+            deadline=deadline,
+        )
 
-        key = self._cache_key(user_interest, genre, exclude_genres, model_name, temp)
-        if not force_refresh and key in self.cache:
-            rec, hints, books = self.cache[key]
-            duration_ms = (time.time() - start_time) * 1000
-            logger.info(
-                "Cache hit",
-                extra={
-                    "query": user_interest[:50],
-                    "model": model_name,
-                    "cached": True,
-                    "duration_ms": round(duration_ms, 2),
-                },
-            )
-            get_analytics().track_recommendation(
-                user_interest, genre, model_name, temp, True, duration_ms, len(books)
-            )
-            return rec, hints, books
+    def _serve_cached(self, req: _Request) -> Recommendation | None:
+        """Return a cached recommendation for ``req`` and record the hit, if any."""
+        with metrics.span("cache_lookup"):
+            cached = self._cache_get(req.key)
+            if cached is not None:
+                # Entries from the persistent layer or an earlier process join the index lazily.
+                self._semantic_add(req)
+            elif self.semantic_cache is not None:
+                cached = self._semantic_get(req)
+        if cached is None:
+            return None
+        rec, hints, books = cached
+        duration_ms = req.elapsed_ms()
+        logger.info(
+            "Cache hit",
+            extra={
+                "query": req.user_interest[:50],
+                "model": req.model,
+                "cached": True,
+                "duration_ms": round(duration_ms, 2),
+            },
+        )
+        get_analytics().track_recommendation(
+            req.user_interest,
+            req.genre,
+            req.model,
+            req.temperature,
+            True,
+            duration_ms,
+            len(books),
+            exclude_genres=req.exclude_genres,
+        )
+        return rec, hints, books
 
-        external = fetch_google_books(user_interest, genre)
-        external_text = "\n".join(
-            [
-                f"- {book['title']} by {book['authors']}"
-                + (f" — {book['description']}" if book.get("description") else "")
-                for book in external
-            ]
-        ) if external else "- No Google Books hints for this query."
+    @staticmethod
+    def _format_hints(external: list[dict]) -> str:
+        if not external:
+            return "- No Google Books hints for this query."
+        return "\n".join(
+            f"- {book['title']} by {book['authors']}"
+            + (f" — {book['description']}" if book.get("description") else "")
+            for book in external
+        )
 
+    @staticmethod
+    def _chain_inputs(req: _Request, external_text: str) -> dict[str, str]:
+        return {
+            "user_interest": req.user_interest.strip(),
+            "genre": req.genre.strip(),
+            "exclude_genres": req.exclude_genres.strip(),
+            "external_suggestions": external_text,
+        }
+
+    def _handle_error(self, req: _Request, exc: Exception, external: list[dict]) -> Recommendation:
+        metrics.UPSTREAM_ERRORS.inc(upstream="groq")
+        logger.error(
+            f"{UPSTREAM_ERROR_PREFIX}{exc}",
+            extra={
+                "query": req.user_interest[:50],
+                "model": req.model,
+                "duration_ms": round(req.elapsed_ms(), 2),
+            },
+            exc_info=True,
+        )
+        msg = str(exc).lower()
+        if "decommissioned" in msg:
+            return DEPRECATED_MODEL_MESSAGE, "", []
+        return f"{UPSTREAM_ERROR_PREFIX}{exc}", "", external
+
+    def _budget_exhausted(
+        self, req: _Request, stage: str, external_text: str, external: list[dict]
+    ) -> Recommendation:
+        """Fail fast once the latency budget is spent; the hints gathered so far are kept."""
+        metrics.BUDGET_EXHAUSTED.inc(stage=stage)
+        logger.warning(
+            f"Latency budget exhausted during {stage}",
+            extra={
+                "query": req.user_interest[:50],
+                "model": req.model,
+                "duration_ms": round(req.elapsed_ms(), 2),
+            },
+        )
+        waiting_for = "book hints" if stage == "hints" else "the language model"
+        budget = f"{req.budget:g}s " if req.budget is not None else ""
+        return (
+            f"{TIMEOUT_PREFIX}the {budget}latency budget ran out while waiting for "
+            f"{waiting_for}. Please try again.",
+            external_text,
+            external,
+        )
+
+    def _llm_failed(
+        self, req: _Request, exc: Exception, external_text: str, external: list[dict]
+    ) -> Recommendation:
+        """Respond to a failed LLM stage; a timeout only counts against the budget once it is spent."""
+        if isinstance(exc, _TIMEOUTS) and req.expired():
+            return self._budget_exhausted(req, "llm", external_text, external)
+        return self._handle_error(req, exc, external)
+
+    @staticmethod
+    def _invoke(chain: Any, inputs: dict[str, str], timeout: float | None) -> str:
+        if timeout is None:
+            return chain.invoke(inputs)
+        future = _get_llm_executor().submit(chain.invoke, inputs)
         try:
-            chain = self._build_chain(model_name, temp)
-            result = chain.invoke(
-                {
-                    "user_interest": user_interest.strip(),
-                    "genre": (genre or "").strip(),
-                    "exclude_genres": (exclude_genres or "").strip(),
-                    "external_suggestions": external_text,
-                }
-            )
-        except Exception as exc:  # pragma: no cover - API/network issues
-            duration_ms = (time.time() - start_time) * 1000
-            logger.error(
-                f"Groq API error: {exc}",
-                extra={
-                    "query": user_interest[:50],
-                    "model": model_name,
-                    "duration_ms": round(duration_ms, 2),
-                },
-                exc_info=True,
-            )
-            msg = str(exc).lower()
-            if "decommissioned" in msg:
-                return (
-                    "Selected Groq model is deprecated. Choose a supported model in the dropdown and try again.",
-                    "",
-                    [],
-                )
-            return f"Groq API error: {exc}", "", external
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Drops the call if it is still queued; a started one keeps running on the
+            # pool, bounded by GROQ_TIMEOUT_SECONDS.
+            future.cancel()
+            raise
 
-        self.cache[key] = (result, external_text, external)
-        
-        duration_ms = (time.time() - start_time) * 1000
+    def _complete(
+        self, req: _Request, result: str, external_text: str, external: list[dict]
+    ) -> Recommendation:
+        """Cache a fresh recommendation and record its log line and analytics event."""
+        self._cache_set(req.key, (result, external_text, external))
+        self._semantic_add(req)
+
+        duration_ms = req.elapsed_ms()
         logger.info(
             "Recommendation generated successfully",
             extra={
-                "query": user_interest[:50],
-                "model": model_name,
+                "query": req.user_interest[:50],
+                "model": req.model,
                 "cached": False,
                 "duration_ms": round(duration_ms, 2),
                 "books_count": len(external),
             },
         )
         get_analytics().track_recommendation(
-            user_interest, genre, model_name, temp, False, duration_ms, len(external)
+            req.user_interest,
+            req.genre,
+            req.model,
+            req.temperature,
+            False,
+            duration_ms,
+            len(external),
+            exclude_genres=req.exclude_genres,
         )
-        
         return result, external_text, external
 
+    def _generate(self, req: _Request) -> tuple[Recommendation, bool]:
+        """Fetch hints and call the LLM; returns the response and whether it succeeded."""
+        with metrics.span("hints"):
+            external = self.hints.fetch(req.user_interest, req.genre, req.hints_timeout())
+        external_text = self._format_hints(external)
+        if req.expired():
+            return self._budget_exhausted(req, "hints", external_text, external), False
+        try:
+            with metrics.span("build_chain"):
+                chain = self._build_chain(req.model, req.temperature)
+            with metrics.span("llm"):
+                result = self._invoke(chain, self._chain_inputs(req, external_text), req.remaining())
+        except Exception as exc:  # API/network issues or the budget running out
+            return self._llm_failed(req, exc, external_text, external), False
+        return self._complete(req, result, external_text, external), True
+
+    async def _agenerate(self, req: _Request) -> tuple[Recommendation, bool]:
+        with metrics.span("hints"):
+            external = await self.hints.afetch(req.user_interest, req.genre, req.hints_timeout())
+        external_text = self._format_hints(external)
+        if req.expired():
+            return self._budget_exhausted(req, "hints", external_text, external), False
+        try:
+            with metrics.span("build_chain"):
+                chain = self._build_chain(req.model, req.temperature)
+            with metrics.span("llm"):
+                result = await asyncio.wait_for(
+                    chain.ainvoke(self._chain_inputs(req, external_text)), req.remaining()
+                )
+        except Exception as exc:  # API/network issues or the budget running out
+            return self._llm_failed(req, exc, external_text, external), False
+        return await self._off_loop(self._complete, req, result, external_text, external), True
+
+    async def _agenerate_stream(self, req: _Request) -> AsyncIterator[tuple[Recommendation, bool | None]]:
+        """Stream one generation as ``(response_so_far, ok)``; ``ok`` is None until the last item."""
+        with metrics.span("hints"):
+            external = await self.hints.afetch(req.user_interest, req.genre, req.hints_timeout())
+        external_text = self._format_hints(external)
+        if req.expired():
+            yield self._budget_exhausted(req, "hints", external_text, external), False
+            return
+        yield ("", external_text, external), None
+        text = ""
+        try:
+            with metrics.span("build_chain"):
+                chain = self._build_chain(req.model, req.temperature)
+            with metrics.span("llm"):
+                stream = chain.astream(self._chain_inputs(req, external_text))
+                async for chunk in _abounded(stream, req):
+                    text += chunk
+                    yield (text, external_text, external), None
+        except Exception as exc:  # API/network issues or the budget running out
+            yield self._llm_failed(req, exc, external_text, external), False
+            return
+        yield await self._off_loop(self._complete, req, text, external_text, external), True
+
+    def _record_coalesced(self, req: _Request, response: Recommendation) -> None:
+        """Log and track a caller that shared another request's in-flight result."""
+        metrics.COALESCED.inc()
+        duration_ms = req.elapsed_ms()
+        logger.info(
+            "Coalesced with in-flight request",
+            extra={
+                "query": req.user_interest[:50],
+                "model": req.model,
+                "cached": True,
+                "duration_ms": round(duration_ms, 2),
+            },
+        )
+        get_analytics().track_recommendation(
+            req.user_interest,
+            req.genre,
+            req.model,
+            req.temperature,
+            True,
+            duration_ms,
+            len(response[2]),
+            exclude_genres=req.exclude_genres,
+        )
+
+    @metrics.instrument("sync")
+    def recommend(
+        self,
+        user_interest: str,
+        genre: str = "",
+        exclude_genres: str = "",
+        model: str | None = None,
+        temperature: float | None = None,
+        force_refresh: bool = False,
+        budget_seconds: float | None = None,
+    ) -> Recommendation:
+        """Generate five book recommendations and the external hints used.
+
+        ``budget_seconds`` bounds the whole call (default ``REQUEST_BUDGET_SECONDS``;
+        0 disables it). Hint providers get ``HINTS_BUDGET_SHARE`` of it and are left
+        out if they miss that share; the LLM gets the rest. When the budget runs
+        out the response is a "Request timed out" message instead of a hang.
+        """
+        req = self._prepare(
+            user_interest, genre, exclude_genres, model, temperature, budget_seconds
+        )
+        if not isinstance(req, _Request):
+            return req
+        if not force_refresh:
+            cached = self._serve_cached(req)
+            if cached is not None:
+                return cached
+
+        flight_key = f"refresh|{req.key}" if force_refresh else req.key
+        (response, ok), shared = self._flights.do(flight_key, lambda: self._generate(req))
+        if shared and ok:
+            self._record_coalesced(req, response)
+        return response
+
+    @metrics.instrument("async")
+    async def arecommend(
+        self,
+        user_interest: str,
+        genre: str = "",
+        exclude_genres: str = "",
+        model: str | None = None,
+        temperature: float | None = None,
+        force_refresh: bool = False,
+        budget_seconds: float | None = None,
+    ) -> Recommendation:
+        """Async variant of :meth:`recommend` that awaits its network I/O."""
+        req = self._prepare(
+            user_interest, genre, exclude_genres, model, temperature, budget_seconds
+        )
+        if not isinstance(req, _Request):
+            return req
+        if not force_refresh:
+            cached = await self._off_loop(self._serve_cached, req)
+            if cached is not None:
+                return cached
+
+        flight_key = f"refresh|{req.key}" if force_refresh else req.key
+        if flight_key in self._astreams and flight_key not in self._aflights:
+            # A streaming caller is already generating this key; wait for its final item.
+            async for update, _ in self._astreams.stream(
+                flight_key, lambda: self._agenerate_stream(req)
+            ):
+                response, ok = update
+            if ok:
+                self._record_coalesced(req, response)
+            return response
+        (response, ok), shared = await self._aflights.do(flight_key, lambda: self._agenerate(req))
+        if shared and ok:
+            self._record_coalesced(req, response)
+        return response
+
+    @metrics.instrument("stream")
+    def recommend_stream(
+        self,
+        user_interest: str,
+        genre: str = "",
+        exclude_genres: str = "",
+        model: str | None = None,
+        temperature: float | None = None,
+        force_refresh: bool = False,
+        budget_seconds: float | None = None,
+    ) -> Iterator[Recommendation]:
+        """Yield ``(text_so_far, hints, books)`` as LLM tokens arrive.
+
+        Hints are yielded first with empty text; the final item is the complete
+        recommendation, which is cached and tracked exactly like :meth:`recommend`.
+        Cache hits and rejected input produce a single item. Sync streams are not
+        coalesced with concurrent identical requests.
+        """
+        req = self._prepare(
+            user_interest, genre, exclude_genres, model, temperature, budget_seconds
+        )
+        if not isinstance(req, _Request):
+            yield req
+            return
+        if not force_refresh:
+            cached = self._serve_cached(req)
+            if cached is not None:
+                yield cached
+                return
+
+        with metrics.span("hints"):
+            external = self.hints.fetch(req.user_interest, req.genre, req.hints_timeout())
+        external_text = self._format_hints(external)
+        if req.expired():
+            yield self._budget_exhausted(req, "hints", external_text, external)
+            return
+        yield "", external_text, external
+        text = ""
+        try:
+            with metrics.span("build_chain"):
+                chain = self._build_chain(req.model, req.temperature)
+            with metrics.span("llm"):
+                for chunk in _bounded(chain.stream(self._chain_inputs(req, external_text)), req):
+                    text += chunk
+                    yield text, external_text, external
+        except Exception as exc:  # API/network issues or the budget running out
+            yield self._llm_failed(req, exc, external_text, external)
+            return
+        yield self._complete(req, text, external_text, external)
+
+    @metrics.instrument("async_stream")
+    async def arecommend_stream(
+        self,
+        user_interest: str,
+        genre: str = "",
+        exclude_genres: str = "",
+        model: str | None = None,
+        temperature: float | None = None,
+        force_refresh: bool = False,
+        budget_seconds: float | None = None,
+    ) -> AsyncIterator[Recommendation]:
+        """Async variant of :meth:`recommend_stream` built on ``chain.astream``.
+
+        Unlike the sync generator, concurrent identical requests are coalesced: a
+        caller arriving while the same key is streaming receives the in-flight
+        stream from its latest update onwards, and one arriving while
+        :meth:`arecommend` generates the key receives that call's final result.
+        """
+        req = self._prepare(
+            user_interest, genre, exclude_genres, model, temperature, budget_seconds
+        )
+        if not isinstance(req, _Request):
+            yield req
+            return
+        if not force_refresh:
+            cached = await self._off_loop(self._serve_cached, req)
+            if cached is not None:
+                yield cached
+                return
+
+        flight_key = f"refresh|{req.key}" if force_refresh else req.key
+        if flight_key in self._aflights:
+            (response, ok), _ = await self._aflights.do(flight_key, lambda: self._agenerate(req))
+            if ok:
+                self._record_coalesced(req, response)
+            yield response
+            return
+        async for (response, ok), shared in self._astreams.stream(
+            flight_key, lambda: self._agenerate_stream(req)
+        ):
+            if shared and ok:
+                self._record_coalesced(req, response)
+            yield response
+
+    @metrics.instrument("batch")
+    def recommend_batch(
+        self,
+        queries: Sequence[Mapping[str, Any]],
+        max_concurrency: int = BATCH_MAX_CONCURRENCY,
+        force_refresh: bool = False,
+    ) -> list[Recommendation]:
+        """Generate recommendations for many queries, in input order.
+
+        Each query is a mapping with ``user_interest`` and optional ``genre``,
+        ``exclude_genres``, ``model`` and ``temperature``. Cached queries are served
+        from the cache, duplicates within the batch are generated once, and the
+        remaining misses run through ``chain.batch`` (grouped by model and
+        temperature) with at most ``max_concurrency`` concurrent LLM calls and
+        hint lookups. Fresh results are written back to the cache.
+        """
+        results: list[Recommendation | None] = [None] * len(queries)
+        pending: dict[str, _Request] = {}
+        waiting: dict[str, list[tuple[int, _Request]]] = {}
+        for index, query in enumerate(queries):
+            req = self._prepare(
+                query.get("user_interest", ""),
+                query.get("genre", ""),
+                query.get("exclude_genres", ""),
+                query.get("model"),
+                query.get("temperature"),
+            )
+            if not isinstance(req, _Request):
+                results[index] = req
+                continue
+            if not force_refresh and req.key not in pending:
+                cached = self._serve_cached(req)
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            pending.setdefault(req.key, req)
+            waiting.setdefault(req.key, []).append((index, req))
+
+        if pending:
+            workers = max(1, max_concurrency)
+            reqs = list(pending.values())
+            with metrics.span("hints"), ThreadPoolExecutor(max_workers=workers) as pool:
+                externals = list(pool.map(lambda r: self.hints.fetch(r.user_interest, r.genre), reqs))
+
+            groups: dict[tuple[str, float], list[tuple[_Request, list[dict]]]] = {}
+            for req, external in zip(reqs, externals, strict=True):
+                groups.setdefault((req.model, req.temperature), []).append((req, external))
+
+            for (model_name, temp), members in groups.items():
+                texts = [self._format_hints(external) for _, external in members]
+                try:
+                    with metrics.span("build_chain"):
+                        chain = self._build_chain(model_name, temp)
+                    with metrics.span("llm"):
+                        outputs = chain.batch(
+                            [
+                                self._chain_inputs(req, text)
+                                for (req, _), text in zip(members, texts, strict=True)
+                            ],
+                            config={"max_concurrency": workers},
+                            return_exceptions=True,
+                        )
+                except Exception as exc:  # pragma: no cover - API/network issues
+                    outputs = [exc] * len(members)
+                for (req, external), text, output in zip(members, texts, outputs, strict=True):
+                    if isinstance(output, Exception):
+                        response, ok = self._handle_error(req, output, external), False
+                    else:
+                        response, ok = self._complete(req, output, text, external), True
+                    for position, (index, waiter) in enumerate(waiting[req.key]):
+                        results[index] = response
+                        if position and ok:
+                            self._record_coalesced(waiter, response)
+
+        return results  # type: ignore[return-value]
+
+    def cache_stats(self) -> dict[str, Any]:
+        """Return hit/miss/eviction counters for the recommendation cache layers.
+
+        The ``semantic`` entry's hit rate counts lookups that missed the exact key
+        and were served from a similar query instead.
+        """
+        stats = {"memory": self.cache.stats()}
+        if self.persistent_cache is not None:
+            stats["persistent"] = self.persistent_cache.stats()
+        if self.semantic_cache is not None:
+            stats["semantic"] = self.semantic_cache.stats()
+        return stats
+
+    def coalescing_stats(self) -> dict[str, Any]:
+        """Return leader/coalesced counts for the sync, async, and async-stream deduplication."""
+        return {
+            "sync": self._flights.stats(),
+            "async": self._aflights.stats(),
+            "stream": self._astreams.stats(),
+        }
+
     @staticmethod
     def supported_models() -> list[str]:
         return SUPPORTED_MODELS
@@ -0,0 +1,206 @@
+"""Similarity lookup that lets paraphrased queries reuse cached recommendations."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import zlib
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any, Generic, TypeVar
+
+import numpy as np
+
+V = TypeVar("V")
+
+_TOKEN = re.compile(r"[^\W_]+")
+# fmt: off
+STOPWORDS = frozenset(
+    {
+        "a", "about", "an", "and", "any", "are", "as", "at", "be", "book", "books", "but", "by",
+        "for", "from", "i", "in", "into", "is", "it", "like", "me", "my", "novel", "novels", "of",
+        "on", "or", "please", "read", "reading", "set", "some", "something", "that", "the", "to",
+        "with",
+    }
+)
+# fmt: on
+
+
+@lru_cache(maxsize=65536)
+def _bucket(feature: str, dim: int) -> int:
+    # crc32 rather than hash(): string hashes are salted per process.
+    return zlib.crc32(feature.encode("utf-8")) % dim
+
+
+class HashingVectorizer:
+    """Local, CPU-only text embedding from hashed words and character trigrams.
+
+    Word order, case, punctuation (``found-family``) and filler words are ignored,
+    and trigrams of each word give partial credit to inflections such as
+    "mystery"/"mysteries". Vectors are L2-normalized, so a dot product is the
+    cosine similarity.
+    """
+
+    def __init__(self, dim: int = 1024, trigram_weight: float = 0.5) -> None:
+        self.dim = dim
+        self.trigram_weight = trigram_weight
+
+    @staticmethod
+    def tokens(text: str) -> list[str]:
+        words = []
+        for word in _TOKEN.findall(text.casefold()):
+            if word in STOPWORDS:
+                continue
+            if len(word) > 4 and word.endswith("ies"):
+                word = word[:-3] + "y"
+            elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+                word = word[:-1]
+            words.append(word)
+        return words
+
+    def embed(self, text: str) -> np.ndarray:
+        """Return the normalized float32 vector for ``text`` (all zeros if it has no words)."""
+        words: list[int] = []
+        trigrams: list[int] = []
+        for word in self.tokens(text):
+            words.append(_bucket("w:" + word, self.dim))
+            padded = f"<{word}>"
+            trigrams.extend(_bucket(padded[i : i + 3], self.dim) for i in range(len(padded) - 2))
+        vector = np.bincount(words, minlength=self.dim).astype(np.float32)
+        if trigrams:
+            vector += self.trigram_weight * np.bincount(trigrams, minlength=self.dim)
+        norm = float(np.linalg.norm(vector))
+        if norm:
+            vector /= norm
+        return vector
+
+
+def _scope_id(scope: str) -> int:
+    digest = hashlib.blake2b(scope.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+class SemanticCache(Generic[V]):
+    """Nearest-neighbour index from query embeddings to exact cache keys.
+
+    Embeddings live in one preallocated NumPy matrix used as a ring buffer, so
+    memory is bounded by ``max_entries * dim * 4`` bytes and the oldest entries
+    are overwritten first. A lookup is a single matrix-vector product restricted
+    to entries of the same scope (genre, exclusions, model and temperature), and
+    returns the key of the most similar query when it clears ``threshold``. The
+    index stores keys only; the recommendations stay in the exact cache, so
+    their TTL and eviction still apply.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        max_entries: int = 5000,
+        dim: int = 1024,
+        vectorizer: HashingVectorizer | None = None,
+    ) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            threshold: Minimum cosine similarity (0-1) for a lookup to count as a hit
+            max_entries: Maximum number of indexed queries across all scopes
+            dim: Embedding dimension (ignored when ``vectorizer`` is given)
+            vectorizer: Text embedder; defaults to :class:`HashingVectorizer`
+        """
+        self.threshold = threshold
+        self.max_entries = max(1, max_entries)
+        self.vectorizer = vectorizer or HashingVectorizer(dim)
+        self._vectors = np.zeros((self.max_entries, self.vectorizer.dim), dtype=np.float32)
+        self._scopes = np.zeros(self.max_entries, dtype=np.int64)
+        self._keys: list[str | None] = [None] * self.max_entries
+        self._slots: dict[str, int] = {}
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, scope: str, key: str, text: str) -> None:
+        """Index ``text`` as a query whose result is cached under ``key``."""
+        vector = self.vectorizer.embed(text)
+        if not vector.any():
+            return
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._next
+                self._next = (self._next + 1) % self.max_entries
+                self._size = min(self._size + 1, self.max_entries)
+                evicted = self._keys[slot]
+                if evicted is not None:
+                    del self._slots[evicted]
+                self._slots[key] = slot
+                self._keys[slot] = key
+            self._vectors[slot] = vector
+            self._scopes[slot] = _scope_id(scope)
+
+    def nearest(self, scope: str, text: str) -> tuple[str, float] | None:
+        """Return ``(key, similarity)`` of the closest query in ``scope`` above the threshold."""
+        vector = self.vectorizer.embed(text)
+        if not vector.any():
+            return None
+        with self._lock:
+            if not self._size:
+                return None
+            scores = self._vectors[: self._size] @ vector
+            scores[self._scopes[: self._size] != _scope_id(scope)] = -1.0
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            return self._keys[best], float(scores[best])  # type: ignore[return-value]
+
+    def lookup(
+        self, scope: str, text: str, resolve: Callable[[str], V | None]
+    ) -> tuple[V, float] | None:
+        """Return ``(value, similarity)`` for the closest cached query, counting hits.
+
+        ``resolve`` fetches the value for the matched key from the exact cache; a
+        key whose value is gone (expired or evicted) is dropped and counts as a miss.
+        """
+        match = self.nearest(scope, text)
+        value = None
+        if match is not None:
+            value = resolve(match[0])
+            if value is None:
+                self.discard(match[0])
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return value, match[1]  # type: ignore[index]
+
+    def discard(self, key: str) -> None:
+        """Forget ``key`` (e.g. after its exact-cache entry expired)."""
+        with self._lock:
+            slot = self._slots.pop(key, None)
+            if slot is not None:
+                self._keys[slot] = None
+                self._scopes[slot] = 0
+                self._vectors[slot] = 0.0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def stats(self) -> dict[str, Any]:
+        """Return entry count, threshold, and the hit rate of semantic lookups."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._slots),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,200 @@
+"""In-flight request coalescing ("single-flight") for identical concurrent work."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from typing import (
+    Any,
+    Generic,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class _Counters:
+    def __init__(self) -> None:
+        self.leaders = 0
+        self.followers = 0
+
+    def snapshot(self, in_flight: int) -> dict[str, Any]:
+        total = self.leaders + self.followers
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.followers,
+            "in_flight": in_flight,
+            "coalesce_rate": self.followers / total if total else 0.0,
+        }
+
+
+class SingleFlight(Generic[T]):
+    """Run at most one call per key at a time; concurrent callers share its outcome.
+
+    The first caller for a key (the leader) executes ``fn``; callers arriving while it
+    runs block until it finishes and receive the same result or exception.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[T]] = {}
+        self._counters = _Counters()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> tuple[T, bool]:
+        """Return ``(result, shared)`` where ``shared`` is True for coalesced callers."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._counters.followers += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._counters.leaders += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return self._counters.snapshot(len(self._calls))
+
+
+class AsyncSingleFlight(Generic[T]):
+    """Asyncio counterpart of :class:`SingleFlight` for use on one event loop.
+
+    The shared work runs as its own task and every caller awaits it through
+    ``asyncio.shield``, so a cancelled caller never cancels the work others wait on.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+        self._counters = _Counters()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Return ``(result, shared)`` where ``shared`` is True for coalesced callers."""
+        task = self._tasks.get(key)
+        shared = task is not None
+        if shared:
+            self._counters.followers += 1
+        else:
+            self._counters.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _t, k=key: self._tasks.pop(k, None))
+        return await asyncio.shield(task), shared
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    def stats(self) -> dict[str, Any]:
+        return self._counters.snapshot(len(self._tasks))
+
+
+class _Stream(Generic[T]):
+    __slots__ = ("latest", "subscribers", "task")
+
+    def __init__(self) -> None:
+        self.latest: tuple[T] | None = None
+        self.subscribers: list[asyncio.Queue] = []
+        self.task: asyncio.Future | None = None
+
+    def publish(self, message: Any) -> None:
+        for subscriber in self.subscribers:
+            subscriber.put_nowait(message)
+
+
+_END = object()
+
+
+class AsyncStreamFlight(Generic[T]):
+    """Fan one async stream per key out to every concurrent subscriber.
+
+    The first caller's ``factory`` is pumped by its own task; callers arriving while
+    it runs subscribe to the same stream instead of starting another. A late
+    subscriber starts from the most recent item, so items should be cumulative
+    snapshots (e.g. text so far), then receives every later item. Like
+    :class:`AsyncSingleFlight`, a subscriber that stops early does not stop the
+    stream for the others.
+    """
+
+    def __init__(self) -> None:
+        self._streams: dict[Hashable, _Stream[T]] = {}
+        self._counters = _Counters()
+
+    async def stream(
+        self, key: Hashable, factory: Callable[[], AsyncIterator[T]]
+    ) -> AsyncIterator[tuple[T, bool]]:
+        """Yield ``(item, shared)`` pairs; ``shared`` is True for coalesced subscribers."""
+        inbox: asyncio.Queue = asyncio.Queue()
+        entry = self._streams.get(key)
+        shared = entry is not None
+        if entry is None:
+            self._counters.leaders += 1
+            entry = _Stream()
+            self._streams[key] = entry
+            entry.task = asyncio.ensure_future(self._pump(key, entry, factory))
+        else:
+            self._counters.followers += 1
+            if entry.latest is not None:
+                inbox.put_nowait(entry.latest)
+        entry.subscribers.append(inbox)
+
+        try:
+            while True:
+                message = await inbox.get()
+                if message is _END:
+                    return
+                if isinstance(message, BaseException):
+                    raise message
+                yield message[0], shared
+        finally:
+            if inbox in entry.subscribers:
+                entry.subscribers.remove(inbox)
+
+    async def _pump(
+        self, key: Hashable, entry: _Stream[T], factory: Callable[[], AsyncIterator[T]]
+    ) -> None:
+        try:
+            async for item in factory():
+                entry.latest = (item,)
+                entry.publish(entry.latest)
+        except BaseException as exc:  # delivered to every subscriber
+            entry.publish(exc)
+        else:
+            entry.publish(_END)
+        finally:
+            self._streams.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._streams
+
+    def stats(self) -> dict[str, Any]:
+        return self._counters.snapshot(len(self._streams))
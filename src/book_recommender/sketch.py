@@ -0,0 +1,151 @@
+"""Mergeable streaming quantile sketch (DDSketch) for latency percentiles."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from typing import Any
+
+
+class DDSketch:
+    """Quantile sketch with a relative-error guarantee and bounded memory.
+
+    Values are counted in logarithmically sized bins, so any quantile is returned
+    within ``relative_accuracy`` of the true value. When more than ``max_bins``
+    bins are in use the lowest ones are collapsed together, which keeps memory
+    constant and only degrades the accuracy of the smallest quantiles. Sketches
+    with the same accuracy can be merged, e.g. to combine time buckets.
+    """
+
+    MIN_INDEXABLE = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 1024) -> None:
+        """
+        Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of returned quantiles (0 < a < 1)
+            max_bins: Upper bound on the number of bins kept
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max(1, max_bins)
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min: float | None = None
+        self.max: float | None = None
+        self.sum = 0.0
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        return 2 * self._gamma**index / (self._gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Record ``value`` (negative values are treated as zero) ``count`` times."""
+        value = max(0.0, float(value))
+        if value < self.MIN_INDEXABLE:
+            self.zero_count += count
+        else:
+            index = self._index(value)
+            self._bins[index] = self._bins.get(index, 0) + count
+            if len(self._bins) > self.max_bins:
+                self._collapse()
+        self.count += count
+        self.sum += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def _collapse(self) -> None:
+        keys = sorted(self._bins)
+        excess = keys[: len(keys) - self.max_bins]
+        target = keys[len(excess)]
+        self._bins[target] += sum(self._bins.pop(key) for key in excess)
+
+    def merge(self, other: DDSketch) -> None:
+        """Add every value recorded in ``other`` to this sketch."""
+        if not math.isclose(other.relative_accuracy, self.relative_accuracy):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        if not other.count:
+            return
+        for index, count in other._bins.items():
+            self._bins[index] = self._bins.get(index, 0) + count
+        if len(self._bins) > self.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)  # type: ignore[type-var]
+        self.max = other.max if self.max is None else max(self.max, other.max)  # type: ignore[type-var]
+
+    def quantile(self, q: float) -> float | None:
+        """Return the approximate ``q`` quantile (0 <= q <= 1), or None if empty."""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Sequence[float]) -> list[float | None]:
+        """Return several quantiles with a single pass over the bins."""
+        if any(not 0 <= q <= 1 for q in qs):
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return [None] * len(qs)
+        order = sorted(range(len(qs)), key=qs.__getitem__)
+        answers: list[float | None] = [self.max] * len(qs)
+        pending = iter(order)
+        current = next(pending, None)
+        seen = self.zero_count
+        while current is not None and seen > qs[current] * (self.count - 1):
+            answers[current] = 0.0
+            current = next(pending, None)
+        for index in sorted(self._bins):
+            if current is None:
+                break
+            seen += self._bins[index]
+            while current is not None and seen > qs[current] * (self.count - 1):
+                answers[current] = min(max(self._value(index), self.min), self.max)  # type: ignore[type-var]
+                current = next(pending, None)
+        return answers
+
+    def percentiles(self, quantiles: Sequence[float] = (0.5, 0.95, 0.99)) -> dict[str, Any]:
+        """Summarize as ``{"count", "mean", "p50", ...}`` with values rounded to 0.01."""
+        summary: dict[str, Any] = {
+            "count": self.count,
+            "mean": round(self.sum / self.count, 2) if self.count else None,
+        }
+        for q, value in zip(quantiles, self.quantiles(quantiles), strict=True):
+            summary[f"p{q * 100:g}"] = round(value, 2) if value is not None else None
+        return summary
+
+    def __len__(self) -> int:
+        return len(self._bins)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to a JSON-compatible dict."""
+        keys = sorted(self._bins)
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "keys": keys,
+            "counts": [self._bins[key] for key in keys],
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DDSketch:
+        """Rebuild a sketch produced by :meth:`to_dict`."""
+        sketch = cls(data["relative_accuracy"], data["max_bins"])
+        sketch._bins = dict(zip(data["keys"], data["counts"], strict=True))
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        return sketch
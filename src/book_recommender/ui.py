@@ -31,15 +31,21 @@ def _render_cards(books: list[dict]) -> str:
 
 
 def build_interface(recommender: BookRecommender) -> tuple[gr.Blocks, str]:
-    def on_recommend(user_interest, genre, exclude, model, temperature, force_refresh, history):
+    async def on_recommend(user_interest, genre, exclude, model, temperature, force_refresh, history):
         # Input validation
         if not user_interest or len(user_interest.strip()) < 3:
-            return "⚠️ Please enter at least 3 characters to describe your interests.", "", "", history, gr.Dropdown(choices=[item["label"] for item in (history or [])])
-        
-        rec, hints, books = recommender.recommend(
+            yield "⚠️ Please enter at least 3 characters to describe your interests.", "", "", history, gr.Dropdown(choices=[item["label"] for item in (history or [])])
+            return
+
+        rec, hints, cards_html = "", "", ""
+        shown_books = None
+        async for rec, hints, books in recommender.arecommend_stream(
             user_interest, genre, exclude, model, temperature, force_refresh=force_refresh
-        )
-        cards_html = _render_cards(books)
+        ):
+            if books is not shown_books:
+                cards_html = _render_cards(books)
+                shown_books = books
+            yield rec, hints, cards_html, history, gr.update()
 
         new_entry = {
             "label": (user_interest or "(empty)")[:60],
@@ -54,7 +60,7 @@ def build_interface(recommender: BookRecommender) -> tuple[gr.Blocks, str]:
         }
         history = (history or [])[-7:] + [new_entry]
         labels = [item["label"] for item in history]
-        return rec, hints, cards_html, history, gr.Dropdown(choices=labels, value=labels[-1] if labels else None)
+        yield rec, hints, cards_html, history, gr.Dropdown(choices=labels, value=labels[-1] if labels else None)
 
     def on_load_session(selection, history):
         if not history:
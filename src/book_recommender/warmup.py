@@ -0,0 +1,237 @@
+"""Cache warm-up: precompute recommendations for the most frequent recent queries."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from .analytics import get_analytics
+from .batch import read_queries
+from .config import (
+    GROQ_MODEL,
+    WARMUP_LIMIT,
+    WARMUP_MAX_CONCURRENCY,
+    WARMUP_MAX_SECONDS,
+    WARMUP_QUERIES_PATH,
+    WARMUP_RATE_PER_SECOND,
+    WARMUP_SINCE_HOURS,
+    require_api_key,
+)
+from .logger import get_logger
+from .recommender import BookRecommender
+
+logger = get_logger()
+
+Query = dict[str, Any]
+
+_FIELDS = ("user_interest", "genre", "exclude_genres", "model", "temperature")
+
+
+def _identity(query: Query) -> tuple[str, ...]:
+    """The fields that make up the recommendation cache key, normalized the same way."""
+    temperature = query.get("temperature")
+    return (
+        (query.get("user_interest") or "").strip().lower(),
+        (query.get("genre") or "").strip().lower(),
+        (query.get("exclude_genres") or "").strip().lower(),
+        (query.get("model") or "").strip().lower(),
+        "" if temperature is None else f"{float(temperature):.2f}",
+    )
+
+
+def rank_queries(queries: Iterable[Query], limit: int) -> list[Query]:
+    """Return up to ``limit`` distinct queries, most frequent first.
+
+    Queries that would share a cache entry are counted together and the first
+    spelling seen is kept; ties keep first-seen order. An optional integer
+    ``count`` field weighs a line, so pre-aggregated lists work as input.
+    """
+    counts: Counter[tuple[str, ...]] = Counter()
+    first: dict[tuple[str, ...], Query] = {}
+    for query in queries:
+        if not (query.get("user_interest") or "").strip():
+            continue
+        key = _identity(query)
+        counts[key] += int(query.get("count", 1))
+        if key not in first:
+            first[key] = {f: query[f] for f in _FIELDS if query.get(f) not in (None, "")}
+    return [first[key] for key, _ in counts.most_common(max(0, limit))]
+
+
+def queries_from_events(
+    events: Iterable[dict[str, Any]], since: datetime | None = None
+) -> Iterator[Query]:
+    """Yield the queries of ``recommendation_generated`` analytics events.
+
+    Only events recorded with ``ANALYTICS_RECORD_QUERIES`` carry the query text;
+    the rest are skipped, as are events older than ``since`` (naive UTC, like the
+    analytics timestamps).
+    """
+    for event in events:
+        if event.get("event") != "recommendation_generated":
+            continue
+        properties = event.get("properties") or {}
+        text = properties.get("query")
+        if not isinstance(text, str):
+            continue
+        if since is not None:
+            try:
+                if datetime.fromisoformat(event.get("timestamp", "")) < since:
+                    continue
+            except (TypeError, ValueError):
+                continue
+        genre = properties.get("genre") or ""
+        yield {
+            "user_interest": text,
+            "genre": "" if genre == "none" else genre,
+            "exclude_genres": properties.get("exclude_genres") or "",
+            "model": properties.get("model"),
+            "temperature": properties.get("temperature"),
+        }
+
+
+def load_queries(
+    path: str = WARMUP_QUERIES_PATH,
+    limit: int = WARMUP_LIMIT,
+    since_hours: float = WARMUP_SINCE_HOURS,
+) -> list[Query]:
+    """Return the top ``limit`` queries from a JSONL file, or from analytics when ``path`` is empty.
+
+    The file uses the batch CLI's input format (one query per line, repeats
+    count). Analytics events, including those of API worker processes, are
+    limited to the last ``since_hours`` (0 keeps all).
+    """
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            return rank_queries(read_queries(handle), limit)
+    since = None
+    if since_hours > 0:
+        since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=since_hours)
+    queries = rank_queries(queries_from_events(get_analytics().iter_events(include_workers=True), since), limit)
+    if not queries:
+        logger.info("No recorded queries to warm; set ANALYTICS_RECORD_QUERIES=true to log them")
+    return queries
+
+
+def warm_cache(
+    recommender: BookRecommender,
+    queries: Sequence[Query],
+    max_concurrency: int = WARMUP_MAX_CONCURRENCY,
+    rate_per_second: float = WARMUP_RATE_PER_SECOND,
+    max_seconds: float = WARMUP_MAX_SECONDS,
+) -> dict[str, Any]:
+    """Generate and cache recommendations for ``queries``.
+
+    Queries already in the memory cache are skipped. The rest run through
+    :meth:`BookRecommender.recommend_batch` in rounds of ``max_concurrency``, and
+    rounds are spaced so that queries start at no more than ``rate_per_second``
+    on average, keeping a warm-up clear of Groq and Google Books rate limits. No new
+    round starts once ``max_seconds`` have passed. A zero rate or time limit
+    disables it.
+
+    Returns:
+        Counts of ``requested``, ``skipped`` (already cached), ``warmed``,
+        ``failed`` and ``not_started`` queries, plus the elapsed ``seconds``
+    """
+    started = time.monotonic()
+    pending = [query for query in queries if not _cached(recommender, query)]
+    stats = {"requested": len(queries), "skipped": len(queries) - len(pending)}
+    stats.update(warmed=0, failed=0, not_started=0)
+    size = max(1, max_concurrency)
+    for offset in range(0, len(pending), size):
+        wait = offset / rate_per_second - (time.monotonic() - started) if rate_per_second > 0 else 0
+        if max_seconds > 0 and time.monotonic() - started + max(0.0, wait) >= max_seconds:
+            stats["not_started"] = len(pending) - offset
+            break
+        if wait > 0:
+            time.sleep(wait)
+        chunk = pending[offset : offset + size]
+        recommender.recommend_batch(chunk, max_concurrency=size)
+        warmed = sum(_cached(recommender, query) for query in chunk)
+        stats["warmed"] += warmed
+        stats["failed"] += len(chunk) - warmed
+    stats["seconds"] = round(time.monotonic() - started, 3)
+    logger.info(
+        f"Cache warm-up: {stats['warmed']} warmed, {stats['skipped']} already cached, "
+        f"{stats['failed']} failed, {stats['not_started']} not started in {stats['seconds']}s"
+    )
+    return stats
+
+
+def _cached(recommender: BookRecommender, query: Query) -> bool:
+    return recommender.is_cached(*(query.get(field) for field in _FIELDS))
+
+
+def warm_on_startup(recommender: BookRecommender) -> dict[str, Any] | None:
+    """Run the configured warm-up; a missing or malformed query file is logged, not raised."""
+    try:
+        queries = load_queries()
+    except (OSError, ValueError) as exc:
+        logger.warning(f"Skipping cache warm-up: {exc}")
+        return None
+    return warm_cache(recommender, queries)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Precompute recommendations for the most frequent recent queries."
+    )
+    parser.add_argument(
+        "--input", "-i", default="", help="JSONL file of queries (default: analytics events)"
+    )
+    parser.add_argument("--limit", type=int, default=WARMUP_LIMIT, help="Queries to warm")
+    parser.add_argument(
+        "--since-hours",
+        type=float,
+        default=WARMUP_SINCE_HOURS,
+        help="Only count analytics events this recent (0 for all)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=WARMUP_MAX_CONCURRENCY,
+        help="Concurrent LLM calls and hint lookups",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=WARMUP_RATE_PER_SECOND,
+        help="Maximum queries started per second (0 for no limit)",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=WARMUP_MAX_SECONDS,
+        help="Stop starting new queries after this long (0 for no limit)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Print the selected queries as JSONL and exit"
+    )
+    args = parser.parse_args(argv)
+
+    queries = load_queries(args.input, args.limit, args.since_hours)
+    if args.dry_run:
+        for query in queries:
+            print(json.dumps(query, ensure_ascii=False))
+        return 0
+
+    require_api_key()
+    recommender = BookRecommender(default_model=GROQ_MODEL)
+    if recommender.persistent_cache is None:
+        print(
+            "Warning: CACHE_DB_PATH is not set, so results only live in this process",
+            file=sys.stderr,
+        )
+    stats = warm_cache(recommender, queries, args.max_concurrency, args.rate, args.max_seconds)
+    print(json.dumps(stats), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Fake chains and recommender helpers shared by the test modules."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.book_recommender.hints import HintFanout
+from src.book_recommender.recommender import BookRecommender
+
+
+class BatchChain:
+    """Chain whose ``batch`` answers ``Picks for <query>`` and fails queries containing "fail".
+
+    ``batches`` keeps the queries of every call and ``configs`` the config it was given.
+    """
+
+    def __init__(self):
+        self.batches = []
+        self.configs = []
+
+    def batch(self, inputs, config=None, return_exceptions=False):
+        self.batches.append([item["user_interest"] for item in inputs])
+        self.configs.append(config)
+        return [
+            RuntimeError("network down")
+            if "fail" in item["user_interest"]
+            else f"Picks for {item['user_interest']}"
+            for item in inputs
+        ]
+
+
+class SlowChain:
+    """Chain that sleeps ``delay`` seconds per call (per chunk when streaming).
+
+    ``calls`` counts invocations and ``prompts`` keeps the hints each one was given.
+    """
+
+    def __init__(self, delay=0.1, result="picks"):
+        self.delay = delay
+        self.result = result
+        self.calls = 0
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def _record(self, inputs):
+        with self._lock:
+            self.calls += 1
+            self.prompts.append(inputs.get("external_suggestions"))
+
+    def invoke(self, inputs, config=None):
+        self._record(inputs)
+        time.sleep(self.delay)
+        return self.result
+
+    async def ainvoke(self, inputs, config=None):
+        self._record(inputs)
+        await asyncio.sleep(self.delay)
+        return self.result
+
+    def stream(self, inputs, config=None):
+        self._record(inputs)
+        for word in ("one ", "two ", "three"):
+            time.sleep(self.delay)
+            yield word
+
+
+@pytest.fixture
+def make_recommender(monkeypatch):
+    """Factory for a :class:`BookRecommender` whose every chain is ``chain``.
+
+    Hint providers default to none; pass ``hints`` (or other constructor
+    arguments) to override.
+    """
+
+    def make(chain, **kwargs):
+        kwargs.setdefault("hints", HintFanout([]))
+        rec = BookRecommender(**kwargs)
+        monkeypatch.setattr(rec, "_build_chain", lambda *a, **k: chain)
+        return rec
+
+    return make
@@ -0,0 +1,188 @@
+"""Tests for the append-only analytics event log."""
+
+import threading
+import time
+
+from src.book_recommender import analytics as analytics_module
+from src.book_recommender.analytics import UsageAnalytics
+
+
+def test_events_are_appended_and_counted(tmp_path):
+    analytics = UsageAnalytics(str(tmp_path))
+    analytics.track_recommendation("space opera", "Sci-Fi", "llama", 0.5, False, 120.0, 4)
+    analytics.track_recommendation("space opera", "Sci-Fi", "llama", 0.5, True, 1.0, 4)
+    analytics.track_rating(4, "space opera")
+    analytics.flush()
+
+    stats = analytics.get_stats()
+    assert stats["recommendations"] == 2
+    assert stats["cache_hit_rate"] == 0.5
+    assert stats["average_rating"] == 4
+    analytics.close()
+
+
+def test_concurrent_tracking_loses_no_events(tmp_path):
+    analytics = UsageAnalytics(str(tmp_path))
+
+    def worker():
+        for _ in range(250):
+            analytics.track_export("json")
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    analytics.close()
+
+    assert UsageAnalytics(str(tmp_path)).get_stats()["exports"] == 2000
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path, monkeypatch):
+    analytics = UsageAnalytics(str(tmp_path), queue_size=1)
+    gate = threading.Event()
+    monkeypatch.setattr(analytics, "_write_batch", lambda _batch: gate.wait())
+
+    for _ in range(20):
+        analytics.track_share("twitter")
+
+    assert analytics.dropped >= 1
+    gate.set()
+    analytics.close()
+
+
+def test_segments_rotate_and_are_pruned(tmp_path):
+    analytics = UsageAnalytics(str(tmp_path), segment_max_bytes=200, max_segments=3)
+    for _ in range(50):
+        analytics.track_share("linkedin")
+        analytics.flush()
+    analytics.close()
+
+    segments = sorted(tmp_path.glob("events-*.jsonl"))
+    assert len(segments) == 3
+    assert segments[-1].name > "events-000003.jsonl"
+
+
+def test_legacy_json_file_is_migrated(tmp_path, monkeypatch):
+    legacy = tmp_path / ".book_recommender_analytics.json"
+    legacy.write_text(
+        '{"events": [{"timestamp": "2024-01-01T00:00:00", "event": "export",'
+        ' "properties": {"format": "json"}}], "sessions": []}'
+    )
+    monkeypatch.setattr("src.book_recommender.analytics.Path.home", lambda: tmp_path)
+    monkeypatch.setattr("src.book_recommender.analytics.ANALYTICS_DIR", "")
+
+    analytics = UsageAnalytics()
+    analytics.close()
+
+    assert analytics.get_stats()["exports"] == 1
+    assert not legacy.exists()
+
+
+def test_stats_survive_restart_via_snapshot(tmp_path, monkeypatch):
+    analytics = UsageAnalytics(str(tmp_path))
+    analytics.track_recommendation("space opera", "Sci-Fi", "llama", 0.5, True, 1.0, 4)
+    analytics.track_rating(5, "space opera")
+    analytics.close()
+    assert (tmp_path / "stats.json").exists()
+
+    # An event written after the last snapshot (e.g. before a crash) is replayed.
+    segment = sorted(tmp_path.glob("events-*.jsonl"))[-1]
+    with open(segment, "a", encoding="utf-8") as handle:
+        handle.write(
+            '{"timestamp":"2024-01-01T00:00:00","event":"rating_submitted",'
+            '"properties":{"rating":3,"query_length":4}}\n'
+        )
+
+    restarted = UsageAnalytics(str(tmp_path))
+    monkeypatch.setattr(restarted, "iter_events", lambda: iter(()))
+    stats = restarted.get_stats()
+    assert stats["recommendations"] == 1
+    assert stats["cache_hit_rate"] == 1.0
+    assert stats["ratings"] == 2
+    assert stats["average_rating"] == 4
+    restarted.close()
+
+
+def test_malformed_events_neither_kill_the_writer_nor_block_a_restart(tmp_path):
+    analytics = UsageAnalytics(str(tmp_path))
+    analytics.track_event("rating_submitted", {"rating": "5"})
+    analytics.track_event("recommendation_generated", {"model": ["llama"], "duration_ms": "x"})
+    analytics.track_rating(4, "whales")
+    analytics.flush()
+    assert analytics._thread.is_alive()
+    assert analytics.get_stats()["average_rating"] == 4
+    analytics.close()
+
+    # Replaying the same lines without a snapshot must not raise either.
+    (tmp_path / "stats.json").unlink()
+    stats = UsageAnalytics(str(tmp_path)).get_stats()
+    assert stats["ratings"] == 2
+    assert stats["model_usage"] == {"unknown": 1}
+
+
+def test_idle_writer_does_not_rewrite_the_snapshot(tmp_path):
+    analytics = UsageAnalytics(str(tmp_path), flush_interval=0.01, fsync_interval=0)
+    analytics.track_export("csv")
+    analytics.flush()
+    snapshot = tmp_path / "stats.json"
+    written = snapshot.stat().st_mtime_ns
+    time.sleep(0.1)
+    analytics.flush()
+
+    assert snapshot.stat().st_mtime_ns == written
+    analytics.close()
+
+
+def test_stats_outlive_pruned_segments(tmp_path):
+    analytics = UsageAnalytics(str(tmp_path), segment_max_bytes=200, max_segments=2)
+    for _ in range(30):
+        analytics.track_export("csv")
+        analytics.flush()
+    analytics.close()
+
+    assert len(list(analytics.iter_events())) < 30
+    assert UsageAnalytics(str(tmp_path)).get_stats()["exports"] == 30
+
+
+def test_latency_percentiles_per_model_and_cache_status(tmp_path):
+    analytics = UsageAnalytics(str(tmp_path))
+    for ms in range(1, 101):
+        analytics.track_recommendation("q", None, "llama", 0.5, False, float(ms * 10), 3)
+        analytics.track_recommendation("q", None, "llama", 0.5, True, 1.0, 3)
+    analytics.track_recommendation("q", None, "mixtral", 0.5, False, 5000.0, 3)
+    analytics.close()
+
+    restarted = UsageAnalytics(str(tmp_path))
+    misses = restarted.latency_percentiles(model="llama", cached=False)
+    assert misses["count"] == 100
+    assert abs(misses["p95"] - 950) <= 950 * 0.011
+    assert restarted.latency_percentiles(cached=True)["p99"] == 1.0
+    assert restarted.latency_percentiles(since=0)["count"] == 201
+    assert restarted.get_stats()["latency_ms"]["mixtral|miss"]["p50"] == 5000.0
+    restarted.close()
+
+
+def test_worker_processes_get_their_own_directories(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_module, "_worker_lock_file", None)
+    first = analytics_module._claim_worker_dir(tmp_path)
+    held = analytics_module._worker_lock_file
+    second = analytics_module._claim_worker_dir(tmp_path)  # the first slot is still locked
+    assert (first.name, second.name) == ("worker-0", "worker-1")
+
+    main = UsageAnalytics(str(tmp_path))
+    main.track_export("csv")
+    worker = UsageAnalytics(str(second))
+    worker.track_export("json")
+    for analytics in (main, worker):
+        analytics.close()
+    held.close()
+    analytics_module._worker_lock_file.close()
+
+    assert [e["properties"]["format"] for e in main.iter_events(include_workers=True)] == [
+        "csv",
+        "json",
+    ]
+    assert len(list(main.iter_events())) == 1
+    assert analytics_module._claim_worker_dir(tmp_path).name == "worker-0"  # slots are reused
+    analytics_module._worker_lock_file.close()
@@ -0,0 +1,170 @@
+"""Tests for the headless JSON API."""
+
+import time
+
+import httpx
+from starlette.testclient import TestClient
+
+from src.book_recommender import api
+from src.book_recommender.hints import HintFanout, HintProvider
+from src.book_recommender.recommender import GUARDRAIL_MESSAGE, BookRecommender
+
+
+class StaticHints(HintProvider):
+    name = "static"
+
+    def fetch(self, query, genre, max_results):
+        return [
+            {
+                "title": "Dune",
+                "authors": "Frank Herbert",
+                "description": "Desert planet politics. " * 40,
+                "thumbnail": "",
+                "link": "https://example.com/dune",
+            }
+        ]
+
+
+class EchoChain:
+    def invoke(self, inputs, config=None):
+        return f"1. **{inputs['user_interest']}**"
+
+    def batch(self, inputs, config=None, return_exceptions=False):
+        return [self.invoke(item) for item in inputs]
+
+
+class FlakyChain:
+    def invoke(self, inputs, config=None):
+        if "slow" in inputs["user_interest"]:
+            time.sleep(1)
+            return "too late"
+        raise RuntimeError("service unavailable")
+
+    def batch(self, inputs, config=None, return_exceptions=False):
+        return [RuntimeError("service unavailable") for _ in inputs]
+
+
+def _client(monkeypatch, **kwargs):
+    rec = BookRecommender(hints=HintFanout([StaticHints()]))
+    monkeypatch.setattr(rec, "_build_chain", lambda *a, **k: EchoChain())
+    return TestClient(api.create_app(rec, **kwargs)), rec
+
+
+def test_recommend_returns_text_and_structured_hints(monkeypatch):
+    client, rec = _client(monkeypatch)
+    with client:
+        response = client.post(
+            "/v1/recommend", json={"query": "desert politics", "genre": "SF", "temperature": 0.3}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    body = response.json()
+    assert body["recommendation"] == "1. **desert politics**"
+    assert body["external"][0]["title"] == "Dune"
+    assert body["hints"].startswith("- Dune by Frank Herbert")
+    assert body["status"] == "ok"
+    assert rec.is_cached("desert politics", "SF", "", None, 0.3)
+
+
+def test_small_responses_are_not_compressed(monkeypatch):
+    client, _ = _client(monkeypatch, gzip_min_bytes=10_000)
+    with client:
+        response = client.post("/v1/recommend", json={"user_interest": "desert politics"})
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+
+def test_invalid_requests_get_400(monkeypatch):
+    client, _ = _client(monkeypatch)
+    with client:
+        cases = [
+            client.post("/v1/recommend", content=b"{not json"),
+            client.post("/v1/recommend", json=["desert"]),
+            client.post("/v1/recommend", json={"user_interest": "  "}),
+            client.post("/v1/recommend", json={"user_interest": "x", "temperature": "hot"}),
+            client.post("/v1/recommend", json={"user_interest": "x", "temperature": 2.5}),
+            client.post("/v1/recommend", json={"user_interest": "x", "model": "gpt-huge"}),
+            client.post("/v1/batch", json={"queries": [{"user_interest": "ok"}, {"genre": "SF"}]}),
+        ]
+
+    assert [response.status_code for response in cases] == [400] * 7
+    assert cases[3].json() == {"error": "body: temperature must be a number"}
+    assert cases[4].json() == {"error": "body: temperature must be between 0 and 2"}
+    assert cases[5].json()["error"].startswith("body: model must be one of llama-3.1-8b-instant")
+    assert cases[6].json() == {"error": "queries[1]: user_interest is required"}
+
+
+def test_failures_map_to_http_statuses(monkeypatch):
+    client, rec = _client(monkeypatch)
+    monkeypatch.setattr(rec, "_build_chain", lambda *a, **k: FlakyChain())
+    monkeypatch.setattr(
+        rec, "_guardrails", lambda text: GUARDRAIL_MESSAGE if "forbidden" in text else None
+    )
+    with client:
+        rejected = client.post("/v1/recommend", json={"user_interest": "forbidden"})
+        failed = client.post("/v1/recommend", json={"user_interest": "whales"})
+        timed_out = client.post(
+            "/v1/recommend", json={"user_interest": "slow whales", "budget_seconds": 0.2}
+        )
+        batch = client.post(
+            "/v1/batch", json={"queries": [{"user_interest": "forbidden"}, {"query": "whales"}]}
+        )
+
+    assert (rejected.status_code, rejected.json()["status"]) == (422, "rejected")
+    assert (failed.status_code, failed.json()["status"]) == (502, "upstream_error")
+    assert failed.json()["recommendation"] == "Groq API error: service unavailable"
+    assert (timed_out.status_code, timed_out.json()["status"]) == (504, "timeout")
+    assert batch.status_code == 200
+    assert [r["status"] for r in batch.json()["results"]] == ["rejected", "upstream_error"]
+
+
+def test_batch_keeps_input_order_and_limits_size(monkeypatch):
+    client, _ = _client(monkeypatch)
+    monkeypatch.setattr(api, "API_MAX_BATCH", 3)
+    with client:
+        response = client.post(
+            "/v1/batch",
+            json={"queries": [{"user_interest": "whales"}, {"query": "krakens"}]},
+        )
+        too_many = client.post("/v1/batch", json={"queries": [{"user_interest": "a"}] * 4})
+
+    assert [r["recommendation"] for r in response.json()["results"]] == [
+        "1. **whales**",
+        "1. **krakens**",
+    ]
+    assert too_many.status_code == 400
+
+
+def test_stats_and_health(monkeypatch):
+    client, _ = _client(monkeypatch)
+    with client:
+        client.post("/v1/recommend", json={"user_interest": "whales"})
+        client.post("/v1/recommend", json={"user_interest": "whales"})
+        stats = client.get("/v1/stats").json()
+        health = client.get("/healthz")
+
+    assert stats["cache"]["memory"]["hits"] >= 1
+    assert set(stats["coalescing"]) == {"sync", "async", "stream"}
+    assert "recommendations" in stats["usage"]
+    assert health.json() == {"status": "ok"}
+
+
+def test_server_runs_alongside_on_a_background_thread(monkeypatch):
+    rec = BookRecommender(hints=HintFanout([]))
+    monkeypatch.setattr(rec, "_build_chain", lambda *a, **k: EchoChain())
+    server = api.start_api_server(rec, "127.0.0.1", 0)
+    try:
+        deadline = time.monotonic() + 5
+        while not server.started and time.monotonic() < deadline:
+            time.sleep(0.02)
+        port = server.servers[0].sockets[0].getsockname()[1]
+
+        response = httpx.post(
+            f"http://127.0.0.1:{port}/v1/recommend", json={"user_interest": "lighthouses"}
+        )
+
+        assert response.json()["recommendation"] == "1. **lighthouses**"
+    finally:
+        server.should_exit = True
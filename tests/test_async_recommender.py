@@ -0,0 +1,84 @@
+"""Tests for the asyncio recommendation path."""
+
+import asyncio
+
+from src.book_recommender.recommender import BookRecommender
+
+
+class AsyncDummyChain:
+    def __init__(self, response: str):
+        self._response = response
+        self.calls = 0
+
+    async def ainvoke(self, _: dict) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self._response
+
+
+def _stub_hints(monkeypatch, books):
+    async def fake_fetch(*_a, **_k):
+        return books
+
+    monkeypatch.setattr("src.book_recommender.google_books.afetch_google_books", fake_fetch)
+
+
+def test_arecommend_returns_result_and_caches(monkeypatch):
+    rec = BookRecommender()
+    chain = AsyncDummyChain("Async result")
+    _stub_hints(monkeypatch, [{"title": "Book", "authors": "A", "description": ""}])
+    monkeypatch.setattr(rec, "_build_chain", lambda *a, **k: chain)
+
+    first = asyncio.run(rec.arecommend("quiet literary fiction", "", "", "llama", 0.4))
+    second = asyncio.run(rec.arecommend("quiet literary fiction", "", "", "llama", 0.4))
+
+    assert first == second
+    assert first[0] == "Async result"
+    assert "Book by A" in first[1]
+    assert chain.calls == 1
+
+
+def test_arecommend_runs_requests_concurrently(monkeypatch):
+    rec = BookRecommender()
+    chain = AsyncDummyChain("ok")
+    _stub_hints(monkeypatch, [])
+    monkeypatch.setattr(rec, "_build_chain", lambda *a, **k: chain)
+
+    async def run_many():
+        return await asyncio.gather(
+            *(rec.arecommend(f"query number {i}", "", "", "llama", 0.4) for i in range(200))
+        )
+
+    results = asyncio.run(run_many())
+    assert len(results) == 200
+    assert chain.calls == 200
+
+
+def test_arecommend_validates_input():
+    rec = BookRecommender()
+    msg, hints, books = asyncio.run(rec.arecommend(""))
+    assert "Please describe your interests" in msg
+    assert books == []
+
+
+def test_persistent_cache_runs_off_the_event_loop(monkeypatch, tmp_path):
+    import threading
+
+    from src.book_recommender.persistent_cache import SQLiteCache
+
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    threads = []
+    original_get, original_set = cache.get, cache.set
+    monkeypatch.setattr(cache, "get", lambda *a: threads.append(threading.get_ident()) or original_get(*a))
+    monkeypatch.setattr(cache, "set", lambda *a: threads.append(threading.get_ident()) or original_set(*a))
+    rec = BookRecommender(persistent_cache=cache)
+    _stub_hints(monkeypatch, [])
+    monkeypatch.setattr(rec, "_build_chain", lambda *a, **k: AsyncDummyChain("stored"))
+
+    async def run():
+        loop_thread = threading.get_ident()
+        await rec.arecommend("river pilots", "", "", "llama", 0.4)
+        return loop_thread
+
+    loop_thread = asyncio.run(run())
+    assert threads and loop_thread not in threads
@@ -0,0 +1,88 @@
+"""Tests for batch recommendation generation and the JSONL CLI helpers."""
+
+import io
+import json
+
+import pytest
+from conftest import BatchChain
+
+from src.book_recommender.batch import read_queries, run_batch
+
+
+def _recommender(make_recommender, monkeypatch):
+    chain = BatchChain()
+    hint_calls = []
+    monkeypatch.setattr(
+        "src.book_recommender.google_books.fetch_google_books",
+        lambda q, *_a, **_k: hint_calls.append(q) or [],
+    )
+    return make_recommender(chain, hints=None), chain, hint_calls
+
+
+def test_batch_dedupes_and_uses_cache(make_recommender, monkeypatch):
+    rec, chain, hint_calls = _recommender(make_recommender, monkeypatch)
+    rec.recommend_batch([{"user_interest": "whale hunting", "model": "llama"}])
+
+    results = rec.recommend_batch(
+        [
+            {"user_interest": "whale hunting", "model": "llama"},
+            {"user_interest": "tea shop romance", "model": "llama"},
+            {"user_interest": "Tea shop romance ", "model": "llama"},
+            {"user_interest": "", "model": "llama"},
+        ],
+        max_concurrency=3,
+    )
+
+    assert results[0][0] == "Picks for whale hunting"
+    assert results[1] == results[2]
+    assert "Please describe" in results[3][0]
+    assert chain.batches[-1] == ["tea shop romance"]
+    assert chain.configs[-1] == {"max_concurrency": 3}
+    assert sorted(hint_calls) == ["tea shop romance", "whale hunting"]
+
+
+def test_batch_reports_per_item_errors(make_recommender, monkeypatch):
+    rec, _, _ = _recommender(make_recommender, monkeypatch)
+
+    results = rec.recommend_batch(
+        [
+            {"user_interest": "fail please", "model": "llama"},
+            {"user_interest": "ok", "model": "llama"},
+        ]
+    )
+
+    assert "Groq API error" in results[0][0]
+    assert results[1][0] == "Picks for ok"
+
+
+def test_run_batch_streams_jsonl(make_recommender, monkeypatch):
+    rec, _, _ = _recommender(make_recommender, monkeypatch)
+    source = io.StringIO('{"user_interest": "moon base", "model": "llama"}\n\n"canal boats"\n')
+    sink = io.StringIO()
+
+    assert run_batch(rec, source, sink, chunk_size=1) == 2
+
+    lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert lines[0]["recommendations"] == "Picks for moon base"
+    assert lines[1]["user_interest"] == "canal boats"
+
+
+@pytest.mark.parametrize(
+    "line, message",
+    [
+        ("42", "Line 2 must be a JSON object or string, got int"),
+        ('["moon base"]', "Line 2 must be a JSON object or string, got list"),
+        ('{"user_interest": 7}', "Line 2: user_interest must be a string"),
+        ('{"query": null}', "Line 2: user_interest must be a string"),
+        ('{"query": "q", "genre": ["SF"]}', "Line 2: genre must be a string"),
+        ('{"query": "q", "model": 0}', "Line 2: model must be a string"),
+        ('{"query": "q", "temperature": "warm"}', "Line 2: temperature must be a number"),
+        ('{"query": "q", "temperature": true}', "Line 2: temperature must be a number"),
+        ('{"query": "q", "count": 2.5}', "Line 2: count must be an integer"),
+    ],
+)
+def test_read_queries_rejects_malformed_records(line, message):
+    source = io.StringIO(f'"canal boats"\n{line}\n')
+
+    with pytest.raises(ValueError, match=message):
+        list(read_queries(source))
@@ -0,0 +1,77 @@
+"""Tests for the benchmark baseline comparison (the timed runs themselves are not run here)."""
+
+from benchmarks.run import CASES, compare
+
+
+def _report(**cases):
+    return {
+        "results": {
+            name: {"relative": relative, "peak_alloc_bytes": alloc}
+            for name, (relative, alloc) in cases.items()
+        }
+    }
+
+
+def test_compare_flags_slowdowns_and_allocation_growth():
+    baseline = _report(cache_key=(1.0, 1000), guardrails=(2.0, 500), render_cards=(1.0, 100))
+    current = _report(cache_key=(1.2, 1100), guardrails=(3.0, 500), render_cards=(1.0, 4000))
+
+    regressions = compare(current, baseline, threshold=0.3)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("guardrails: 1.50x slower")
+    assert regressions[1].startswith("render_cards: peak allocation 100 -> 4000")
+
+
+def test_compare_allows_for_the_measured_noise():
+    baseline = _report(cache_key=(1.0, 1000), guardrails=(1.0, 500))
+    current = _report(cache_key=(1.5, 1000), guardrails=(1.5, 500))
+    baseline["results"]["cache_key"]["spread"] = 0.3  # noisy case: 1.5x is within 1 + 0.3 + 0.3
+    current["results"]["guardrails"]["spread"] = 0.1
+
+    assert compare(current, baseline, threshold=0.3) == [
+        "guardrails: 1.50x slower than baseline (noise 10%)"
+    ]
+
+
+def test_suite_covers_the_hot_paths():
+    assert {
+        "cache_key_x256",
+        "guardrails_x256",
+        "render_cards",
+        "structured_formatter",
+        "analytics_track_event",
+        "analytics_get_stats_10k",
+        "google_books_parse",
+    } <= set(CASES)
+
+
+def test_startup_compare_flags_slowdowns_and_new_heavy_imports():
+    from benchmarks.startup import compare as compare_startup
+
+    def report(**cases):
+        return {
+            "results": {
+                name: {"relative": relative, "heavy_modules": modules}
+                for name, (relative, modules) in cases.items()
+            }
+        }
+
+    baseline = report(import_package=(1.0, []), first_request=(20.0, ["langchain_core"]))
+    current = report(import_package=(1.0, ["gradio"]), first_request=(40.0, ["langchain_core"]))
+
+    assert compare_startup(current, baseline, threshold=0.5) == [
+        "import_package: now imports gradio",
+        "first_request: 2.00x slower than baseline",
+    ]
+
+
+def test_helpers_import_without_heavy_dependencies():
+    import os
+
+    from benchmarks.startup import run_case
+
+    code = "import src.book_recommender.google_books, src.book_recommender.recommender"
+    _, modules = run_case(code, dict(os.environ, CASSETTE_MODE="off"))
+
+    assert modules == []
@@ -0,0 +1,107 @@
+"""Tests for the per-request latency budget."""
+
+import asyncio
+import time
+
+from conftest import SlowChain
+
+from src.book_recommender import metrics
+from src.book_recommender.hints import HintFanout, HintProvider
+
+
+class SlowHints(HintProvider):
+    name = "slow_hints"
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def fetch(self, query, genre, max_results):
+        time.sleep(self.delay)
+        return [{"title": "Late", "authors": "A", "description": ""}]
+
+    async def afetch(self, query, genre, max_results):
+        await asyncio.sleep(self.delay)
+        return self.fetch(query, genre, 0)
+
+
+def _recommender(make_recommender, hint_delay=0.0, llm_delay=0.0):
+    chain = SlowChain(llm_delay)
+    hints = HintFanout([SlowHints(hint_delay)], deadline_seconds=5)
+    return make_recommender(chain, hints=hints), chain
+
+
+def test_hints_that_miss_their_share_are_skipped(make_recommender):
+    rec, chain = _recommender(make_recommender, hint_delay=1.0)
+
+    started = time.monotonic()
+    text, hints, _ = rec.recommend("tide pools", "", "", "llama", 0.2, budget_seconds=0.8)
+
+    assert text == "picks"
+    assert time.monotonic() - started < 0.7
+    assert chain.prompts == ["- No Google Books hints for this query."]
+    assert hints == chain.prompts[0]
+
+
+def test_slow_llm_fails_fast_and_is_not_cached(make_recommender):
+    rec, _ = _recommender(make_recommender, llm_delay=1.0)
+    exhausted_before = metrics.BUDGET_EXHAUSTED.value(stage="llm")
+
+    started = time.monotonic()
+    text, _, _ = rec.recommend("tide pools", "", "", "llama", 0.2, budget_seconds=0.3)
+
+    assert time.monotonic() - started < 0.8
+    assert text.startswith("Request timed out: the 0.3s latency budget ran out")
+    assert metrics.BUDGET_EXHAUSTED.value(stage="llm") == exhausted_before + 1
+    assert rec.cache.get(rec._cache_key("tide pools", "", "", "llama", 0.2)) is None
+
+
+def test_async_llm_is_cancelled_at_the_deadline(make_recommender):
+    rec, _ = _recommender(make_recommender, llm_delay=5.0)
+
+    async def run():
+        started = time.monotonic()
+        result = await rec.arecommend("tide pools", "", "", "llama", 0.2, budget_seconds=0.3)
+        return result, time.monotonic() - started
+
+    (text, _, _), elapsed = asyncio.run(run())
+
+    assert text.startswith("Request timed out")
+    assert elapsed < 1
+
+
+def test_stream_stops_when_the_budget_runs_out(make_recommender):
+    rec, _ = _recommender(make_recommender, llm_delay=0.2)
+
+    updates = list(rec.recommend_stream("tide pools", "", "", "llama", 0.2, budget_seconds=0.3))
+
+    assert updates[-1][0].startswith("Request timed out")
+    assert "three" not in updates[-2][0]
+
+
+def test_zero_budget_disables_the_limit(make_recommender):
+    rec, _ = _recommender(make_recommender, llm_delay=0.3)
+
+    text, _, _ = rec.recommend("tide pools", "", "", "llama", 0.2, budget_seconds=0)
+
+    assert text == "picks"
+
+
+class TimingOutChain:
+    def invoke(self, inputs, config=None):
+        raise TimeoutError("read timed out")
+
+    async def ainvoke(self, inputs, config=None):
+        raise TimeoutError("read timed out")
+
+
+def test_upstream_timeouts_within_the_budget_are_api_errors(make_recommender):
+    rec = make_recommender(TimingOutChain())
+    exhausted_before = metrics.BUDGET_EXHAUSTED.value(stage="llm")
+
+    for budget in (10, 0):
+        text, _, _ = rec.recommend("tide pools", "", "", "llama", 0.2, budget_seconds=budget)
+        assert text == "Groq API error: read timed out"
+    text, _, _ = asyncio.run(rec.arecommend("tide pools", "", "", "llama", 0.2, budget_seconds=10))
+
+    assert text == "Groq API error: read timed out"
+    assert metrics.BUDGET_EXHAUSTED.value(stage="llm") == exhausted_before
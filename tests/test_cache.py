@@ -0,0 +1,89 @@
+"""Tests for the bounded LRU+TTL cache."""
+
+import threading
+
+from src.book_recommender.cache import LRUTTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_tracks_hits_and_misses():
+    cache = LRUTTLCache(max_bytes=10_000)
+    cache.set("a", "alpha")
+
+    assert cache.get("a") == "alpha"
+    assert cache.get("b") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LRUTTLCache(max_bytes=10_000, ttl_seconds=5, clock=clock)
+    cache.set("a", "alpha")
+
+    clock.now = 4.9
+    assert cache.get("a") == "alpha"
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.current_bytes == 0
+
+
+def test_lru_entry_is_evicted_when_budget_exceeded():
+    cache = LRUTTLCache(max_bytes=10_000, max_entries=2)
+    cache.set("a", "alpha")
+    cache.set("b", "beta")
+    cache.get("a")  # "b" becomes least recently used
+    cache.set("c", "gamma")
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_is_respected():
+    cache = LRUTTLCache(max_bytes=2_000, sizeof=len)
+    for i in range(100):
+        cache.set(f"k{i:03d}", "x" * 100)
+
+    assert cache.current_bytes <= 2_000
+    assert cache.set("huge", "x" * 5_000) is False
+    assert "huge" not in cache
+
+
+def test_concurrent_writers_keep_accounting_consistent():
+    cache = LRUTTLCache(max_bytes=50_000, sizeof=len)
+
+    def writer(offset: int) -> None:
+        for i in range(500):
+            cache.set(f"{offset}-{i}", "v" * 50)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert cache.current_bytes <= 50_000
+    assert cache.current_bytes == sum(len(k) + 50 for k in list(cache._entries))
+
+
+def test_explicit_non_positive_ttl_is_not_stored():
+    clock = FakeClock()
+    cache = LRUTTLCache(max_bytes=10_000, ttl_seconds=5, clock=clock)
+    cache.set("a", "alpha")
+
+    assert cache.set("a", "beta", ttl_seconds=0) is False
+    assert cache.set("b", "beta", ttl_seconds=-1) is False
+    clock.now = 1e9
+    assert cache.get("a") is None
+    assert cache.get("b") is None
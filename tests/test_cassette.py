@@ -0,0 +1,113 @@
+"""Tests for recording and replaying upstream traffic through cassettes."""
+
+import asyncio
+import json
+import time
+
+import pytest
+from conftest import BatchChain
+
+from src.book_recommender import google_books
+from src.book_recommender.cassette import Cassette, CassetteChain, CassetteMiss, wrap_builder
+from src.book_recommender.chains import ChainRegistry
+from src.book_recommender.recommender import BookRecommender
+
+BOOKS = [{"title": "Dune", "authors": "Frank Herbert", "description": "", "thumbnail": "", "link": ""}]
+
+
+class RecordingChain:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, inputs, config=None):
+        self.calls += 1
+        return f"1. **Pick** for {inputs['user_interest']}"
+
+    def stream(self, inputs, config=None):
+        self.calls += 1
+        yield from ["1. **Pick** ", "for ", inputs["user_interest"]]
+
+
+class FakeSession:
+    def get(self, *_args, **_kwargs):
+        return FakeResponse()
+
+
+class FakeResponse:
+    content = json.dumps(
+        {"items": [{"volumeInfo": {"title": "Dune", "authors": ["Frank Herbert"]}}]}
+    ).encode()
+
+    def raise_for_status(self):
+        pass
+
+
+def _recommender(cassette, chain, monkeypatch):
+    monkeypatch.setattr(google_books, "get_cassette", lambda: cassette)
+    return BookRecommender(chains=ChainRegistry(wrap_builder(lambda *_: chain, cassette)))
+
+
+def test_recorded_session_replays_without_upstream(tmp_path, monkeypatch):
+    path = tmp_path / "tape.jsonl"
+    chain = RecordingChain()
+    monkeypatch.setattr(google_books, "_cached_hints", lambda _key: None)
+    recorder = _recommender(Cassette(str(path), "record"), chain, monkeypatch)
+    monkeypatch.setattr(google_books, "get_session", FakeSession)
+    recorded = recorder.recommend("desert politics", "Sci-Fi", model="m", temperature=0.5)
+    streamed = list(recorder.recommend_stream("spice", model="m", temperature=0.5))[-1]
+
+    kinds = [json.loads(line)["kind"] for line in path.read_text().splitlines()]
+    assert sorted(kinds) == ["google_books", "google_books", "llm", "llm"]
+
+    def offline():
+        raise AssertionError("replay must not touch the network")
+
+    monkeypatch.setattr(google_books, "get_session", offline)
+    replayer = _recommender(Cassette(str(path), "replay"), None, monkeypatch)
+    assert replayer.recommend("desert politics", "Sci-Fi", model="m", temperature=0.5) == recorded
+    chunks = list(replayer.recommend_stream("spice", model="m", temperature=0.5))
+    assert chunks[-1] == streamed
+    assert [text for text, _, _ in chunks[1:-1]] == ["1. **Pick** ", "1. **Pick** for ", streamed[0]]
+    assert chain.calls == 2
+
+
+def test_replay_miss_is_reported_as_upstream_error(tmp_path, monkeypatch):
+    cassette = Cassette(str(tmp_path / "missing.jsonl"), "replay")
+    rec = _recommender(cassette, None, monkeypatch)
+
+    text, _, books = rec.recommend("unrecorded query", model="m", temperature=0.5)
+
+    assert text.startswith("Groq API error: ")
+    assert books == []
+    assert cassette.stats()["misses"] == 2
+
+
+@pytest.mark.parametrize("latency, expected", [("none", 0.0), ("recorded", 0.05), ("20", 0.02)])
+def test_replay_latency_modes(tmp_path, latency, expected):
+    path = tmp_path / "tape.jsonl"
+    Cassette(str(path), "record").record("google_books", "k", BOOKS, 50.0)
+    cassette = Cassette(str(path), "replay", latency)
+
+    assert cassette.delay(50.0) == pytest.approx(expected)
+    start = time.perf_counter()
+    assert asyncio.run(cassette.areplay("google_books", "k")) == BOOKS
+    assert time.perf_counter() - start >= expected * 0.9
+
+
+def test_batch_replay_returns_misses_as_exceptions(tmp_path):
+    path = tmp_path / "tape.jsonl"
+    recorder = CassetteChain(Cassette(str(path), "record"), "m", 0.5, inner=BatchChain())
+    recorder.batch([{"user_interest": "a"}], return_exceptions=True)
+
+    replayer = CassetteChain(Cassette(str(path), "replay"), "m", 0.5)
+    outputs = replayer.batch([{"user_interest": "a"}, {"user_interest": "b"}], return_exceptions=True)
+
+    assert outputs[0] == "Picks for a"
+    assert isinstance(outputs[1], CassetteMiss)
+    with pytest.raises(CassetteMiss):
+        replayer.batch([{"user_interest": "b"}])
+
+
+def test_invalid_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(str(tmp_path / "tape.jsonl"), "rewind")
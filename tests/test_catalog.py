@@ -0,0 +1,93 @@
+"""Tests for the offline book catalog index."""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.book_recommender.catalog import LocalCatalog, build_catalog, main, read_records
+
+BOOKS = [
+    {
+        "title": "The Seaside Baker Mysteries",
+        "authors": ["Ada Crumb"],
+        "categories": ["Mystery", "Cozy"],
+        "description": "A baker solves murders in a seaside town. Her cat helps. Then more.",
+        "thumbnail": "http://img/1",
+        "infoLink": "http://info/1",
+    },
+    {
+        "title": "Dragons of the Found Family",
+        "authors": ["Rin Vale", "Tomas Ode", "Third Author"],
+        "categories": ["Fantasy"],
+        "description": "Misfits adopt a dragon.",
+    },
+    {
+        "title": "Orbital Detective",
+        "author": "Sol Park",
+        "subjects": "Science Fiction",
+        "description": "A detective story set on a space station.",
+    },
+    {"title": "", "description": "No title, so it is skipped."},
+]
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    path = tmp_path / "catalog.db"
+    assert build_catalog(BOOKS, str(path)) == 3
+    return path
+
+
+def test_search_returns_google_books_style_cards(catalog_path):
+    results = LocalCatalog(str(catalog_path)).search("cozy mystery in a seaside town", max_results=2)
+
+    assert results[0] == {
+        "title": "The Seaside Baker Mysteries",
+        "authors": "Ada Crumb",
+        "description": "A baker solves murders in a seaside town.  Her cat helps",
+        "thumbnail": "http://img/1",
+        "link": "http://info/1",
+    }
+    assert len(results) <= 2
+
+
+def test_genre_boosts_matching_subjects(catalog_path):
+    catalog = LocalCatalog(str(catalog_path))
+
+    assert catalog.search("detective", "Mystery")[0]["title"] == "Orbital Detective"
+    assert catalog.search("dragons", "Fantasy")[0]["title"] == "Dragons of the Found Family"
+    assert catalog.search("the of and") == []  # only stopwords
+    assert catalog.search("zeppelin") == []
+
+
+def test_vectors_are_memory_mapped_for_reranking(tmp_path):
+    path = tmp_path / "catalog.db"
+    build_catalog(BOOKS, str(path), vectors=True, dim=64)
+    catalog = LocalCatalog(str(path), candidates=3)
+
+    results = catalog.search("found family dragon", max_results=1)
+
+    assert results[0]["title"] == "Dragons of the Found Family"
+    assert catalog._vectors.shape == (3, 64)
+    assert isinstance(catalog._vectors, np.memmap)
+
+
+def test_cli_builds_from_csv(tmp_path):
+    source = tmp_path / "books.csv"
+    source.write_text(
+        "title,author,categories,description\nQuiet Orchard,Mae Lin,Literary,An orchard year.\n",
+        encoding="utf-8",
+    )
+    output = tmp_path / "csv.db"
+
+    assert main(["-i", str(source), "-o", str(output)]) == 0
+    assert LocalCatalog(str(output)).search("orchard")[0]["authors"] == "Mae Lin"
+
+
+def test_read_records_rejects_non_objects(tmp_path):
+    source = tmp_path / "books.jsonl"
+    source.write_text(json.dumps(BOOKS[0]) + "\n[1, 2]\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Line 2 must be a JSON object"):
+        list(read_records(str(source)))
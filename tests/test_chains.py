@@ -0,0 +1,51 @@
+"""Tests for the shared chain registry."""
+
+import threading
+
+from src.book_recommender.chains import ChainRegistry, build_chain
+from src.book_recommender.recommender import BookRecommender
+
+
+def test_chain_is_built_once_per_model_and_temperature():
+    built = []
+    registry = ChainRegistry(builder=lambda model, temp: built.append((model, temp)) or object())
+
+    first = registry.get("llama", 0.5)
+    assert registry.get("llama", 0.500001) is first
+    assert registry.get("llama", 0.7) is not first
+    assert built == [("llama", 0.5), ("llama", 0.7)]
+
+
+def test_concurrent_gets_share_one_chain():
+    built = []
+    barrier = threading.Barrier(8)
+    registry = ChainRegistry(builder=lambda model, temp: built.append(model) or object())
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(registry.get("llama", 0.8))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(built) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_warm_prebuilds_supported_models():
+    registry = ChainRegistry(builder=lambda model, temp: object())
+    rec = BookRecommender(chains=registry)
+
+    assert rec.warm_chains() == len(rec.supported_models())
+    assert rec.warm_chains() == 0
+
+
+def test_build_chain_reuses_parsed_prompt(monkeypatch):
+    monkeypatch.setattr("src.book_recommender.chains.GROQ_API_KEY", "test-key")
+    first = build_chain("llama-3.1-8b-instant", 0.5)
+    second = build_chain("llama-3.1-8b-instant", 0.9)
+    assert first.first is second.first
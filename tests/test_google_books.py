@@ -0,0 +1,229 @@
+"""Tests for the Google Books client against a local stub server."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.book_recommender import google_books, metrics
+
+PAYLOAD = {
+    "items": [
+        {
+            "volumeInfo": {
+                "title": "The Left Hand of Darkness",
+                "authors": ["Ursula K. Le Guin"],
+                "description": "A lone envoy. A winter planet. More text here.",
+                "imageLinks": {"thumbnail": "http://img"},
+                "infoLink": "http://info",
+            }
+        }
+    ]
+}
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    """Serve ``state['statuses']`` in order, then 200 with PAYLOAD, after ``state['delays']``."""
+    state = {"statuses": [], "delays": [], "requests": 0, "paths": [], "headers": {}}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            state["requests"] += 1
+            state["paths"].append(self.path)
+            if state["delays"]:
+                time.sleep(state["delays"].pop(0))
+            status = state["statuses"].pop(0) if state["statuses"] else 200
+            body = json.dumps(PAYLOAD if status == 200 else {}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if status != 200:
+                for name, value in state["headers"].items():
+                    self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        google_books, "GOOGLE_BOOKS_ENDPOINT", f"http://127.0.0.1:{server.server_port}/volumes"
+    )
+    monkeypatch.setattr(google_books, "GOOGLE_BOOKS_BACKOFF_SECONDS", 0.001)
+    monkeypatch.setattr(google_books, "_session", None)
+    google_books.clear_hint_cache()
+    yield state
+    server.shutdown()
+    google_books.clear_hint_cache()
+
+
+def test_fetch_parses_volumes(stub_server):
+    books = google_books.fetch_google_books("winter planet", "")
+
+    assert books[0]["title"] == "The Left Hand of Darkness"
+    assert books[0]["authors"] == "Ursula K. Le Guin"
+    assert books[0]["description"].startswith("A lone envoy.")
+
+
+def test_fetch_requests_field_projection(stub_server):
+    google_books.fetch_google_books("winter planet", "")
+
+    query = parse_qs(urlparse(stub_server["paths"][0]).query)
+    assert query["fields"] == [google_books.VOLUME_FIELDS]
+
+
+def test_fetch_retries_transient_errors(stub_server):
+    stub_server["statuses"] = [503, 429]
+
+    books = google_books.fetch_google_books("winter planet", "")
+
+    assert len(books) == 1
+    assert stub_server["requests"] == 3
+
+
+def test_fetch_gives_up_after_bounded_retries(stub_server):
+    stub_server["statuses"] = [500] * 10
+
+    assert google_books.fetch_google_books("winter planet", "") == []
+    assert stub_server["requests"] == google_books.GOOGLE_BOOKS_MAX_RETRIES + 1
+
+
+def test_session_is_shared():
+    assert google_books.get_session() is google_books.get_session()
+
+
+def test_async_fetch_retries(stub_server):
+    stub_server["statuses"] = [502]
+
+    async def run():
+        try:
+            return await google_books.afetch_google_books("winter planet", "")
+        finally:
+            await google_books.aclose()
+
+    books = asyncio.run(run())
+    assert books[0]["link"] == "http://info"
+    assert stub_server["requests"] == 2
+
+
+def test_backoff_is_bounded():
+    delays = [google_books.backoff_delay(n) for n in range(20)]
+    assert all(0 <= d <= google_books.GOOGLE_BOOKS_BACKOFF_MAX_SECONDS for d in delays)
+
+
+def test_hints_are_cached_per_query_and_genre(stub_server):
+    first = google_books.fetch_google_books("Winter  planet", "")
+    second = google_books.fetch_google_books("winter planet", "")
+    google_books.fetch_google_books("winter planet", "Fantasy")
+
+    assert first == second
+    assert stub_server["requests"] == 2
+
+
+def test_failed_lookups_are_negatively_cached(stub_server, monkeypatch):
+    monkeypatch.setattr(google_books, "GOOGLE_BOOKS_MAX_RETRIES", 0)
+    google_books._session = None
+    stub_server["statuses"] = [503]
+
+    assert google_books.fetch_google_books("outage", "") == []
+    assert google_books.fetch_google_books("outage", "") == []
+    assert stub_server["requests"] == 1
+
+
+def test_close_clients_closes_client_owned_by_another_loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        client = asyncio.run_coroutine_threadsafe(_make_client(), loop).result()
+        google_books.close_clients()
+        deadline = 50
+        while not client.is_closed and deadline:
+            threading.Event().wait(0.01)
+            deadline -= 1
+        assert client.is_closed
+        assert google_books._async_client is None
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+async def _make_client():
+    return google_books._get_async_client()
+
+
+def test_large_retry_after_is_clamped(stub_server, monkeypatch):
+    monkeypatch.setattr(google_books, "GOOGLE_BOOKS_BACKOFF_MAX_SECONDS", 0.05)
+    stub_server["statuses"] = [429]
+    stub_server["headers"] = {"Retry-After": "3600"}
+
+    started = time.monotonic()
+    books = google_books.fetch_google_books("winter planet", "")
+    assert len(books) == 1
+    assert time.monotonic() - started < 2
+
+    google_books.clear_hint_cache()
+    stub_server["statuses"] = [429]
+
+    async def run():
+        try:
+            return await google_books.afetch_google_books("winter planet", "")
+        finally:
+            await google_books.aclose()
+
+    started = time.monotonic()
+    assert len(asyncio.run(run())) == 1
+    assert time.monotonic() - started < 2
+    assert stub_server["requests"] == 4
+
+
+def test_negative_caching_can_be_disabled(stub_server, monkeypatch):
+    monkeypatch.setattr(google_books, "HINTS_NEGATIVE_TTL_SECONDS", 0)
+    monkeypatch.setattr(google_books, "GOOGLE_BOOKS_MAX_RETRIES", 0)
+    google_books._session = None
+    stub_server["statuses"] = [503]
+
+    assert google_books.fetch_google_books("outage", "") == []
+    assert len(google_books.fetch_google_books("outage", "")) == 1
+    assert stub_server["requests"] == 2
+
+
+def test_slow_request_is_hedged(stub_server):
+    stub_server["delays"] = [1.5]
+    hedged_before = metrics.HEDGED_REQUESTS.value(upstream="google_books")
+
+    started = time.monotonic()
+    books = google_books.fetch_google_books("winter planet", "", hedge_after=0.05)
+
+    assert books[0]["title"] == "The Left Hand of Darkness"
+    assert time.monotonic() - started < 1
+    assert stub_server["requests"] == 2
+    assert metrics.HEDGED_REQUESTS.value(upstream="google_books") == hedged_before + 1
+
+
+def test_async_slow_request_is_hedged(stub_server):
+    stub_server["delays"] = [1.5]
+
+    async def run():
+        try:
+            return await google_books.afetch_google_books("winter planet", "", hedge_after=0.05)
+        finally:
+            await google_books.aclose()
+
+    started = time.monotonic()
+    books = asyncio.run(run())
+
+    assert books[0]["link"] == "http://info"
+    assert time.monotonic() - started < 1
+    assert stub_server["requests"] == 2
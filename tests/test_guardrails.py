@@ -0,0 +1,85 @@
+"""Tests for the compiled guardrail blocklist matcher."""
+
+import pytest
+
+from src.book_recommender import guardrails
+from src.book_recommender.guardrails import GuardrailMatcher
+from src.book_recommender.recommender import BookRecommender
+
+
+@pytest.mark.parametrize(
+    "text, blocked",
+    [
+        ("nsfw content please", "nsfw"),
+        ("Something EXPLICIT", "explicit"),
+        ("pornographic thrillers", "porn"),
+        ("ｎｓｆｗ stories", "nsfw"),  # full-width letters are NFKC-normalized
+        ("gorgeous gardens", None),  # no substring false positive
+        ("explicitly cozy mysteries", None),
+        ("a gentle story about gardening", None),
+    ],
+)
+def test_default_blocklist_respects_word_boundaries(text, blocked):
+    assert GuardrailMatcher().match(text) == blocked
+
+
+def test_phrases_match_across_whitespace_and_case():
+    matcher = GuardrailMatcher(["graphic violence", "c++"])
+
+    assert matcher.match("No GRAPHIC\n   violence please") == "graphic\n   violence"
+    assert matcher.match("graphic novels about violence") is None
+    assert matcher.match("learning c++ by example") == "c++"
+
+
+def test_word_boundary_and_normalization_can_be_disabled():
+    assert GuardrailMatcher(["gore"]).match("a gorey tale") is None
+    assert GuardrailMatcher(["gore"], word_boundary=False).match("a gorey tale") == "gore"
+    assert GuardrailMatcher(["nsfw"], unicode_normalize=False).match("ｎｓｆｗ") is None
+
+
+def test_large_blocklist_from_file_and_reload(tmp_path):
+    path = tmp_path / "blocklist.txt"
+    terms = [f"term{i:05d}" for i in range(5000)]
+    path.write_text("# comment\n\n" + "\n".join(terms) + "\n", encoding="utf-8")
+    matcher = GuardrailMatcher.from_file(str(path))
+
+    assert len(matcher) == 5000
+    assert matcher.match("has term04321 inside") == "term04321"
+    assert matcher.match("term043210") is None
+
+    path.write_text("dragons*\n", encoding="utf-8")
+    assert matcher.reload() == 1
+    assert matcher.match("term04321") is None
+    assert matcher.match("dragonslayer") == "dragons"
+
+    path.unlink()
+    with pytest.raises(OSError):
+        matcher.reload()
+    assert matcher.match("dragonslayer") == "dragons"  # previous list kept
+
+
+def test_recommender_uses_injected_matcher(monkeypatch):
+    called = {"google": False}
+    monkeypatch.setattr(
+        "src.book_recommender.google_books.fetch_google_books",
+        lambda *_a, **_k: called.update({"google": True}),
+    )
+    rec = BookRecommender(guardrails=GuardrailMatcher(["vampires"]))
+
+    msg, hints, books = rec.recommend("Vampires in space", "", "", "llama", 0.8)
+
+    assert "non-NSFW" in msg
+    assert (hints, books) == ("", [])
+    assert called["google"] is False
+
+
+def test_failed_global_reload_keeps_the_previous_list(tmp_path, monkeypatch):
+    path = tmp_path / "blocklist.txt"
+    path.write_text("dragons\n", encoding="utf-8")
+    monkeypatch.setattr(guardrails, "_guardrails", GuardrailMatcher.from_file(str(path)))
+
+    path.write_bytes(b"caf\xe9\n")  # Latin-1, not UTF-8
+    assert guardrails.reload_guardrails() == 1
+    path.unlink()
+    assert guardrails.reload_guardrails() == 1
+    assert guardrails.get_guardrails().match("dragons") == "dragons"
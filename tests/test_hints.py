@@ -0,0 +1,194 @@
+"""Tests for the concurrent hint-provider fan-out."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.book_recommender import hints, metrics
+from src.book_recommender.hints import (
+    CatalogProvider,
+    GoogleBooksProvider,
+    HintFanout,
+    HintProvider,
+    build_providers,
+    merge_hints,
+)
+from src.book_recommender.recommender import BookRecommender
+
+
+def card(title, authors="Unknown author", **extra):
+    return {
+        "title": title,
+        "authors": authors,
+        "description": "",
+        "thumbnail": "",
+        "link": "",
+        **extra,
+    }
+
+
+class StaticProvider(HintProvider):
+    def __init__(self, name, books, delay=0.0, error=None):
+        self.name = name
+        self.books = books
+        self.delay = delay
+        self.error = error
+
+    def fetch(self, query, genre, max_results):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.books[:max_results]
+
+    async def afetch(self, query, genre, max_results):
+        await asyncio.sleep(self.delay)
+        return self.fetch(query, genre, max_results)
+
+
+def test_merge_interleaves_and_dedupes_by_title_and_author():
+    google = [card("The Hobbit", "J.R.R. Tolkien"), card("Dune", "Frank Herbert")]
+    local = [
+        card("the hobbit!", "J.R.R. Tolkien, Christopher Tolkien", thumbnail="http://img"),
+        card("Piranesi", "Susanna Clarke"),
+    ]
+
+    merged = merge_hints([google, local], max_results=3)
+
+    assert [book["title"] for book in merged] == ["The Hobbit", "Dune", "Piranesi"]
+    assert merged[0]["thumbnail"] == "http://img"  # filled in from the duplicate
+    assert google[0]["thumbnail"] == ""  # provider results are not mutated
+    assert merge_hints([], 4) == []
+
+
+def test_fetch_returns_partial_results_at_the_deadline():
+    fast = StaticProvider("fast", [card("Quick")])
+    slow = StaticProvider("slow", [card("Late")], delay=1.0)
+    broken = StaticProvider("broken", [], error=RuntimeError("boom"))
+    fanout = HintFanout([slow, fast, broken], deadline_seconds=0.2)
+    misses_before = metrics.HINT_DEADLINE_MISSES.value(provider="slow")
+    errors_before = metrics.UPSTREAM_ERRORS.value(upstream="broken")
+
+    start = time.perf_counter()
+    books = fanout.fetch("anything", "")
+
+    assert time.perf_counter() - start < 0.8
+    assert [book["title"] for book in books] == ["Quick"]
+    assert metrics.HINT_DEADLINE_MISSES.value(provider="slow") == misses_before + 1
+    assert metrics.UPSTREAM_ERRORS.value(upstream="broken") == errors_before + 1
+
+
+def test_providers_run_concurrently():
+    barrier = threading.Barrier(2, timeout=1)
+
+    class Rendezvous(HintProvider):
+        def __init__(self, name):
+            self.name = name
+
+        def fetch(self, query, genre, max_results):
+            barrier.wait()  # only passes if both providers are running at once
+            return [card(self.name)]
+
+    fanout = HintFanout([Rendezvous("a"), Rendezvous("b")], deadline_seconds=2)
+
+    assert [book["title"] for book in fanout.fetch("q", "")] == ["a", "b"]
+
+
+def test_a_stalled_provider_cannot_starve_the_others(monkeypatch):
+    monkeypatch.setattr(hints, "_executors", {})
+    monkeypatch.setattr(hints, "HINTS_MAX_WORKERS", 2)
+    release = threading.Event()
+
+    class Stalled(HintProvider):
+        name = "stalled"
+
+        def fetch(self, query, genre, max_results):
+            release.wait(5)
+            return []
+
+    fast = StaticProvider("fast", [card("Quick")])
+    fanout = HintFanout([Stalled(), fast], deadline_seconds=0.2)
+    try:
+        for _ in range(3):  # the stalled provider's pool is saturated after the first call
+            assert [book["title"] for book in fanout.fetch("q", "")] == ["Quick"]
+    finally:
+        release.set()
+
+
+def test_inline_providers_run_on_the_calling_thread():
+    seen = []
+
+    class Inline(HintProvider):
+        name = "inline"
+        inline = True
+
+        def fetch(self, query, genre, max_results):
+            seen.append(threading.current_thread())
+            return [card("Local")]
+
+    fanout = HintFanout([StaticProvider("remote", [card("Remote")]), Inline()])
+
+    assert [book["title"] for book in fanout.fetch("q", "")] == ["Remote", "Local"]
+    assert seen == [threading.current_thread()]
+
+
+def test_afetch_cancels_late_providers():
+    fanout = HintFanout(
+        [StaticProvider("slow", [card("Late")], delay=5), StaticProvider("fast", [card("Quick")])],
+        deadline_seconds=0.1,
+    )
+
+    async def run():
+        start = time.perf_counter()
+        books = await fanout.afetch("q", "")
+        return books, time.perf_counter() - start
+
+    books, elapsed = asyncio.run(run())
+
+    assert [book["title"] for book in books] == ["Quick"]
+    assert elapsed < 1
+
+
+def test_build_providers(monkeypatch, tmp_path):
+    from src.book_recommender import hints
+    from src.book_recommender.catalog import LocalCatalog, build_catalog
+
+    monkeypatch.setattr(hints, "get_catalog", lambda: None)
+    assert [type(p) for p in build_providers("google_books, catalog")] == [GoogleBooksProvider]
+
+    path = tmp_path / "catalog.db"
+    build_catalog([{"title": "Quiet Orchard", "author": "Mae Lin"}], str(path))
+    monkeypatch.setattr(hints, "get_catalog", lambda: LocalCatalog(str(path)))
+    providers = build_providers("catalog")
+    assert isinstance(providers[0], CatalogProvider)
+    assert providers[0].fetch("orchard", "", 4)[0]["authors"] == "Mae Lin"
+
+    with pytest.raises(ValueError, match="Unknown hint provider"):
+        build_providers("google_books,goodreads")
+
+
+def test_recommender_prompts_with_merged_hints(monkeypatch):
+    fanout = HintFanout(
+        [
+            StaticProvider("google_books", [card("Dune", "Frank Herbert")]),
+            StaticProvider(
+                "catalog", [card("Dune", "Frank Herbert"), card("Hyperion", "Dan Simmons")]
+            ),
+        ]
+    )
+    rec = BookRecommender(hints=fanout)
+    prompts = []
+
+    class Chain:
+        def invoke(self, inputs, config=None):
+            prompts.append(inputs["external_suggestions"])
+            return "picks"
+
+    monkeypatch.setattr(rec, "_build_chain", lambda *a, **k: Chain())
+
+    _, hints_text, books = rec.recommend("desert planets", "", "", "llama", 0.3)
+
+    assert [book["title"] for book in books] == ["Dune", "Hyperion"]
+    assert prompts == [hints_text]
+    assert "Hyperion by Dan Simmons" in hints_text
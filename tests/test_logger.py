@@ -0,0 +1,77 @@
+"""Tests for the logging formatters, rate limiting, and queue mode."""
+
+import json
+import logging
+import re
+
+from src.book_recommender.logger import (
+    JSONFormatter,
+    RateLimitFilter,
+    StructuredFormatter,
+    parse_rate_limits,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _record(msg, **extra):
+    record = logging.LogRecord("book_recommender", logging.INFO, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_emits_one_line_with_context():
+    line = JSONFormatter().format(_record("Cache hit", model="llama", cached=True, duration_ms=1.5))
+
+    assert "\n" not in line
+    data = json.loads(line)
+    assert data["message"] == "Cache hit"
+    assert data["model"] == "llama" and data["cached"] is True and data["duration_ms"] == 1.5
+    assert re.fullmatch(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}", data["timestamp"])
+
+
+def test_structured_formatter_keeps_readable_layout():
+    text = StructuredFormatter().format(_record("Cache hit", query="q" * 80, model="llama"))
+
+    assert "[INFO] Cache hit | query=" + "q" * 50 + ", model=llama" in text
+
+
+def test_rate_limit_filter_drops_and_reports_suppressed():
+    clock = FakeClock()
+    rate_filter = RateLimitFilter({"Cache hit": 2}, clock=clock)
+
+    allowed = [rate_filter.filter(_record("Cache hit")) for _ in range(5)]
+    assert allowed == [True, True, False, False, False]
+    assert rate_filter.filter(_record("Recommendation generated successfully"))
+
+    clock.now = 1.0
+    record = _record("Cache hit")
+    assert rate_filter.filter(record)
+    assert record.suppressed == 3
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits("Cache hit=20, a=b=0.5,bogus,") == {"Cache hit": 20.0, "a=b": 0.5}
+
+
+def test_queue_mode_writes_from_listener(tmp_path):
+    log_file = tmp_path / "app.log"
+    logger = setup_logging(
+        enable_console=False, log_file=str(log_file), json_format=True, use_queue=True
+    )
+    try:
+        logger.info("Queued %s", "message", extra={"model": "llama"})
+    finally:
+        shutdown_logging()
+        logger.handlers.clear()
+
+    data = json.loads(log_file.read_text().strip())
+    assert data["message"] == "Queued message" and data["model"] == "llama"
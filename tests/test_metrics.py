@@ -0,0 +1,61 @@
+"""Tests for stage timers, metric rendering, and the Prometheus endpoint."""
+
+import urllib.request
+
+from src.book_recommender import metrics
+from src.book_recommender.recommender import BookRecommender
+
+
+class EchoChain:
+    def invoke(self, inputs: dict) -> str:
+        return f"Picks for {inputs['user_interest']}"
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = metrics.Registry()
+    latency = registry.histogram("demo_seconds", "Demo latency.", ["stage"], buckets=(0.1, 1))
+    latency.observe(0.05, stage="llm")
+    latency.observe(0.5, stage="llm")
+    latency.observe(3, stage="llm")
+
+    text = registry.render()
+
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{stage="llm",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="llm",le="1"} 2' in text
+    assert 'demo_seconds_bucket{stage="llm",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{stage="llm"} 3' in text
+
+
+def test_recommend_records_stages_and_counters(monkeypatch):
+    rec = BookRecommender()
+    monkeypatch.setattr("src.book_recommender.google_books.fetch_google_books", lambda *_a, **_k: [])
+    monkeypatch.setattr(rec, "_build_chain", lambda *a, **k: EchoChain())
+    stages = ("guardrails", "cache_lookup", "google_books", "build_chain", "llm")
+    before = {stage: metrics.STAGE_DURATION.count(stage=stage) for stage in stages}
+    requests_before = metrics.REQUESTS.value(mode="sync")
+    hits_before = metrics.CACHE_LOOKUPS.value(layer="memory", result="hit")
+
+    rec.recommend("lighthouse keepers", "", "", "llama", 0.4)
+    rec.recommend("lighthouse keepers", "", "", "llama", 0.4)
+
+    assert all(metrics.STAGE_DURATION.count(stage=s) > before[s] for s in stages)
+    assert metrics.REQUESTS.value(mode="sync") == requests_before + 2
+    assert metrics.CACHE_LOOKUPS.value(layer="memory", result="hit") == hits_before + 1
+    assert metrics.IN_FLIGHT.value() == 0
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    server = metrics.start_metrics_server(0)
+    assert server is not None
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            body = resp.read().decode()
+            content_type = resp.headers["Content-Type"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert "# TYPE book_recommender_requests_total counter" in body
@@ -0,0 +1,81 @@
+"""Tests for the SQLite-backed persistent recommendation cache."""
+
+import multiprocessing
+
+from src.book_recommender.persistent_cache import SQLiteCache
+from src.book_recommender.recommender import BookRecommender
+
+
+class DummyChain:
+    def __init__(self, response: str):
+        self._response = response
+        self.calls = 0
+
+    def invoke(self, _: dict) -> str:
+        self.calls += 1
+        return self._response
+
+
+def _write_entries(path: str, offset: int) -> None:
+    cache = SQLiteCache(path)
+    for i in range(50):
+        cache.set(f"{offset}-{i}", ["rec", "hints", []])
+
+
+def test_round_trip_and_expiry(tmp_path):
+    now = [1000.0]
+    cache = SQLiteCache(str(tmp_path / "cache.db"), ttl_seconds=10, clock=lambda: now[0])
+    cache.set("k", ["rec", "hints", [{"title": "T"}]])
+
+    assert cache.get("k") == ["rec", "hints", [{"title": "T"}]]
+    now[0] += 10
+    assert cache.get("k") is None
+    assert cache.purge_expired() == 1
+
+
+def test_entries_survive_a_new_recommender(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    monkeypatch.setattr("src.book_recommender.google_books.fetch_google_books", lambda *_a, **_k: [])
+
+    first = BookRecommender(persistent_cache=SQLiteCache(path))
+    monkeypatch.setattr(first, "_build_chain", lambda *a, **k: DummyChain("Stored"))
+    first.recommend("slow burn romance", "Romance", "", "llama", 0.5)
+
+    second = BookRecommender(persistent_cache=SQLiteCache(path))
+    chain = DummyChain("Fresh")
+    monkeypatch.setattr(second, "_build_chain", lambda *a, **k: chain)
+    rec, _, _ = second.recommend("slow burn romance", "Romance", "", "llama", 0.5)
+
+    assert rec == "Stored"
+    assert chain.calls == 0
+    assert second.cache_stats()["persistent"]["hits"] == 1
+
+
+def test_concurrent_processes_can_write(tmp_path):
+    path = str(tmp_path / "cache.db")
+    SQLiteCache(path)
+    procs = [multiprocessing.Process(target=_write_entries, args=(path, n)) for n in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+    assert all(p.exitcode == 0 for p in procs)
+    assert len(SQLiteCache(path)) == 200
+
+
+def test_corrupt_rows_are_treated_as_misses(tmp_path, monkeypatch):
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    conn = cache._connection()
+    conn.execute(
+        "INSERT INTO recommendations (key, value, created_at) VALUES ('bad', '{not json', 0)"
+    )
+    cache.set("old-format", {"rec": "shape changed"})
+
+    assert cache.get("bad") is None
+    assert cache.errors == 1
+    assert len(cache) == 1
+
+    rec = BookRecommender(persistent_cache=cache)
+    assert rec._cache_get("old-format") is None
+    assert len(cache) == 0
@@ -0,0 +1,70 @@
+"""Tests for the similarity cache that serves paraphrased queries."""
+
+from src.book_recommender.cache import LRUTTLCache
+from src.book_recommender.recommender import BookRecommender
+from src.book_recommender.semantic_cache import HashingVectorizer, SemanticCache
+
+
+class CountingChain:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, inputs: dict) -> str:
+        self.calls += 1
+        return f"Picks for {inputs['user_interest']}"
+
+
+def _similarity(a: str, b: str) -> float:
+    vectorizer = HashingVectorizer()
+    return float(vectorizer.embed(a) @ vectorizer.embed(b))
+
+
+def test_paraphrases_embed_close_and_different_topics_do_not():
+    assert _similarity("cozy fantasy with found family", "Found-family cozy fantasy") > 0.99
+    assert _similarity("cozy mysteries in a seaside town", "a cozy mystery set in a seaside town") > 0.99
+    assert _similarity("cozy fantasy", "dark fantasy") < 0.9
+    assert _similarity("hard sci-fi about mars", "hard sci-fi about the moon") < 0.9
+
+
+def test_lookup_is_scoped_and_drops_stale_keys():
+    cache = SemanticCache(threshold=0.9)
+    cache.add("fantasy|", "k1", "cozy fantasy with found family")
+    values = {"k1": "cached result"}
+
+    assert cache.lookup("sci-fi|", "found family cozy fantasy", values.get) is None
+    value, similarity = cache.lookup("fantasy|", "found family cozy fantasy", values.get)
+    assert value == "cached result" and similarity > 0.99
+
+    values.clear()  # exact entry expired
+    assert cache.lookup("fantasy|", "found family cozy fantasy", values.get) is None
+    assert "k1" not in cache
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_oldest_entries_are_overwritten_at_capacity():
+    cache = SemanticCache(threshold=0.9, max_entries=2)
+    for key, text in [("a", "dragons"), ("b", "pirates"), ("c", "robots")]:
+        cache.add("", key, text)
+
+    assert len(cache) == 2
+    assert cache.nearest("", "dragons") is None
+    assert cache.nearest("", "robots")[0] == "c"
+
+
+def test_recommender_serves_paraphrase_from_cache(monkeypatch):
+    chain = CountingChain()
+    rec = BookRecommender(
+        cache=LRUTTLCache(max_bytes=1_000_000), semantic_cache=SemanticCache(threshold=0.9)
+    )
+    monkeypatch.setattr("src.book_recommender.google_books.fetch_google_books", lambda *_a, **_k: [])
+    monkeypatch.setattr(rec, "_build_chain", lambda *_a, **_k: chain)
+
+    first = rec.recommend("cozy fantasy with found family", "Fantasy", "", "llama", 0.5)
+    second = rec.recommend("found-family cozy fantasy", "Fantasy", "", "llama", 0.5)
+    rec.recommend("found-family cozy fantasy", "Romance", "", "llama", 0.5)
+
+    assert second == first
+    assert chain.calls == 2  # the other genre is a different scope
+    stats = rec.cache_stats()["semantic"]
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["hit_rate"] == 1 / 3
@@ -0,0 +1,91 @@
+"""Tests for in-flight request coalescing."""
+
+import asyncio
+import threading
+import time
+
+from conftest import SlowChain
+
+from src.book_recommender.singleflight import SingleFlight
+
+
+def _run_threads(n, target):
+    barrier = threading.Barrier(n)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(target())
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_followers_share_leader_exception():
+    flight = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def boom():
+        started.set()
+        time.sleep(0.05)
+        raise ValueError("upstream down")
+
+    def call():
+        try:
+            flight.do("k", boom)
+        except ValueError as exc:
+            errors.append(exc)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call)
+    follower.start()
+    leader.join()
+    follower.join()
+
+    assert len(errors) == 2
+    assert flight.stats()["coalesced"] == 1
+
+
+def test_concurrent_identical_queries_call_upstream_once(make_recommender):
+    chain = SlowChain(result="Shared result")
+    rec = make_recommender(chain)
+
+    results = _run_threads(6, lambda: rec.recommend("grimdark heist crew", "", "", "llama", 0.3))
+
+    assert chain.calls == 1
+    assert all(r[0] == "Shared result" for r in results)
+    stats = rec.coalescing_stats()["sync"]
+    assert stats["leaders"] == 1 and stats["coalesced"] == 5
+
+
+def test_force_refresh_callers_coalesce_with_each_other(make_recommender):
+    chain = SlowChain(result="Shared result")
+    rec = make_recommender(chain)
+
+    _run_threads(
+        4, lambda: rec.recommend("epic poetry retold", "", "", "llama", 0.3, force_refresh=True)
+    )
+
+    assert chain.calls == 1
+
+
+def test_async_callers_coalesce(make_recommender):
+    chain = SlowChain(result="Shared result")
+    rec = make_recommender(chain)
+
+    async def run():
+        return await asyncio.gather(
+            *(rec.arecommend("sea voyages", "", "", "llama", 0.3) for _ in range(10))
+        )
+
+    results = asyncio.run(run())
+    assert chain.calls == 1
+    assert len({r[0] for r in results}) == 1
+    assert rec.coalescing_stats()["async"]["coalesced"] == 9
@@ -0,0 +1,59 @@
+"""Tests for the DDSketch latency quantile sketch."""
+
+import random
+
+import pytest
+
+from src.book_recommender.sketch import DDSketch
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_are_within_relative_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(5, 1) for _ in range(20_000)]
+    sketch = DDSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.95, 0.99):
+        assert sketch.quantile(q) == pytest.approx(_exact(values, q), rel=0.011)
+    assert sketch.count == len(values)
+
+
+def test_merge_matches_single_sketch():
+    rng = random.Random(3)
+    values = [rng.uniform(1, 2_000) for _ in range(5_000)]
+    whole, left, right = DDSketch(), DDSketch(), DDSketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+
+    left.merge(right)
+
+    for q in (0.1, 0.5, 0.99):
+        assert left.quantile(q) == whole.quantile(q)
+
+
+def test_bins_stay_bounded_and_top_quantiles_survive():
+    sketch = DDSketch(relative_accuracy=0.01, max_bins=64)
+    values = [10 ** (i / 1000) for i in range(6_000)]  # spans six orders of magnitude
+    for value in values:
+        sketch.add(value)
+
+    assert len(sketch) <= 64
+    assert sketch.quantile(0.99) == pytest.approx(_exact(values, 0.99), rel=0.011)
+
+
+def test_round_trips_through_dict():
+    sketch = DDSketch()
+    for value in (0, 3.5, 120, 980):
+        sketch.add(value)
+
+    restored = DDSketch.from_dict(sketch.to_dict())
+
+    assert restored.percentiles() == sketch.percentiles()
+    assert DDSketch().quantile(0.5) is None
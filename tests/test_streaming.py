@@ -0,0 +1,147 @@
+"""Tests for token streaming from the recommendation chain."""
+
+import asyncio
+
+from src.book_recommender.recommender import BookRecommender
+
+TOKENS = ["1. **Dune**", " — sand", "\n2. **Hyperion**", " — pilgrims"]
+
+
+class StreamingChain:
+    def stream(self, _: dict):
+        yield from TOKENS
+
+    async def astream(self, _: dict):
+        for token in TOKENS:
+            await asyncio.sleep(0)
+            yield token
+
+
+def _setup(monkeypatch, rec):
+    books = [{"title": "Dune", "authors": "Frank Herbert", "description": ""}]
+    monkeypatch.setattr("src.book_recommender.google_books.fetch_google_books", lambda *_a, **_k: books)
+
+    async def afetch(*_a, **_k):
+        return books
+
+    monkeypatch.setattr("src.book_recommender.google_books.afetch_google_books", afetch)
+    monkeypatch.setattr(rec, "_build_chain", lambda *a, **k: StreamingChain())
+
+
+def test_stream_yields_hints_then_growing_text_and_caches(monkeypatch):
+    rec = BookRecommender()
+    _setup(monkeypatch, rec)
+
+    updates = list(rec.recommend_stream("desert planet politics", "", "", "llama", 0.5))
+
+    assert updates[0][0] == ""
+    assert "Dune by Frank Herbert" in updates[0][1]
+    texts = [u[0] for u in updates]
+    assert texts[1] == TOKENS[0]
+    assert texts[-1] == "".join(TOKENS)
+    assert rec.recommend("desert planet politics", "", "", "llama", 0.5)[0] == "".join(TOKENS)
+
+
+def test_stream_serves_cache_hit_in_one_update(monkeypatch):
+    rec = BookRecommender()
+    _setup(monkeypatch, rec)
+    list(rec.recommend_stream("desert planet politics", "", "", "llama", 0.5))
+
+    updates = list(rec.recommend_stream("desert planet politics", "", "", "llama", 0.5))
+
+    assert len(updates) == 1
+    assert updates[0][0] == "".join(TOKENS)
+
+
+def test_async_stream_matches_sync(monkeypatch):
+    rec = BookRecommender()
+    _setup(monkeypatch, rec)
+
+    async def collect():
+        return [u async for u in rec.arecommend_stream("ringworld", "", "", "llama", 0.5)]
+
+    updates = asyncio.run(collect())
+    assert updates[-1][0] == "".join(TOKENS)
+    assert len(updates) == len(TOKENS) + 2
+
+
+class CountingStreamingChain(StreamingChain):
+    def __init__(self):
+        self.calls = 0
+
+    async def astream(self, inputs: dict):
+        self.calls += 1
+        async for token in super().astream(inputs):
+            await asyncio.sleep(0.01)
+            yield token
+
+    async def ainvoke(self, _: dict) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return "".join(TOKENS)
+
+
+def test_concurrent_async_streams_share_one_generation(monkeypatch):
+    rec = BookRecommender()
+    _setup(monkeypatch, rec)
+    chain = CountingStreamingChain()
+    monkeypatch.setattr(rec, "_build_chain", lambda *a, **k: chain)
+
+    async def collect():
+        return [u async for u in rec.arecommend_stream("ringworld", "", "", "llama", 0.5)]
+
+    async def run():
+        leader = asyncio.ensure_future(collect())
+        await asyncio.sleep(0.015)  # join mid-stream
+        return await asyncio.gather(leader, collect(), collect())
+
+    results = asyncio.run(run())
+    assert chain.calls == 1
+    assert all(updates[-1][0] == "".join(TOKENS) for updates in results)
+    stats = rec.coalescing_stats()["stream"]
+    assert stats["leaders"] == 1 and stats["coalesced"] == 2
+
+
+def test_async_stream_joins_in_flight_arecommend(monkeypatch):
+    rec = BookRecommender()
+    _setup(monkeypatch, rec)
+    chain = CountingStreamingChain()
+    monkeypatch.setattr(rec, "_build_chain", lambda *a, **k: chain)
+
+    async def stream():
+        return [u async for u in rec.arecommend_stream("ringworld", "", "", "llama", 0.5)]
+
+    async def run():
+        first = asyncio.ensure_future(rec.arecommend("ringworld", "", "", "llama", 0.5))
+        await asyncio.sleep(0)
+        return await asyncio.gather(first, stream())
+
+    result, updates = asyncio.run(run())
+    assert chain.calls == 1
+    assert updates == [result]
+
+
+def test_async_stream_error_reaches_every_subscriber():
+    from src.book_recommender.singleflight import AsyncStreamFlight
+
+    flight = AsyncStreamFlight()
+
+    async def failing():
+        yield "partial"
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def consume():
+        items = []
+        try:
+            async for item, _ in flight.stream("k", failing):
+                items.append(item)
+        except RuntimeError:
+            return items, True
+        return items, False
+
+    async def run():
+        return await asyncio.gather(consume(), consume())
+
+    for items, failed in asyncio.run(run()):
+        assert items == ["partial"] and failed
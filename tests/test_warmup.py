@@ -0,0 +1,120 @@
+"""Tests for the analytics-driven cache warm-up."""
+
+import json
+import time
+from datetime import datetime, timedelta
+
+from conftest import BatchChain
+
+from src.book_recommender import warmup
+from src.book_recommender.analytics import UsageAnalytics
+from src.book_recommender.warmup import queries_from_events, rank_queries, warm_cache
+
+
+def test_rank_queries_counts_cache_equivalent_spellings():
+    queries = [
+        {"user_interest": "Cozy mysteries"},
+        {"user_interest": "space opera", "model": "llama"},
+        {"user_interest": "cozy mysteries "},
+        {"user_interest": "sea stories", "count": 5},
+        {"user_interest": "space opera", "model": "llama", "temperature": 0.2},
+        {"user_interest": "  "},
+    ]
+
+    ranked = rank_queries(queries, limit=3)
+
+    assert ranked == [
+        {"user_interest": "sea stories"},
+        {"user_interest": "Cozy mysteries"},
+        {"user_interest": "space opera", "model": "llama"},
+    ]
+    assert rank_queries(queries, limit=0) == []
+
+
+def test_queries_come_from_recent_analytics_events_only_when_recorded(tmp_path):
+    private = UsageAnalytics(str(tmp_path / "private"))
+    private.track_recommendation("secret query", "", "llama", 0.2, False, 10.0, 3)
+    private.flush()
+    assert list(queries_from_events(private.iter_events())) == []
+    assert "query" not in next(private.iter_events())["properties"]
+    private.close()
+
+    analytics = UsageAnalytics(str(tmp_path / "recorded"), record_queries=True)
+    analytics.track_recommendation("dragons", "Fantasy", "llama", 0.2, False, 10.0, 3, "horror")
+    analytics.track_recommendation("dragons", None, "llama", 0.2, True, 1.0, 3)
+    analytics.flush()
+    events = list(analytics.iter_events())
+    analytics.close()
+    stale = dict(events[0], timestamp="2001-01-01T00:00:00")
+
+    queries = list(queries_from_events([stale, *events], since=datetime.now() - timedelta(days=1)))
+
+    assert queries == [
+        {
+            "user_interest": "dragons",
+            "genre": "Fantasy",
+            "exclude_genres": "horror",
+            "model": "llama",
+            "temperature": 0.2,
+        },
+        {
+            "user_interest": "dragons",
+            "genre": "",
+            "exclude_genres": "",
+            "model": "llama",
+            "temperature": 0.2,
+        },
+    ]
+
+
+def test_warm_cache_skips_cached_queries_and_reports_failures(make_recommender):
+    chain = BatchChain()
+    rec = make_recommender(chain)
+    rec.recommend_batch([{"user_interest": "already warm"}])
+    queries = [
+        {"user_interest": "already warm"},
+        {"user_interest": "fail whale"},
+        {"user_interest": "tide pools", "genre": "Science"},
+    ]
+
+    stats = warm_cache(rec, queries, max_concurrency=4, rate_per_second=0, max_seconds=0)
+
+    assert chain.batches[-1] == ["fail whale", "tide pools"]
+    assert {k: stats[k] for k in ("requested", "skipped", "warmed", "failed")} == {
+        "requested": 3,
+        "skipped": 1,
+        "warmed": 1,
+        "failed": 1,
+    }
+    assert rec.is_cached("Tide pools ", "science")
+
+
+def test_warm_cache_is_rate_limited_and_time_boxed(make_recommender):
+    chain = BatchChain()
+    rec = make_recommender(chain)
+    queries = [{"user_interest": f"topic {i}"} for i in range(6)]
+
+    started = time.monotonic()
+    stats = warm_cache(rec, queries, max_concurrency=2, rate_per_second=10, max_seconds=0)
+
+    assert time.monotonic() - started >= 0.4  # rounds start at 0, 0.2 and 0.4s
+    assert [len(batch) for batch in chain.batches] == [2, 2, 2]
+    assert stats["warmed"] == 6
+
+    chain = BatchChain()
+    rec = make_recommender(chain)
+    stats = warm_cache(rec, queries, max_concurrency=2, rate_per_second=1, max_seconds=1)
+
+    assert stats["warmed"] == 2
+    assert stats["not_started"] == 4
+
+
+def test_main_dry_run_prints_top_queries_from_a_file(tmp_path, capsys):
+    path = tmp_path / "queries.jsonl"
+    path.write_text('"robots"\n{"query": "whales"}\n"Robots"\n', encoding="utf-8")
+
+    assert warmup.main(["-i", str(path), "--limit", "1", "--dry-run"]) == 0
+
+    assert [json.loads(line) for line in capsys.readouterr().out.splitlines()] == [
+        {"user_interest": "robots"}
+    ]